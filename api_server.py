@@ -0,0 +1,201 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from deadline_planner import MAX_BUDGET_SEC
+from job_queue import JobQueue, QueueFullError, QUEUED, DONE, FAILED
+from pipeline import (run_summary_job, run_playlist_job, job_key, summary_config, result_store, generation_stats,
+                      search_index, ABSTRACTIVE)
+from playlist import is_playlist_url, extract_playlist_id
+from settings import MODEL_WARMUP, API_READINESS_PATH
+from warmup import ModelWarmup, READY, DEGRADED
+from youtube_utils import extract_video_id
+
+# Streamlit UI와 같은 파이프라인(자막 추출 → 요약)을 HTTP로 제공하는 비동기 서비스
+# 실행: uvicorn api_server:app --host 0.0.0.0 --port 8000
+
+# 서비스 프로세스 전용 워커 풀 (UI와 별도로 확장)
+job_queue = JobQueue()
+model_warmup = ModelWarmup(API_READINESS_PATH)
+
+# 스트리밍 폴링 간격 (초)
+STREAM_INTERVAL = 0.5
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if MODEL_WARMUP:
+        model_warmup.start()
+    yield
+
+
+app = FastAPI(title="유튜브 요약 API", lifespan=lifespan)
+
+
+class SummaryRequest(BaseModel):
+    url: str
+    language: Literal["ko", "en"] = "ko"
+    mode: Literal["abstractive", "extractive"] = ABSTRACTIVE
+    playlist: bool = False  # watch?v=...&list=... URL도 재생목록 전체를 요약할지 여부 (/playlist, 채널 URL은 항상 전체)
+    budget_sec: Optional[int] = Field(None, gt=0, le=MAX_BUDGET_SEC)  # 시간 예산 (단일 영상만, 예산 안에 끝나도록 모델/디코딩 설정 선택)
+
+
+def _get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
+
+
+def _job_status(job):
+    """작업 상태 (결과 본문 제외)"""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "position": job_queue.position(job.id) if job.status == QUEUED else 0,
+        "subscribers": job.subscribers,
+        "messages": list(job.messages),
+        "partial_count": len(job.partial),
+        "has_draft": job.draft is not None,
+        "error": job.error,
+        "wait_sec": round(job.wait_time, 1),
+        "run_sec": round(job.run_time, 1),
+    }
+
+
+# 폴링할 때마다 바뀌는 경과 시간 필드 (스트림에서 상태 변화 판단에는 사용하지 않음)
+_TIMING_FIELDS = ("wait_sec", "run_sec")
+
+
+def _status_changed(status, last_status):
+    if last_status is None:
+        return True
+    return any(status[name] != last_status[name] for name in status if name not in _TIMING_FIELDS)
+
+
+def _job_result(job, include_transcript=False):
+    result = dict(result_store.get_result(job.result["key"]) or {})
+    if include_transcript:
+        result["transcript_text"] = result_store.get_transcript_text(job.result["key"])
+    return result
+
+
+@app.post("/v1/summaries", status_code=202)
+async def submit_summary(request: SummaryRequest):
+    """요약 작업 등록 (같은 영상/언어/방식의 작업이 진행 중이면 그 작업에 합류)"""
+    config = summary_config(request.mode)
+    try:
+        if is_playlist_url(request.url, include_watch_lists=request.playlist):
+            job_id = job_queue.submit(
+                run_playlist_job, request.url, request.language, request.mode,
+                key=("playlist",) + job_key(extract_playlist_id(request.url) or request.url, request.language, config)
+            )
+        else:
+            video_id = extract_video_id(request.url)
+            if not video_id:
+                raise HTTPException(status_code=422, detail="유효하지 않은 유튜브 URL입니다.")
+            job_id = job_queue.submit(
+                run_summary_job, request.url, request.language, request.mode, request.budget_sec,
+                key=job_key(video_id, request.language, summary_config(request.mode, request.budget_sec)),
+                wants_draft=True
+            )
+    except QueueFullError as e:
+        return JSONResponse(status_code=429, content={"detail": str(e)}, headers={"Retry-After": "30"})
+    return {"job_id": job_id, "status_url": f"/v1/jobs/{job_id}", "stream_url": f"/v1/jobs/{job_id}/stream"}
+
+
+@app.get("/v1/jobs/{job_id}")
+async def job_status(job_id: str):
+    return _job_status(_get_job(job_id))
+
+
+@app.get("/v1/jobs/{job_id}/result")
+async def job_result(job_id: str, include_transcript: bool = False):
+    """완료된 작업 결과 (진행 중이면 409, 실패면 500)"""
+    job = _get_job(job_id)
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != DONE:
+        raise HTTPException(status_code=409, detail=f"작업이 아직 완료되지 않았습니다 ({job.status})")
+    return await asyncio.to_thread(_job_result, job, include_transcript)
+
+
+@app.get("/v1/jobs/{job_id}/stream")
+async def job_stream(job_id: str):
+    """진행 상황/초안/재생목록 영상별 결과/최종 결과를 Server-Sent Events로 전송"""
+    job = _get_job(job_id)
+
+    def event(name, data):
+        return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def events():
+        last_status = None
+        sent_partial = 0
+        sent_draft = False
+        while True:
+            status = _job_status(job)
+            if _status_changed(status, last_status):
+                yield event("status", status)
+                last_status = status
+            if job.draft is not None and not sent_draft:
+                yield event("draft", job.draft)
+                sent_draft = True
+            while sent_partial < len(job.partial):
+                yield event("partial", job.partial[sent_partial])
+                sent_partial += 1
+            if job.status == DONE:
+                yield event("result", await asyncio.to_thread(_job_result, job))
+                return
+            if job.status == FAILED:
+                yield event("error", {"detail": job.error})
+                return
+            await asyncio.sleep(STREAM_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.get("/healthz")
+async def healthz():
+    """프로세스 생존 확인"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """모델 준비 상태 (ready/degraded면 200, 로딩 중이면 503 - 로드밸런서는 준비된 인스턴스로만 전달)"""
+    status = model_warmup.status()
+    if not MODEL_WARMUP:
+        status["state"] = READY  # 워밍업을 끄면 첫 요청 시 로드
+    code = 200 if status["state"] in (READY, DEGRADED) else 503
+    return JSONResponse(status_code=code, content={**status, "queue": job_queue.stats()})
+
+
+@app.get("/v1/search")
+async def search(q: str = Query(..., min_length=1), limit: int = Query(20, ge=1, le=100)):
+    """처리한 영상 전문 검색 (자막 검색 결과에는 해당 시각부터 재생하는 링크 포함)"""
+    if search_index is None:
+        raise HTTPException(status_code=404, detail="검색 색인이 비활성화되어 있습니다")
+    return {"query": q, "results": search_index.search(q, limit=limit)}
+
+
+@app.get("/v1/stats")
+async def stats():
+    return {
+        "queue": job_queue.stats(),
+        "result_store": result_store.stats(),
+        "generation": generation_stats(),
+        "search_index": search_index.stats() if search_index is not None else None,
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,14 @@
 import streamlit as st
-from youtube_utils import extract_video_id, get_transcript, format_transcript, detect_language
-from summarizer import Summarizer
+from youtube_utils import extract_video_id
 from gpu_utils import display_gpu_status, GPUDetector
+from job_queue import JobQueue, QueueFullError, QUEUED, DONE, FAILED
+from pipeline import run_summary_job, run_playlist_job, job_key, summary_config, transcript_flight, result_store, search_index, generation_stats, ABSTRACTIVE, EXTRACTIVE
+from playlist import is_playlist_url, extract_playlist_id
+from transcript_sources import describe_source
+from deadline_planner import describe_plan
+from search_index import format_timestamp, TITLE, SUMMARY
+from warmup import ModelWarmup, READY, LOADING
+from settings import MODEL_WARMUP, JOB_BACKEND
 import time
 import os
 
@@ -17,6 +24,34 @@ st.title("📺 나만의 유튜브 요약 서비스")
 st.markdown("---")
 
 
+# --- 작업 큐 ---
+# 프로세스당 하나의 워커 풀을 모든 세션이 공유 (요약은 스크립트 스레드 밖에서 실행)
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
+
+job_queue = get_job_queue()
+
+
+# 분산 모드: 영상 요약은 공유 큐에 등록하고 워커 노드(worker.py)가 처리
+@st.cache_resource
+def get_dist_queue():
+    from dist_queue import get_lease_queue
+    return get_lease_queue(JOB_BACKEND)
+
+
+# --- 모델 워밍업 ---
+# 서버 프로세스당 한 번, 첫 요청을 기다리지 않고 백그라운드에서 요약 모델 로드 + 더미 생성
+@st.cache_resource
+def get_model_warmup():
+    warmup = ModelWarmup()
+    if MODEL_WARMUP:
+        warmup.start()
+    return warmup
+
+model_warmup = get_model_warmup()
+
+
 # 사이드바 설정
 with st.sidebar:
     st.header("⚙️ 설정")
@@ -29,9 +64,33 @@ with st.sidebar:
         help="요약 결과를 어떤 언어로 생성할지 선택하세요"
     )
     
+    # 요약 방식 설정
+    summary_mode_label = st.radio(
+        "요약 방식",
+        ["AI 요약 (LongT5/BART)", "빠른 요약 (문장 추출)"],
+        index=0,
+        help="빠른 요약은 AI 모델 없이 핵심 문장을 골라 1초 안에 요약합니다"
+    )
+    summary_mode = EXTRACTIVE if summary_mode_label.startswith("빠른") else ABSTRACTIVE
+    
+    # 시간 예산 (영상 길이/자막 유무에 맞춰 Whisper 모델과 요약 방식을 자동으로 낮춤)
+    budget_label = st.select_slider(
+        "⏱️ 시간 예산",
+        options=["제한 없음", "30초", "1분", "2분", "5분", "10분"],
+        value="제한 없음",
+        help="예산 안에 끝나도록 음성 인식 모델, 요약 방식, 빔 수를 고릅니다 (단일 영상에만 적용)"
+    )
+    budget_sec = {"30초": 30, "1분": 60, "2분": 120, "5분": 300, "10분": 600}.get(budget_label)
+    
     # 고급 옵션
     with st.expander("고급 설정", expanded=True):
         show_transcript = st.checkbox("원본 자막 보기", value=False)
+        summarize_playlist = st.checkbox(
+            "재생목록 전체 요약",
+            value=False,
+            help="영상 URL에 재생목록(list=)이 포함되어 있으면 목록의 모든 영상을 요약합니다. "
+                 "재생목록(/playlist)/채널 URL은 항상 전체 요약하고, 믹스(자동 생성 목록)는 선택한 영상만 요약합니다."
+        )
         
         
     # --- 시스템 상태 확인 (캐싱 적용) ---
@@ -82,20 +141,85 @@ with st.sidebar:
         else:
             st.success(f"✅ ffmpeg 발견: {ffmpeg_path_found}")
 
+    # 요약 모델 준비 상태 표시
+    with st.expander("🧠 요약 모델", expanded=model_warmup.state != READY):
+        warmup_status = model_warmup.status()
+        if not MODEL_WARMUP:
+            st.info("워밍업 비활성화 - 첫 요청 시 모델을 로드합니다")
+        elif warmup_status['state'] == READY:
+            st.success(f"✅ {warmup_status['detail']} ({warmup_status['elapsed_sec']:.0f}초)")
+        elif warmup_status['state'] == LOADING:
+            st.info(f"⏳ {warmup_status['detail']} ({warmup_status['elapsed_sec']:.0f}초 경과)")
+        else:
+            st.warning(f"⚠️ {warmup_status['detail']}")
+            if warmup_status['error']:
+                st.caption(warmup_status['error'])
+        gen_stats = generation_stats()
+        if gen_stats and gen_stats['batches']:
+            st.write(f"생성 배치: {gen_stats['batches']}회 · 평균 {gen_stats['avg_batch_size']:.1f}/{gen_stats['max_batch']}개 (채움률 {gen_stats['fill_rate']:.0%})")
+            st.write(f"배치 대기: 평균 {gen_stats['avg_queue_delay_ms']:.0f}ms · 최대 {gen_stats['max_queue_delay_ms']:.0f}ms · 대기 중 {gen_stats['pending']}개")
+
+    # 작업 큐 상태 표시
+    with st.expander("📋 작업 큐", expanded=False):
+        queue_stats = job_queue.stats()
+        st.write(f"실행 중: {queue_stats['running']}/{queue_stats['max_workers']}")
+        st.write(f"대기 중: {queue_stats['queue_depth']}/{queue_stats['max_queue_depth']}")
+        st.write(f"평균 대기 시간: {queue_stats['avg_wait_sec']:.1f}초")
+        st.write(f"완료 {queue_stats['completed']} · 실패 {queue_stats['failed']} · 거절 {queue_stats['rejected']}")
+        st.write(f"중복 요청 합류: 작업 {queue_stats['coalesced']}건 · 자막 추출 {transcript_flight.stats()['coalesced']}건")
+
+    # 결과 저장소 메모리 사용량 표시
+    with st.expander("💾 결과 저장소", expanded=False):
+        store_stats = result_store.stats()
+        st.write(f"메모리: {store_stats['bytes_held'] / 1024 ** 2:.1f}MB / {store_stats['max_bytes'] / 1024 ** 2:.0f}MB ({store_stats['items']}개)")
+        st.write(f"적중 {store_stats['hits']} · 디스크 읽기 {store_stats['misses']} · 메모리 해제 {store_stats['evictions']}")
+        if store_stats['bytes_written_raw']:
+            ratio = store_stats['bytes_written_compressed'] / store_stats['bytes_written_raw']
+            st.write(f"압축({store_stats['codec']}): {store_stats['bytes_written_raw'] / 1024 ** 2:.1f}MB → {store_stats['bytes_written_compressed'] / 1024 ** 2:.1f}MB ({ratio:.0%})")
+        if search_index is not None:
+            index_stats = search_index.stats()
+            st.write(f"검색 색인: 영상 {index_stats['videos']:,}개 · 구간 {index_stats['passages']:,}개 ({index_stats['bytes'] / 1024 ** 2:.1f}MB)")
+
+# 세션에는 결과 핸들만 보관 (본문은 압축 저장소에서 읽음)
+if 'summary_result' in st.session_state and result_store.get_result(st.session_state['summary_result']['key']) is None:
+    st.warning("저장된 요약 결과를 찾을 수 없습니다. 다시 요약해주세요.")
+    del st.session_state['summary_result']
+
 # 저장된 결과가 있으면 표시
 if 'summary_result' in st.session_state:
-    result = st.session_state['summary_result']
+    result_key = st.session_state['summary_result']['key']
+    result = result_store.get_result(result_key)
     
     # 결과 표시
     st.success("✅ 요약이 완료되었습니다!")
+    if st.session_state['summary_result'].get('draft_shown') and result.get('summary_mode') == ABSTRACTIVE:
+        st.caption("✨ 정제됨: AI 요약이 초안을 대체했습니다")
     
     # 요약 방식 표시
     st.info(f"📊 사용된 요약 방식: {result['summary_method']}")
+    if result.get('plan'):
+        st.caption(f"⏱️ 시간 예산 계획: {describe_plan(result['plan'])}")
+    if result.get('transcript_source'):
+        st.caption(f"📜 자막 출처: {describe_source(result['transcript_source'])}")
     
     # 요약 결과
-    st.subheader("📝 요약 결과")
+    if result.get('videos'):
+        st.subheader(f"📝 재생목록 통합 요약: {result['playlist_title']}")
+    else:
+        st.subheader("📝 요약 결과")
     st.write(result['summary'])
     
+    # 재생목록: 영상별 요약
+    if result.get('videos'):
+        st.subheader(f"🎬 영상별 요약 ({len(result['videos'])}개)")
+        for item in result['videos']:
+            with st.expander(f"{item['index'] + 1}. {item['title']}"):
+                st.caption(item['url'])
+                if 'summary' in item:
+                    st.write(item['summary'])
+                else:
+                    st.error(f"요약 실패: {item['error']}")
+    
     # 다운로드 버튼 (초기화 방지)
     col1, col2 = st.columns([1, 1])
     with col1:
@@ -117,18 +241,40 @@ if 'summary_result' in st.session_state:
     # 사이드바의 show_transcript 값을 사용하여 동적으로 표시
     if show_transcript:
         with st.expander("📄 원본 자막 보기", expanded=True):
-            st.text_area("자막 내용:", result['transcript_text'], height=300, key="transcript_display")
+            # 원본 자막은 펼칠 때만 저장소에서 읽음
+            st.text_area("자막 내용:", result_store.get_transcript_text(result_key), height=300, key="transcript_display")
     
     # 통계 정보
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("원본 길이", f"{len(result['transcript_text']):,}자")
+        st.metric("원본 길이", f"{result['transcript_chars']:,}자")
     with col2:
         st.metric("요약 길이", f"{len(result['summary']):,}자")
     with col3:
-        compression_ratio = (1 - len(result['summary']) / len(result['transcript_text'])) * 100
+        compression_ratio = (1 - len(result['summary']) / max(result['transcript_chars'], 1)) * 100
         st.metric("압축률", f"{compression_ratio:.1f}%")
     
+    if result.get('dedup_stats'):
+        dedup_stats = result['dedup_stats']
+        st.caption(
+            f"🧹 요약 전 중복 자막 제거: {dedup_stats['removed_fraction'] * 100:.1f}% "
+            f"({dedup_stats['chars_before']:,}자 → {dedup_stats['chars_after']:,}자)"
+        )
+    
+    # 트리 요약 단계별 비용 (단계마다 노드 수/토큰 수/소요 시간)
+    if result.get('reduce_stats'):
+        with st.expander("📈 요약 단계별 통계", expanded=False):
+            st.table([
+                {
+                    "단계": stats['level'],
+                    "노드": f"{stats['nodes_in']} → {stats['nodes_out']}",
+                    "입력 토큰": stats['input_tokens'],
+                    "출력 토큰": stats['output_tokens'],
+                    "시간(초)": round(stats['seconds'], 1),
+                }
+                for stats in result['reduce_stats']
+            ])
+    
     st.markdown("---")
 
 # 메인 컨텐츠
@@ -151,129 +297,144 @@ with col2:
     4. 결과 확인 및 다운로드
     """)
 
-# --- 모델 로딩 ---
-# 앱 시작 시 한 번만 모델을 로드하여 성능 향상
-@st.cache_resource
-def load_models():
-    summarizer = Summarizer()
-    detector = GPUDetector()
-    return summarizer, detector
-
-# 요약 실행
+# 요약 실행 (작업 등록 후 즉시 반환, 진행 상황은 아래에서 주기적으로 확인)
 if st.button("🚀 요약하기", type="primary"):
+    st.session_state.pop('draft_shown', None)  # 이전 작업의 초안 표시 기록
     if not url:
         st.warning("유튜브 URL을 입력해주세요.")
+    elif is_playlist_url(url, include_watch_lists=summarize_playlist):
+        # 재생목록/채널: 영상별 요약 후 통합 요약 (영상별 결과는 완료되는 대로 표시)
+        target_lang = "ko" if summary_language == "한국어" else "en"
+        try:
+            st.session_state['job_id'] = job_queue.submit(
+                run_playlist_job, url, target_lang, summary_mode,
+                key=("playlist",) + job_key(extract_playlist_id(url) or url, target_lang, summary_config(summary_mode))
+            )
+        except QueueFullError as e:
+            st.warning(f"⏳ {str(e)}")
+    elif not extract_video_id(url):
+        st.error("유효하지 않은 유튜브 URL입니다.")
+    elif JOB_BACKEND != "local":
+        # 분산 모드: 공유 큐에 등록 (같은 영상/언어/설정의 작업이 진행 중이면 그 작업에 합류)
+        from worker import enqueue_summary
+        target_lang = "ko" if summary_language == "한국어" else "en"
+        st.session_state['dist_job_id'] = enqueue_summary(get_dist_queue(), url, target_lang, summary_mode, budget_sec)
     else:
-        # 진행 상황 표시
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
+        # 사용자가 선택한 언어를 우선 사용
+        target_lang = "ko" if summary_language == "한국어" else "en"
         try:
-            # 캐시된 모델 로드
-            summarizer, detector = load_models()
-
-            # 1단계: 비디오 ID 추출
-            status_text.text("비디오 ID 추출 중...")
-            progress_bar.progress(10)
-            
-            video_id = extract_video_id(url)
-            if not video_id:
-                st.error("유효하지 않은 유튜브 URL입니다.")
-                st.stop()
-            
-            # 2단계: 자막/음성 추출
-            status_text.text("자막/음성 추출 중...")
-            progress_bar.progress(30)
-            
-            transcript_data = get_transcript(url, use_whisper=True)
-            if not transcript_data:
-                st.error("자막/음성 추출에 실패했습니다.")
-                st.stop()
-            
-            # 3단계: 텍스트 변환
-            status_text.text("텍스트 변환 중...")
-            progress_bar.progress(50)
-            
-            transcript_text = format_transcript(transcript_data)
-            
-            # 4단계: 원본 언어 감지 및 요약 언어 설정
-            detected_lang = detect_language(transcript_text)
-            st.info(f"원본 텍스트 언어 감지: {'한국어' if detected_lang == 'ko' else '영어'}")
-            
-            # 사용자가 선택한 언어를 우선 사용
-            if summary_language == "한국어":
-                target_lang = "ko"
-                st.info("✅ 요약 언어: 한국어로 요약합니다")
-            else:
-                target_lang = "en"
-                st.info("✅ 요약 언어: 영어로 요약합니다")
-            
-            # 원본 언어와 다른 경우 안내 메시지
-            if (detected_lang == 'ko' and target_lang == 'en') or \
-               (detected_lang == 'en' and target_lang == 'ko'):
-                st.info("💡 원본 언어와 다른 언어로 요약합니다. 번역 품질에 따라 결과가 달라질 수 있습니다.")
-            
-            # 5단계: 요약 생성
-            status_text.text("AI 요약 생성 중...")
-            progress_bar.progress(70)
-            
-            # Whisper 처리 시간 안내
-            if "음성 인식" in st.session_state.get('last_method', ''):
-                st.info("""
-                ⏱️ **처리 시간 안내**
-                - 현재 Whisper 음성 인식이 진행 중입니다
-                - 파일 크기에 따라 5-15분 소요될 수 있습니다
-                - 브라우저를 닫지 마세요 (처리가 중단됩니다)
-                """)
-            
-            # 길이 제한 제거 - 자동으로 최적 길이 결정
-            st.info("📏 요약 길이: 자동 조절 (제한 없음)")
-            
-            # 자동 모델 선택으로 요약
-            summary = summarizer.summarize_text(
-                transcript_text, 
-                language=target_lang
+            # 같은 영상/언어/설정의 작업이 이미 진행 중이면 그 작업에 합류
+            st.session_state['job_id'] = job_queue.submit(
+                run_summary_job, url, target_lang, summary_mode, budget_sec,
+                key=job_key(extract_video_id(url), target_lang, summary_config(summary_mode, budget_sec)),
+                wants_draft=True
             )
-            
-            # 사용된 모델 정보 표시
-            device_info = detector.get_device_info()
-            vram_gb = device_info["vram_gb"]
-            device = device_info["device"]
-            gpu_name = device_info["gpu_name"]
-            
-            if device == "cuda":
-                if vram_gb >= 12:
-                    summary_method = f"LongT5 Full Precision (GPU: {gpu_name})"
-                elif vram_gb >= 8:
-                    summary_method = f"LongT5 8bit (GPU: {gpu_name})"
-                elif vram_gb >= 4:
-                    summary_method = f"LongT5 8bit (GPU: {gpu_name})"
-                elif vram_gb >= 2:
-                    summary_method = f"LongT5 4bit (GPU: {gpu_name})"
-                else:
-                    summary_method = f"LongT5 4bit (GPU: {gpu_name})"
-            else:
-                summary_method = "BART (CPU)"
-            
-            progress_bar.progress(100)
-            status_text.text("완료!")
-            
-            # 결과를 session_state에 저장
-            st.session_state['summary_result'] = {
-                'summary': summary,
-                'summary_method': summary_method,
-                'video_id': video_id,
-                'transcript_text': transcript_text,
-                'show_transcript': show_transcript
-            }
-            
-            # 결과가 저장되었으므로 페이지 새로고침
-            st.rerun()
-                
-        except Exception as e:
-            st.error(f"오류가 발생했습니다: {str(e)}")
-            st.exception(e)  # 상세한 오류 정보 표시
-            st.info("다른 영상으로 시도해보세요.")
+        except QueueFullError as e:
+            st.warning(f"⏳ {str(e)}")
+
+@st.fragment(run_every=2)
+def show_job_status(job_id):
+    """작업 상태 폴링 (완료되면 결과를 저장하고 전체 페이지 새로고침)"""
+    job = job_queue.get(job_id)
+    if job is None:
+        st.warning("작업 정보를 찾을 수 없습니다. 다시 요약해주세요.")
+        return
+    
+    if job.status == DONE:
+        # 초안을 실제로 보여준 경우에만 "정제됨" 표시 (핸들은 여러 세션이 공유하므로 복사)
+        st.session_state['summary_result'] = dict(job.result, draft_shown=st.session_state.pop('draft_shown', False))
+        st.session_state.pop('job_id', None)
+        st.rerun()
+    
+    if job.status == FAILED:
+        st.session_state.pop('job_id', None)
+        st.error(f"오류가 발생했습니다: {job.error}")
+        st.info("다른 영상으로 시도해보세요.")
+        return
+    
+    if job.status == QUEUED:
+        st.info(f"⏳ 대기 중... (대기 순번: {job_queue.position(job_id)}, 대기 시간: {job.wait_time:.0f}초)")
+        return
+    
+    st.progress(job.progress)
+    st.text(f"{job.stage} (경과 시간: {job.run_time:.0f}초)")
+    if job.subscribers > 1:
+        st.caption(f"👥 같은 영상을 요청한 {job.subscribers}개 세션이 이 작업 결과를 함께 사용합니다")
+    for message in job.messages:
+        st.info(message)
+    # 요약 초안: AI 요약이 끝나면 최종 결과로 교체됨
+    if job.draft:
+        st.subheader("📝 요약 초안")
+        st.caption("📄 초안 (핵심 문장 추출) · AI 요약을 생성하는 중이며, 완료되면 이 내용이 정제된 요약으로 바뀝니다")
+        st.write(job.draft['summary'])
+        st.session_state['draft_shown'] = True
+    # 재생목록: 완료된 영상 요약부터 바로 표시
+    for item in sorted(job.partial, key=lambda item: item['index']):
+        with st.expander(f"✅ {item['index'] + 1}. {item['title']}" if 'summary' in item else f"❌ {item['index'] + 1}. {item['title']}"):
+            st.write(item.get('summary') or f"요약 실패: {item.get('error')}")
+    if job.progress >= 30 and job.progress < 50:
+        # 음성 인식 진행률/예상 남은 시간은 위 진행 표시줄과 단계 설명에 표시됨
+        st.caption("⏱️ 처리는 서버에서 계속되므로 이 페이지를 새로고침해도 됩니다")
+
+if 'job_id' in st.session_state:
+    show_job_status(st.session_state['job_id'])
+
+@st.fragment(run_every=2)
+def show_dist_job_status(job_id):
+    """공유 큐 작업 상태 폴링 (워커 노드가 처리)"""
+    from dist_queue import QUEUED as DIST_QUEUED, DONE as DIST_DONE, FAILED as DIST_FAILED
+    from worker import store_dist_result
+    job = get_dist_queue().get(job_id)
+    if job is None:
+        st.warning("작업 정보를 찾을 수 없습니다. 다시 요약해주세요.")
+        return
+    
+    if job.status == DIST_DONE:
+        st.session_state['summary_result'] = store_dist_result(job.result)
+        st.session_state.pop('dist_job_id', None)
+        st.rerun()
+    
+    if job.status == DIST_FAILED:
+        st.session_state.pop('dist_job_id', None)
+        st.error(f"오류가 발생했습니다: {job.error}")
+        return
+    
+    stage_label = "자막/음성 추출" if job.stage == "transcript" else "요약"
+    if job.status == DIST_QUEUED:
+        st.info(f"⏳ {stage_label} 단계 워커 대기 중... (시도 {job.attempts}/{job.max_attempts})")
+    else:
+        st.progress(job.progress)
+        st.text(f"{job.message} ({stage_label} 단계, 워커: {job.worker})")
+    if job.error:
+        st.caption(f"이전 시도 오류: {job.error}")
+
+if 'dist_job_id' in st.session_state:
+    show_dist_job_status(st.session_state['dist_job_id'])
+
+# 처리한 영상 검색 ("어느 영상에서 X를 말했지?" - 자막 검색 결과는 해당 시각부터 재생하는 링크)
+if search_index is not None:
+    st.markdown("---")
+    st.subheader("🔎 처리한 영상 검색")
+    search_query = st.text_input(
+        "검색어를 입력하세요:",
+        placeholder="예: 인플레이션 금리",
+        help="지금까지 요약한 모든 영상의 제목/요약/자막에서 검색합니다. 띄어쓴 검색어는 모두 포함된 영상만 찾습니다."
+    )
+    if search_query:
+        search_results = search_index.search(search_query)
+        st.caption(f"{len(search_results)}개 영상 ({search_index.last_search_ms:.1f}ms)")
+        for item in search_results:
+            with st.expander(item.get('title') or item['video_id'], expanded=True):
+                st.markdown(f"[▶️ 영상 열기]({item['url']})")
+                for hit in item['hits']:
+                    if hit['kind'] == TITLE:
+                        continue
+                    if hit['kind'] == SUMMARY:
+                        st.markdown(f"**요약** · {hit['text'][:300]}")
+                    elif hit['start'] is not None:
+                        st.markdown(f"[{format_timestamp(hit['start'])}]({hit['url']}) · {hit['text']}")
+                    else:
+                        st.markdown(f"**자막** · {hit['text']}")
 
 # 푸터
 st.markdown("---")
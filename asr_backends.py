@@ -0,0 +1,186 @@
+import argparse
+import os
+import time
+from typing import Callable, Optional
+
+from audio_utils import SAMPLE_RATE, audio_duration
+from settings import ASR_BACKEND, ASR_CT2_COMPUTE_TYPE
+
+# 음성 인식 엔진 (모두 같은 {"text", "segments": [{"text", "start", "end"}], "language"} 형식 반환)
+WHISPER = "whisper"
+CTRANSLATE2 = "ctranslate2"
+
+
+def ct2_compute_type(device):
+    """CTranslate2 가중치 형식 (설정값, 없으면 CPU는 int8, GPU는 int8_float16)"""
+    return ASR_CT2_COMPUTE_TYPE or ("int8" if device == "cpu" else "int8_float16")
+
+
+def backend_tag(name, device):
+    """처리량 이력 구분용 엔진 표시 (기본 엔진인 whisper는 빈 문자열)"""
+    return "" if name == WHISPER else f"ct2-{ct2_compute_type(device)}"
+
+
+class WhisperBackend:
+    """openai-whisper (PyTorch, GPU에서는 fp16, CPU에서는 fp32)"""
+
+    name = WHISPER
+
+    def __init__(self, model_name, device="cpu", cpu_threads=0):
+        import whisper
+        if device == "cpu" and cpu_threads:
+            import torch
+            torch.set_num_threads(cpu_threads)
+        self.model_name = model_name
+        self.device = device
+        self.model = whisper.load_model(model_name, device=device)
+
+    @property
+    def tag(self):
+        return backend_tag(self.name, self.device)
+
+    def detect_language(self, audio):
+        import whisper
+        audio = whisper.pad_or_trim(audio)
+        mel = whisper.log_mel_spectrogram(audio, self.model.dims.n_mels).to(self.model.device)
+        _, probs = self.model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+    def transcribe(self, audio, language=None, on_progress: Optional[Callable[[float, float], None]] = None,
+                   initial_prompt=None):
+        from asr_progress import track_transcribe_progress
+
+        # initial_prompt: 앞 구간 인식 결과 (스트리밍 인식에서 디코더 문맥을 이어감)
+        options = {"language": language, "verbose": None, "initial_prompt": initial_prompt}
+        if self.device == "cpu":
+            options["fp16"] = False
+        if on_progress is None:
+            result = self.model.transcribe(audio, **options)
+        else:
+            # 내부 tqdm 진행 위치를 콜백으로 전달
+            with track_transcribe_progress(on_progress, audio_duration(audio)):
+                result = self.model.transcribe(audio, **options)
+        return {
+            "text": result["text"],
+            "segments": [{"text": seg["text"], "start": seg["start"], "end": seg["end"]}
+                         for seg in result.get("segments", [])],
+            "language": result.get("language", language),
+        }
+
+
+class CTranslate2Backend:
+    """faster-whisper (CTranslate2 엔진, CPU에서 int8 양자화 가중치로 인식)"""
+
+    name = CTRANSLATE2
+
+    def __init__(self, model_name, device="cpu", cpu_threads=0, compute_type=None):
+        from faster_whisper import WhisperModel
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type or ct2_compute_type(device)
+        self.model = WhisperModel(model_name, device=device, compute_type=self.compute_type,
+                                  cpu_threads=cpu_threads or (os.cpu_count() or 1))
+
+    @property
+    def tag(self):
+        return f"ct2-{self.compute_type}"
+
+    def detect_language(self, audio):
+        # 언어 감지는 transcribe 호출 시 바로 수행되고 세그먼트 디코딩은 순회할 때 진행됨
+        _, info = self.model.transcribe(audio[:30 * SAMPLE_RATE], language=None)
+        return info.language
+
+    def transcribe(self, audio, language=None, on_progress: Optional[Callable[[float, float], None]] = None,
+                   initial_prompt=None):
+        total_sec = audio_duration(audio)
+        segments_iter, info = self.model.transcribe(audio, language=language, beam_size=5,
+                                                    condition_on_previous_text=True, initial_prompt=initial_prompt)
+        segments = []
+        for seg in segments_iter:
+            segments.append({"text": seg.text, "start": seg.start, "end": seg.end})
+            if on_progress:
+                on_progress(min(seg.end, total_sec), total_sec)
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+
+ASR_BACKENDS = {
+    WHISPER: WhisperBackend,
+    CTRANSLATE2: CTranslate2Backend,
+}
+
+
+def ctranslate2_available():
+    try:
+        import faster_whisper  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def select_asr_backend(device, name=ASR_BACKEND):
+    """노드 하드웨어에 맞는 엔진 선택 (auto: CPU 노드는 설치되어 있으면 CTranslate2 int8, GPU 노드는 whisper)"""
+    if name != "auto":
+        return name
+    if device == "cpu" and ctranslate2_available():
+        return CTRANSLATE2
+    return WHISPER
+
+
+def load_asr_backend(model_name, device="cpu", name=None, cpu_threads=0):
+    """엔진 로드 (CTranslate2 로드 실패 시 whisper로 대체)"""
+    name = name or select_asr_backend(device)
+    if name != WHISPER:
+        try:
+            return ASR_BACKENDS[name](model_name, device=device, cpu_threads=cpu_threads)
+        except Exception:
+            pass
+    return WhisperBackend(model_name, device=device, cpu_threads=cpu_threads)
+
+
+def benchmark_rtf(audio, model_name="base", device="cpu", backends=(WHISPER, CTRANSLATE2), language=None):
+    """같은 오디오로 엔진별 로드 시간/인식 시간/실시간 배율(오디오 초 / 인식 초) 측정"""
+    audio_sec = audio_duration(audio)
+    results = []
+    for name in backends:
+        start = time.time()
+        backend = ASR_BACKENDS[name](model_name, device=device)
+        load_sec = time.time() - start
+        start = time.time()
+        result = backend.transcribe(audio, language=language)
+        wall_sec = time.time() - start
+        results.append({
+            "backend": f"{name} {backend.tag}".strip(),
+            "model": model_name,
+            "device": device,
+            "audio_sec": audio_sec,
+            "load_sec": load_sec,
+            "wall_sec": wall_sec,
+            "rtf": audio_sec / wall_sec if wall_sec > 0 else 0.0,
+            "segments": len(result["segments"]),
+            "chars": len(result["text"]),
+        })
+        del backend
+    return results
+
+
+if __name__ == "__main__":
+    from audio_utils import decode_audio, find_ffmpeg
+
+    parser = argparse.ArgumentParser(description="음성 인식 엔진 실시간 배율 비교")
+    parser.add_argument("audio", help="오디오 파일")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--device", default="cpu", choices=["cpu", "cuda"])
+    parser.add_argument("--backends", default=f"{WHISPER},{CTRANSLATE2}")
+    parser.add_argument("--language", default=None)
+    args = parser.parse_args()
+
+    pcm = decode_audio(args.audio, find_ffmpeg() or "ffmpeg")
+    print(f"오디오 길이: {audio_duration(pcm) / 60:.1f}분 ({args.model}, {args.device})")
+    print(f"{'backend':<24} {'load(s)':>8} {'asr(s)':>8} {'RTF':>7} {'segments':>9} {'chars':>8}")
+    for row in benchmark_rtf(pcm, args.model, args.device, args.backends.split(","), args.language):
+        print(f"{row['backend']:<24} {row['load_sec']:>8.1f} {row['wall_sec']:>8.1f} "
+              f"{row['rtf']:>6.2f}x {row['segments']:>9} {row['chars']:>8}")
@@ -0,0 +1,203 @@
+import importlib
+import json
+import os
+import statistics
+import threading
+import time
+import types
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from settings import ASR_HISTORY_PATH
+
+# Whisper는 mel 프레임 단위(10ms)로 진행 위치(seek)를 갱신
+FRAMES_PER_SECOND = 100
+
+# 이력이 없을 때 사용할 실시간 배율 추정치 (오디오 초 / 실제 경과 초)
+DEFAULT_RTF = {
+    "cpu": {"tiny": 4.0, "base": 2.0, "small": 0.8, "medium": 0.3, "large-v3": 0.15},
+    "cuda": {"tiny": 30.0, "base": 20.0, "small": 10.0, "medium": 5.0, "large-v3": 3.0},
+}
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+class _FrameProgress:
+    """whisper.transcribe 내부 tqdm 대체 (디코딩된 프레임 수를 스레드별 콜백으로 전달)"""
+
+    def __init__(self, *args, total=None, **kwargs):
+        self.total = total or 0
+        self.n = 0
+
+    def update(self, n=1):
+        self.n += n
+        callback = getattr(_local, "callback", None)
+        if callback is not None:
+            callback(self.n, self.total)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _install_hook():
+    """whisper.transcribe 모듈의 tqdm을 한 번만 교체"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        # whisper/__init__.py가 transcribe 함수를 같은 이름으로 노출하므로 모듈을 직접 가져옴
+        transcribe_module = importlib.import_module("whisper.transcribe")
+        transcribe_module.tqdm = types.SimpleNamespace(tqdm=_FrameProgress)
+        _installed = True
+
+
+@contextmanager
+def track_transcribe_progress(callback: Callable[[float, float], None], duration_sec: float):
+    """model.transcribe 실행 중 (디코딩된 오디오 초, 전체 오디오 초)를 콜백으로 전달"""
+    _install_hook()
+
+    def on_frames(frames, total_frames):
+        total_sec = total_frames / FRAMES_PER_SECOND if total_frames else duration_sec
+        callback(min(frames / FRAMES_PER_SECOND, total_sec), total_sec)
+
+    previous = getattr(_local, "callback", None)
+    _local.callback = on_frames
+    try:
+        yield
+    finally:
+        _local.callback = previous
+
+
+def history_device(device: str, backend_tag: str = "", workers: int = 1, streaming: bool = False) -> str:
+    """처리량 이력 구분 키 (디바이스, 병렬 워커 수, 엔진, 스트리밍 여부별로 따로 기록, 예: "cpu x4 ct2-int8")"""
+    parts = [f"{device} x{workers}" if workers > 1 else device]
+    if backend_tag:
+        parts.append(backend_tag)
+    if streaming:
+        parts.append("stream")
+    return " ".join(parts)
+
+
+class ASRThroughputHistory:
+    """모델/디바이스별 Whisper 처리량 이력 (ETA 보정 및 용량 산정용)"""
+
+    # 호출마다 인스턴스를 만들므로 파일 잠금은 프로세스 전역으로 공유
+    _lock = threading.Lock()
+
+    def __init__(self, path: str = ASR_HISTORY_PATH, max_samples: int = 50):
+        self.path = path
+        self.max_samples = max_samples
+
+    @staticmethod
+    def _key(model_name: str, device: str) -> str:
+        return f"{model_name}|{device}"
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def record(self, model_name: str, device: str, audio_sec: float, wall_sec: float,
+               skipped_sec: float = 0.0) -> float:
+        """처리 결과를 기록하고 실시간 배율을 반환 (skipped_sec: VAD로 제외한 비음성 구간)"""
+        rtf = audio_sec / wall_sec if wall_sec > 0 else 0.0
+        if audio_sec <= 0 or rtf <= 0:
+            return rtf
+        with self._lock:
+            data = self._load()
+            samples = data.setdefault(self._key(model_name, device), [])
+            samples.append({
+                "audio_sec": round(audio_sec, 2),
+                "wall_sec": round(wall_sec, 2),
+                "rtf": round(rtf, 3),
+                "skipped_sec": round(skipped_sec, 2),
+                "timestamp": time.time(),
+            })
+            del samples[:-self.max_samples]
+            self._save(data)
+        return rtf
+
+    def samples(self, model_name: str, device: str) -> list:
+        with self._lock:
+            return list(self._load().get(self._key(model_name, device), []))
+
+    def estimate_rtf(self, model_name: str, device: str) -> float:
+        """이력의 중앙값 실시간 배율 (이력이 없으면 기본 추정치)"""
+        rtfs = [s["rtf"] for s in self.samples(model_name, device) if s.get("rtf", 0) > 0]
+        if rtfs:
+            return statistics.median(rtfs)
+        return DEFAULT_RTF.get(device.split()[0], DEFAULT_RTF["cpu"]).get(model_name, 1.0)
+
+    def summary(self) -> dict:
+        """모델/디바이스별 처리량 통계"""
+        with self._lock:
+            data = self._load()
+        stats = {}
+        for key, samples in data.items():
+            rtfs = [s["rtf"] for s in samples]
+            if not rtfs:
+                continue
+            stats[key] = {
+                "runs": len(rtfs),
+                "median_rtf": statistics.median(rtfs),
+                "audio_hours": sum(s["audio_sec"] for s in samples) / 3600,
+                "skipped_hours": sum(s.get("skipped_sec", 0) for s in samples) / 3600,
+            }
+        return stats
+
+
+class ASRProgressEstimator:
+    """실제 디코딩 위치와 이력 배율을 결합해 진행률/ETA 계산"""
+
+    def __init__(self, duration_sec: float, prior_rtf: float):
+        self.duration_sec = duration_sec
+        self.prior_rtf = prior_rtf
+        self.start_time = time.time()
+        self.decoded_sec = 0.0
+
+    def update(self, decoded_sec: float):
+        self.decoded_sec = decoded_sec
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.start_time
+
+    @property
+    def progress(self) -> float:
+        if self.duration_sec <= 0:
+            return 0.0
+        return min(self.decoded_sec / self.duration_sec, 1.0)
+
+    @property
+    def live_rtf(self) -> Optional[float]:
+        if self.decoded_sec <= 0 or self.elapsed <= 0:
+            return None
+        return self.decoded_sec / self.elapsed
+
+    def eta_seconds(self) -> float:
+        """남은 오디오 / 보정된 배율 (진행될수록 실측 배율 비중 증가)"""
+        remaining = max(self.duration_sec - self.decoded_sec, 0.0)
+        live = self.live_rtf
+        if live is None:
+            rtf = self.prior_rtf
+        else:
+            weight = min(self.progress * 4, 1.0)  # 25% 진행 이후에는 실측값만 사용
+            rtf = weight * live + (1 - weight) * self.prior_rtf
+        return remaining / rtf if rtf > 0 else 0.0
@@ -0,0 +1,240 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from settings import AUDIO_CACHE_DIR, AUDIO_CACHE_QUOTA_GB
+
+PCM_SUFFIX = ".pcm16k.npy"
+
+
+def _file_sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _pcm_header(samples):
+    """1차원 float32 .npy 헤더 (길이 자릿수와 무관하게 64바이트 정렬로 같은 크기)"""
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, {"descr": "<f4", "fortran_order": False, "shape": (samples,)})
+    return header.getvalue()
+
+
+class AudioCache:
+    """내용 주소 기반 오디오/PCM 디스크 캐시 (용량 제한, LRU 삭제, mmap 읽기)
+
+    - 압축 오디오: blobs/<sha 앞 2자리>/<sha>.<ext>
+    - 디코딩된 PCM: blobs/<sha 앞 2자리>/<sha>.pcm16k.npy (np.load mmap으로 디코딩 비용 없이 재사용)
+    - index.json: 비디오 ID → sha 매핑
+    - jobs/<uuid>: 작업별 격리된 다운로드 디렉토리
+    """
+
+    # 호출마다 인스턴스를 만들므로 인덱스 잠금은 프로세스 전역으로 공유
+    _lock = threading.RLock()
+
+    def __init__(self, root=AUDIO_CACHE_DIR, quota_bytes=int(AUDIO_CACHE_QUOTA_GB * 1024 ** 3)):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.blob_dir = os.path.join(root, "blobs")
+        self.job_root = os.path.join(root, "jobs")
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.job_root, exist_ok=True)
+
+    # --- 인덱스 ---
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        tmp_path = f"{self.index_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _blob_path(self, sha, suffix):
+        return os.path.join(self.blob_dir, sha[:2], sha + suffix)
+
+    @staticmethod
+    def _touch(path):
+        """LRU 순서 갱신 (마지막 사용 시각 = mtime)"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    # --- 작업별 격리 디렉토리 ---
+    @contextmanager
+    def job_dir(self):
+        """다른 작업과 파일이 섞이지 않도록 작업별 임시 다운로드 디렉토리 제공"""
+        path = os.path.join(self.job_root, uuid.uuid4().hex)
+        os.makedirs(path)
+        try:
+            yield path
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    # --- 압축 오디오 ---
+    def get_audio(self, video_id):
+        """캐시된 압축 오디오 경로 (없으면 None)"""
+        with self._lock:
+            entry = self._load_index().get(video_id)
+        if not entry:
+            return None
+        path = self._blob_path(entry["sha"], "." + entry["ext"])
+        if not os.path.exists(path):
+            return None
+        self._touch(path)
+        return path
+
+    def put_audio(self, video_id, downloaded_path):
+        """다운로드된 파일을 내용 해시 위치로 이동 후 캐시 경로 반환"""
+        sha = _file_sha256(downloaded_path)
+        ext = os.path.splitext(downloaded_path)[1].lstrip(".") or "bin"
+        path = self._blob_path(sha, "." + ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.remove(downloaded_path)  # 같은 내용이 이미 있음
+            self._touch(path)
+        else:
+            shutil.move(downloaded_path, path)
+            # 다운로드 파일의 수정 시각은 서버 Last-Modified일 수 있으므로 지금 사용한 것으로 갱신
+            self._touch(path)
+        with self._lock:
+            index = self._load_index()
+            index[video_id] = {"sha": sha, "ext": ext}
+            self._save_index(index)
+        self.enforce_quota(keep=(path,))
+        return path
+
+    # --- 디코딩된 PCM ---
+    def get_pcm(self, video_id):
+        """캐시된 PCM을 메모리 매핑으로 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._load_index().get(video_id)
+        if not entry:
+            return None
+        path = self._blob_path(entry["sha"], PCM_SUFFIX)
+        if not os.path.exists(path):
+            return None
+        self._touch(path)
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    def _pcm_path(self, video_id):
+        with self._lock:
+            entry = self._load_index().get(video_id)
+        if not entry:
+            raise KeyError(f"캐시에 오디오가 없습니다: {video_id}")
+        return self._blob_path(entry["sha"], PCM_SUFFIX)
+
+    def put_pcm(self, video_id, audio):
+        """디코딩된 PCM을 .npy로 저장하고 메모리 매핑 배열 반환"""
+        path = self._pcm_path(video_id)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.npy"
+        np.save(tmp_path, np.asarray(audio, dtype=np.float32))
+        return self._commit_pcm(tmp_path, path)
+
+    def put_pcm_blocks(self, video_id, blocks):
+        """PCM 블록(ffmpeg 파이프 등)을 .npy에 이어 써서 저장하고 메모리 매핑 배열 반환
+
+        전체 오디오를 메모리에 올리지 않음 (헤더는 길이를 모르는 채로 자리만 잡고 마지막에 다시 씀)
+        """
+        path = self._pcm_path(video_id)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.npy"
+        try:
+            with open(tmp_path, "wb") as f:
+                header = _pcm_header(0)
+                f.write(header)
+                samples = 0
+                for block in blocks:
+                    block = np.asarray(block, dtype="<f4")
+                    f.write(block.tobytes())
+                    samples += len(block)
+                final_header = _pcm_header(samples)
+                if len(final_header) != len(header):
+                    raise RuntimeError(f"PCM 헤더 길이가 바뀌었습니다: {len(header)} → {len(final_header)}")
+                f.seek(0)
+                f.write(final_header)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return self._commit_pcm(tmp_path, path)
+
+    def _commit_pcm(self, tmp_path, path):
+        os.replace(tmp_path, path)
+        # 용량 정리 전에 매핑 (방금 저장한 PCM은 정리 대상에서 제외)
+        self._touch(path)
+        pcm = np.load(path, mmap_mode="r")
+        self.enforce_quota(keep=(path,))
+        return pcm
+
+    # --- 용량 관리 ---
+    def usage(self):
+        """캐시 파일 목록과 전체 크기"""
+        files = []
+        for dirpath, _, filenames in os.walk(self.blob_dir):
+            for name in filenames:
+                if ".tmp" in name:
+                    continue  # 쓰는 중인 파일은 삭제 대상에서 제외
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files, sum(size for _, size, _ in files)
+
+    def enforce_quota(self, keep=()):
+        """용량 초과 시 가장 오래 사용하지 않은 파일부터 삭제 (keep: 방금 저장해 곧 사용할 파일은 제외)"""
+        with self._lock:
+            files, total = self.usage()
+            if total <= self.quota_bytes:
+                return 0
+            evicted = 0
+            for _, size, path in sorted(files):
+                if total <= self.quota_bytes:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue  # 다른 프로세스가 사용 중인 경우
+                total -= size
+                evicted += 1
+            # 압축 오디오가 삭제된 항목은 인덱스에서 제거
+            index = self._load_index()
+            alive = {
+                video_id: entry for video_id, entry in index.items()
+                if os.path.exists(self._blob_path(entry["sha"], "." + entry["ext"]))
+                or os.path.exists(self._blob_path(entry["sha"], PCM_SUFFIX))
+            }
+            if len(alive) != len(index):
+                self._save_index(alive)
+            return evicted
+
+    def stats(self):
+        files, total = self.usage()
+        return {
+            "files": len(files),
+            "bytes": total,
+            "quota_bytes": self.quota_bytes,
+        }
@@ -0,0 +1,153 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Whisper 입력 형식: 16kHz mono float32 PCM
+SAMPLE_RATE = 16000
+
+FFMPEG_PATHS = [
+    "C:\\ffmpeg\\bin\\ffmpeg.exe",  # 권장 설치 경로
+    "C:\\ffmpegWbin\\ffmpeg.exe",
+    "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe",
+    "ffmpeg"  # PATH에 있는 경우
+]
+
+
+def find_ffmpeg():
+    """설치된 ffmpeg 실행 파일 경로 (없으면 None)"""
+    for path in FFMPEG_PATHS:
+        try:
+            subprocess.run([path, "-version"], capture_output=True, check=True, timeout=5)
+            return path
+        except Exception:
+            continue
+    return None
+
+
+def decode_audio(path, ffmpeg="ffmpeg", sample_rate=SAMPLE_RATE):
+    """다운로드된 컨테이너(webm/m4a 등)를 한 번에 16kHz mono float32 PCM으로 디코딩"""
+    cmd = [
+        ffmpeg, "-nostdin", "-threads", "0",
+        "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate),
+        "-"
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"오디오 디코딩 실패: {e.stderr.decode(errors='ignore')}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+def stream_pcm(path, ffmpeg="ffmpeg", block_sec=10, sample_rate=SAMPLE_RATE):
+    """ffmpeg 출력 파이프에서 block_sec 길이씩 16kHz mono float32 PCM을 읽어 반환 (전체를 메모리에 올리지 않음)"""
+    cmd = [
+        ffmpeg, "-nostdin", "-threads", "0",
+        "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate),
+        "-"
+    ]
+    block_bytes = int(block_sec * sample_rate) * 2
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) // 2 * 2], np.int16).astype(np.float32) / 32768.0
+        if proc.wait() != 0:
+            raise RuntimeError(f"오디오 디코딩 실패 (ffmpeg 종료 코드 {proc.returncode})")
+    finally:
+        # 중간에 읽기를 멈추면 ffmpeg 종료
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
+
+def pcm_windows(audio, block_sec=10, sample_rate=SAMPLE_RATE):
+    """PCM 배열(mmap 포함)을 block_sec 길이씩 복사해 반환 (필요한 구간만 페이지 캐시에서 읽힘)"""
+    block = int(block_sec * sample_rate)
+    for start in range(0, len(audio), block):
+        yield np.array(audio[start:start + block], dtype=np.float32)
+
+
+def probe_duration(path, ffmpeg="ffmpeg"):
+    """ffmpeg 헤더 정보로 오디오 길이(초) 확인 (디코딩하지 않음, 실패하면 None)"""
+    try:
+        stderr = subprocess.run([ffmpeg, "-nostdin", "-hide_banner", "-i", path],
+                                capture_output=True, timeout=30).stderr.decode(errors="ignore")
+    except Exception:
+        return None
+    match = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def save_pcm(audio, path):
+    """디코딩된 PCM을 raw .npy 파일로 저장 (재디코딩 없이 재사용)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.save(path, audio.astype(np.float32, copy=False))
+    return path
+
+
+def audio_duration(audio, sample_rate=SAMPLE_RATE):
+    """PCM 배열 길이 (초)"""
+    return len(audio) / sample_rate
+
+
+def benchmark_audio_paths(source_path, ffmpeg="ffmpeg"):
+    """기존 경로(mp3 192k 재인코딩 후 디코딩)와 직접 PCM 디코딩 비교 (오디오 1시간 기준)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 기존 경로: 컨테이너 → mp3 재인코딩 → PCM 디코딩
+        mp3_path = os.path.join(tmp_dir, "audio.mp3")
+        start = time.perf_counter()
+        subprocess.run(
+            [ffmpeg, "-nostdin", "-y", "-i", source_path, "-vn", "-acodec", "libmp3lame", "-b:a", "192k", mp3_path],
+            capture_output=True, check=True
+        )
+        transcode_sec = time.perf_counter() - start
+        start = time.perf_counter()
+        decode_audio(mp3_path, ffmpeg)
+        mp3_decode_sec = time.perf_counter() - start
+        mp3_bytes = os.path.getsize(mp3_path)
+
+        # 직접 경로: 컨테이너 → PCM 디코딩 1회
+        start = time.perf_counter()
+        audio = decode_audio(source_path, ffmpeg)
+        direct_sec = time.perf_counter() - start
+
+    hours = audio_duration(audio) / 3600
+    if hours <= 0:
+        raise ValueError("오디오 길이가 0입니다.")
+    legacy_sec = transcode_sec + mp3_decode_sec
+    return {
+        "audio_hours": hours,
+        "legacy_sec_per_hour": legacy_sec / hours,
+        "direct_sec_per_hour": direct_sec / hours,
+        "saved_sec_per_hour": (legacy_sec - direct_sec) / hours,
+        "saved_mb_per_hour": mp3_bytes / (1024 * 1024) / hours,
+    }
+
+
+if __name__ == "__main__":
+    # 사용법: python audio_utils.py <오디오 파일>
+    if len(sys.argv) != 2:
+        print("사용법: python audio_utils.py <오디오 파일>")
+        sys.exit(1)
+    ffmpeg_path = find_ffmpeg()
+    if not ffmpeg_path:
+        print("ffmpeg를 찾을 수 없습니다.")
+        sys.exit(1)
+    result = benchmark_audio_paths(sys.argv[1], ffmpeg_path)
+    print(f"오디오 길이: {result['audio_hours'] * 60:.1f}분")
+    print(f"mp3 재인코딩 경로: {result['legacy_sec_per_hour']:.1f}초/오디오 1시간")
+    print(f"직접 PCM 경로:     {result['direct_sec_per_hour']:.1f}초/오디오 1시간")
+    print(f"절약: {result['saved_sec_per_hour']:.1f}초, 디스크 {result['saved_mb_per_hour']:.1f}MB (오디오 1시간 기준)")
@@ -0,0 +1,124 @@
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable, List
+
+from settings import GEN_BATCH_MAX, GEN_BATCH_WAIT_MS
+
+
+class _Slot:
+    """요청 항목 1개의 결과 자리 (스케줄러 스레드가 채우고 호출한 스레드가 기다림)"""
+
+    __slots__ = ("text", "params_key", "params", "enqueued_at", "event", "output", "error")
+
+    def __init__(self, text, params_key, params):
+        self.text = text
+        self.params_key = params_key
+        self.params = params
+        self.enqueued_at = time.time()
+        self.event = threading.Event()
+        self.output = None
+        self.error = None
+
+
+class BatchScheduler:
+    """여러 작업의 생성 요청을 모아 한 번의 generate로 처리하는 동적 배치 스케줄러
+
+    모델을 가진 스레드 하나가 대기 중인 항목 중 디코딩 설정이 같은 것을 최대 max_batch개까지,
+    첫 항목이 들어온 뒤 최대 max_wait_ms까지 모아 run_batch(texts, params)를 실행하고 결과를 돌려줌
+    """
+
+    def __init__(self, run_batch: Callable[[List[str], dict], List[str]],
+                 max_batch=GEN_BATCH_MAX, max_wait_ms=GEN_BATCH_WAIT_MS):
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._stats = {"batches": 0, "items": 0, "queue_delay_total": 0.0, "queue_delay_max": 0.0,
+                       "run_total": 0.0}
+        self._thread = threading.Thread(target=self._loop, name="generate-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts, params) -> List[str]:
+        """생성 요청 (다른 요청과 함께 배치로 실행될 때까지 대기 후 결과 반환)"""
+        params_key = json.dumps(params, sort_keys=True)
+        slots = [_Slot(text, params_key, params) for text in texts]
+        with self._cond:
+            self._pending.extend(slots)
+            self._cond.notify()
+        for slot in slots:
+            slot.event.wait()
+        for slot in slots:
+            if slot.error is not None:
+                raise slot.error
+        return [slot.output for slot in slots]
+
+    def _count_same(self, params_key):
+        return sum(1 for slot in self._pending if slot.params_key == params_key)
+
+    def _take_batch(self):
+        """첫 항목과 디코딩 설정이 같은 항목을 배치 크기 또는 대기 시간 한도까지 모음"""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            first = self._pending[0]
+            deadline = first.enqueued_at + self.max_wait
+            while self._count_same(first.params_key) < self.max_batch:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = []
+            rest = deque()
+            for slot in self._pending:
+                if slot.params_key == first.params_key and len(batch) < self.max_batch:
+                    batch.append(slot)
+                else:
+                    rest.append(slot)
+            self._pending = rest
+            return batch
+
+    def _loop(self):
+        while True:
+            batch = self._take_batch()
+            start = time.time()
+            try:
+                outputs = self.run_batch([slot.text for slot in batch], batch[0].params)
+                for slot, output in zip(batch, outputs):
+                    slot.output = output
+            except Exception as e:
+                for slot in batch:
+                    slot.error = e
+            finally:
+                finished = time.time()
+                with self._cond:
+                    delays = [start - slot.enqueued_at for slot in batch]
+                    self._stats["batches"] += 1
+                    self._stats["items"] += len(batch)
+                    self._stats["queue_delay_total"] += sum(delays)
+                    self._stats["queue_delay_max"] = max(self._stats["queue_delay_max"], max(delays))
+                    self._stats["run_total"] += finished - start
+                for slot in batch:
+                    slot.event.set()
+
+    def stats(self):
+        """배치 채움률(평균 배치 크기 / 최대 배치 크기), 평균/최대 대기 지연 등"""
+        with self._cond:
+            stats = dict(self._stats)
+            pending = len(self._pending)
+        batches = stats["batches"]
+        items = stats["items"]
+        return {
+            "batches": batches,
+            "items": items,
+            "pending": pending,
+            "max_batch": self.max_batch,
+            "avg_batch_size": items / batches if batches else 0.0,
+            "fill_rate": items / (batches * self.max_batch) if batches else 0.0,
+            "avg_queue_delay_ms": stats["queue_delay_total"] / items * 1000 if items else 0.0,
+            "max_queue_delay_ms": stats["queue_delay_max"] * 1000,
+            "avg_batch_sec": stats["run_total"] / batches if batches else 0.0,
+        }
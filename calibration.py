@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+
+from settings import CALIBRATION_PATH, CALIBRATION_MIN_ASR_RTF, CALIBRATION_SAMPLE_SEC, CALIBRATION_MAX_CANDIDATE_SEC
+
+# 이 머신에서 실제 처리량을 측정해 모델/청크 크기를 고르는 보정 프로파일
+# 실행: python calibration.py [--audio 샘플 오디오] (설치 시 1회, 또는 YTS_CALIBRATE_ON_START=1이면 첫 시작 시)
+
+# Whisper 후보 (품질 낮은 순)
+ASR_CANDIDATES = ("tiny", "base", "small", "medium", "large-v3")
+
+# LongT5 로드 방식
+LOAD_MODES = {
+    "full": {"device_map": "auto"},
+    "8bit": {"device_map": "auto", "load_in_8bit": True},
+    "4bit": {"device_map": "auto", "load_in_4bit": True},
+    "cpu": {"device_map": "cpu"},
+}
+
+# LongT5 청크 크기 후보 (청크 글자 수, 청크당 최대 생성 토큰)
+SUMMARY_CANDIDATES = ((1200, 200), (1800, 300), (2500, 400), (4000, 600), (8000, 800))
+
+# 측정용 문장 (청크 크기만큼 반복, 생성 토큰 수는 고정해서 측정)
+_SAMPLE_TEXT = (
+    "In this video we walk through how the new data pipeline ingests events, validates them against the schema, "
+    "and writes them to the warehouse in hourly partitions. We also compare the cost of the old batch jobs with "
+    "the streaming approach and discuss what changed in monitoring and on-call. "
+)
+
+
+def _total_memory_bytes():
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def machine_fingerprint():
+    """프로파일이 측정된 머신인지 확인하는 정보 (GPU 이름, 코어 수가 바뀌면 다시 보정)"""
+    gpu_name = "CPU"
+    vram_gb = 0.0
+    try:
+        import torch
+        if torch.cuda.is_available():
+            gpu_name = torch.cuda.get_device_name(0)
+            vram_gb = round(torch.cuda.get_device_properties(0).total_memory / 1024 ** 3, 1)
+    except ImportError:
+        pass
+    return {
+        "device": "cpu" if gpu_name == "CPU" else "cuda",
+        "gpu_name": gpu_name,
+        "vram_gb": vram_gb,
+        "cpu_count": os.cpu_count() or 1,
+        "ram_gb": round(_total_memory_bytes() / 1024 ** 3, 1),
+    }
+
+
+def _same_machine(a, b):
+    return all(a.get(k) == b.get(k) for k in ("device", "gpu_name", "cpu_count"))
+
+
+def load_profile(path=CALIBRATION_PATH, check_machine=True):
+    """저장된 보정 프로파일 (없거나 다른 머신에서 측정된 것이면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if check_machine and not _same_machine(profile.get("machine", {}), machine_fingerprint()):
+        return None
+    return profile
+
+
+def save_profile(profile, path=CALIBRATION_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def calibrated_asr_model(profile=None):
+    """보정으로 고른 Whisper 모델 (프로파일이 없으면 None)"""
+    profile = profile or load_profile()
+    return ((profile or {}).get("asr") or {}).get("selected")
+
+
+def calibrated_summary_config(profile=None):
+    """보정으로 고른 LongT5 설정 {"mode", "chunk_size", "max_new_tokens"} (프로파일이 없으면 None)"""
+    profile = profile or load_profile()
+    return ((profile or {}).get("summary") or {}).get("selected")
+
+
+# --- 음성 인식 ---
+def _sample_audio(audio_path=None, sample_sec=CALIBRATION_SAMPLE_SEC):
+    """측정용 오디오 (지정 파일 → 캐시된 PCM 중 하나 → 합성 잡음 순)"""
+    from audio_utils import SAMPLE_RATE, decode_audio, find_ffmpeg
+    from audio_cache import AudioCache
+
+    audio = None
+    if audio_path:
+        audio = decode_audio(audio_path, find_ffmpeg() or "ffmpeg")
+    else:
+        cache = AudioCache()
+        for video_id in list(cache._load_index()):
+            audio = cache.get_pcm(video_id)
+            if audio is not None:
+                break
+    length = int(sample_sec * SAMPLE_RATE)
+    if audio is None:
+        # 실제 음성이 없으면 저음량 잡음 (인식 속도는 음성보다 빠르게 측정될 수 있음)
+        return (np.random.default_rng(0).standard_normal(length) * 0.01).astype(np.float32), "synthetic"
+    start = max(0, (len(audio) - length) // 2)
+    return np.array(audio[start:start + length], dtype=np.float32), audio_path or "audio-cache"
+
+
+def calibrate_asr(device, audio, candidates=ASR_CANDIDATES, min_rtf=CALIBRATION_MIN_ASR_RTF,
+                  max_candidate_sec=CALIBRATION_MAX_CANDIDATE_SEC):
+    """Whisper 모델별 실시간 배율 측정 → 배율이 min_rtf 이상인 모델 중 가장 큰 모델 선택
+
+    VRAM 요구량을 넘는 모델은 건너뛰고, 측정이 너무 오래 걸리거나 메모리가 부족하면 더 큰 모델은 시도하지 않음
+    """
+    from asr_backends import load_asr_backend, select_asr_backend
+    from audio_utils import audio_duration
+    from gpu_utils import get_whisper_model_info
+
+    backend_name = select_asr_backend(device)
+    audio_sec = audio_duration(audio)
+    vram_gb = machine_fingerprint()["vram_gb"]
+    model_info = get_whisper_model_info()
+    results = []
+    for model_name in candidates:
+        if device == "cuda" and vram_gb < model_info.get(model_name, {}).get("vram_gb", 0):
+            results.append({"model": model_name, "ok": False, "error": "VRAM 부족"})
+            continue
+        try:
+            start = time.time()
+            backend = load_asr_backend(model_name, device=device, name=backend_name)
+            load_sec = time.time() - start
+            start = time.time()
+            backend.transcribe(audio)
+            wall_sec = time.time() - start
+            del backend
+        except Exception as e:  # 메모리 부족 등
+            results.append({"model": model_name, "ok": False, "error": str(e)})
+            break
+        results.append({"model": model_name, "ok": True, "load_sec": load_sec, "wall_sec": wall_sec,
+                        "rtf": audio_sec / wall_sec if wall_sec > 0 else 0.0})
+        if wall_sec > max_candidate_sec:
+            break
+
+    measured = [r for r in results if r["ok"]]
+    fast_enough = [r for r in measured if r["rtf"] >= min_rtf]
+    if fast_enough:
+        selected = fast_enough[-1]["model"]
+    elif measured:
+        selected = max(measured, key=lambda r: r["rtf"])["model"]
+    else:
+        selected = None
+    return {"backend": backend_name, "device": device, "audio_sec": audio_sec, "min_rtf": min_rtf,
+            "candidates": results, "selected": selected}
+
+
+# --- 요약 ---
+def _peak_memory_bytes(device):
+    if device == "cuda":
+        import torch
+        return torch.cuda.max_memory_allocated()
+    from model_store import _rss_bytes
+    return _rss_bytes()
+
+
+def calibrate_summary(device, candidates=SUMMARY_CANDIDATES, max_candidate_sec=CALIBRATION_MAX_CANDIDATE_SEC):
+    """LongT5 로드 방식/청크 크기별 처리량 측정 → 메모리에 들어가는 설정 중 입력 처리 속도(글자/초)가 가장 빠른 설정 선택
+
+    실제 요약과 같은 디코딩 설정(빔 4개)으로 청크당 최대 생성 토큰을 모두 생성하도록 고정해 최악의 경우를 측정
+    """
+    import torch
+    from model_store import load_seq2seq
+
+    modes = ["full", "8bit", "4bit"] if device == "cuda" else ["cpu"]
+    memory_limit = (machine_fingerprint()["vram_gb"] * 1024 ** 3 if device == "cuda" else _total_memory_bytes()) * 0.9
+    results = []
+    for mode in modes:
+        try:
+            tokenizer, model, pinned_name = load_seq2seq("google/long-t5-tglobal-base", **LOAD_MODES[mode])
+            model.eval()
+        except Exception as e:  # 양자화 라이브러리 없음 등
+            results.append({"mode": mode, "ok": False, "error": str(e)})
+            continue
+        for chunk_size, max_new_tokens in candidates:
+            text = (_SAMPLE_TEXT * (chunk_size // len(_SAMPLE_TEXT) + 1))[:chunk_size]
+            try:
+                if device == "cuda":
+                    torch.cuda.reset_peak_memory_stats()
+                inputs = tokenizer(["summarize: " + text], return_tensors="pt", truncation=True,
+                                   max_length=4096).to(model.device)
+                start = time.time()
+                with torch.no_grad():
+                    output = model.generate(**inputs, max_new_tokens=max_new_tokens, min_new_tokens=max_new_tokens,
+                                            num_beams=4, no_repeat_ngram_size=3, do_sample=False)
+                seconds = time.time() - start
+            except Exception as e:  # 메모리 부족이면 더 큰 청크는 시도하지 않음
+                results.append({"mode": mode, "chunk_size": chunk_size, "max_new_tokens": max_new_tokens,
+                                "ok": False, "error": str(e)})
+                break
+            peak = _peak_memory_bytes(device)
+            results.append({
+                "mode": mode,
+                "chunk_size": chunk_size,
+                "max_new_tokens": max_new_tokens,
+                "ok": True,
+                "seconds": seconds,
+                "tokens_per_sec": (output.shape[-1] - 1) / seconds if seconds > 0 else 0.0,
+                "chars_per_sec": chunk_size / seconds if seconds > 0 else 0.0,
+                "peak_bytes": peak,
+                "fits": peak <= memory_limit,
+            })
+            if seconds > max_candidate_sec:
+                break
+        del tokenizer, model
+        if device == "cuda":
+            torch.cuda.empty_cache()
+
+    usable = [r for r in results if r["ok"] and r["fits"]]
+    selected = None
+    if usable:
+        best = max(usable, key=lambda r: r["chars_per_sec"])
+        selected = {"mode": best["mode"], "chunk_size": best["chunk_size"], "max_new_tokens": best["max_new_tokens"],
+                    "chars_per_sec": best["chars_per_sec"]}
+    return {"model": "google/long-t5-tglobal-base", "device": device, "candidates": results, "selected": selected}
+
+
+def run_calibration(audio_path=None, asr=True, summary=True, path=CALIBRATION_PATH, log=print):
+    """보정 실행 후 프로파일 저장 (측정하지 않은 항목은 기존 프로파일 값 유지)"""
+    machine = machine_fingerprint()
+    device = machine["device"]
+    profile = load_profile(path) or {}
+    profile["machine"] = machine
+    if asr:
+        audio, audio_source = _sample_audio(audio_path)
+        log(f"음성 인식 보정 중... ({audio_source}, {device})")
+        profile["asr"] = dict(calibrate_asr(device, audio), audio_source=audio_source)
+    if summary:
+        log(f"요약 모델 보정 중... ({device})")
+        profile["summary"] = calibrate_summary(device)
+    profile["created_at"] = time.time()
+    save_profile(profile, path)
+    return profile
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이 머신의 음성 인식/요약 처리량 보정")
+    parser.add_argument("--audio", help="측정용 음성 파일 (없으면 캐시된 오디오 또는 합성 잡음)")
+    parser.add_argument("--skip-asr", action="store_true")
+    parser.add_argument("--skip-summary", action="store_true")
+    parser.add_argument("--show", action="store_true", help="저장된 프로파일만 출력")
+    args = parser.parse_args()
+
+    result = load_profile(check_machine=False) if args.show else \
+        run_calibration(args.audio, asr=not args.skip_asr, summary=not args.skip_summary)
+    if not result:
+        print("저장된 보정 프로파일이 없습니다.")
+    else:
+        for row in (result.get("asr") or {}).get("candidates", []):
+            detail = f"RTF {row['rtf']:.2f}x (로드 {row['load_sec']:.1f}초)" if row["ok"] else row["error"]
+            print(f"ASR  {row['model']:<10} {detail}")
+        for row in (result.get("summary") or {}).get("candidates", []):
+            if row["ok"]:
+                print(f"요약 {row['mode']:<5} chunk={row['chunk_size']:<5} {row['tokens_per_sec']:.1f} tok/s, "
+                      f"{row['chars_per_sec']:.0f}자/s, 최대 메모리 {row['peak_bytes'] / 1024 ** 3:.1f}GB"
+                      f"{'' if row['fits'] else ' (메모리 초과)'}")
+            else:
+                print(f"요약 {row['mode']:<5} {row.get('chunk_size', '')} {row['error']}")
+        print(f"선택: ASR={calibrated_asr_model(result)}, 요약={calibrated_summary_config(result)}")
@@ -0,0 +1,85 @@
+import re
+
+from settings import CAPTION_DEDUP_WINDOW
+
+_TOKEN = re.compile(r"\S+")
+_STRIP = re.compile(r"[^\w가-힣]+")
+
+
+def _normalize(word):
+    """비교용 단어 (대소문자/문장부호 무시)"""
+    return _STRIP.sub("", word.lower()) or word
+
+
+def _overlap(pattern, window):
+    """KMP로 window 끝(접미사)과 겹치는 pattern 접두사의 최대 길이
+
+    window 중간에만 나오는 반복은 겹침으로 보지 않음 (시간 복잡도 O(len(pattern) + len(window)))
+    """
+    m = len(pattern)
+    failure = [0] * m
+    k = 0
+    for i in range(1, m):
+        while k and pattern[i] != pattern[k]:
+            k = failure[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        failure[i] = k
+
+    k = 0
+    for word in window:
+        if k == m:
+            k = failure[k - 1]
+        while k and word != pattern[k]:
+            k = failure[k - 1]
+        if word == pattern[k]:
+            k += 1
+    return k
+
+
+def is_rolling_captions(source):
+    """반복 제거 대상 자막인지 (YouTube 자동 생성 자막만 - 수동 자막/Whisper 결과의 반복은 실제 발화)"""
+    return bool(source and source.get("generated"))
+
+
+def dedup_segments(segments, window_words=CAPTION_DEDUP_WINDOW, min_words=2):
+    """자동 생성 자막의 롤링 반복(직전 세그먼트 끝을 다음 세그먼트가 다시 보여주는 것) 제거
+
+    각 세그먼트의 앞부분이 직전 세그먼트 끝(최대 window_words 단어)과 겹치면 그 부분만 지우고,
+    세그먼트 전체가 직전 세그먼트 끝과 같을 때만 세그먼트를 버림 (세그먼트당 O(길이 + window))
+    min_words보다 짧은 겹침은 우연한 반복("the", "네" 등)일 수 있어 그대로 둠
+    반환: (중복 제거된 세그먼트 목록, 통계)
+    """
+    result = []
+    previous = []  # 직전 세그먼트의 끝 단어들 (정규화)
+    chars_before = 0
+    chars_after = 0
+    dropped = 0
+
+    for seg in segments:
+        words = _TOKEN.findall(seg.get("text") or "")
+        chars_before += len(" ".join(words))
+        if not words:
+            dropped += 1
+            continue
+
+        normalized = [_normalize(word) for word in words]
+        overlap = _overlap(normalized, previous) if previous else 0
+        previous = normalized[-window_words:]
+        if overlap < min_words:
+            overlap = 0
+        if overlap == len(words):
+            dropped += 1
+            continue
+
+        kept_text = " ".join(words[overlap:])
+        chars_after += len(kept_text)
+        result.append(dict(seg, text=kept_text))
+
+    return result, {
+        "chars_before": chars_before,
+        "chars_after": chars_after,
+        "removed_fraction": 1 - chars_after / chars_before if chars_before else 0.0,
+        "segments_before": len(segments),
+        "segments_dropped": dropped,
+    }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from settings import CHUNK_MEMO_PATH, CHUNK_MEMO_MAX_ROWS
+
+# 문자별 의사난수 값 (gear rolling hash)
+_GEAR = [int.from_bytes(hashlib.md5(bytes([i])).digest()[:4], "little") for i in range(256)]
+_SENTENCE_END = re.compile(r"[.!?。]\s")
+_WHITESPACE = re.compile(r"\s")
+
+
+def content_defined_chunks(text, target_size=1200, min_ratio=0.5, max_ratio=2.0):
+    """내용 기반 청크 분할 (rolling hash가 조건을 만족하는 위치의 공백/문장 끝에서 자름)
+
+    고정 길이 분할과 달리 경계가 주변 내용으로만 정해지므로, 일부 단어만 바뀌면
+    그 근처 청크만 달라지고 나머지 청크는 그대로 유지됨
+    """
+    if not text:
+        return []
+    min_size = max(1, int(target_size * min_ratio))
+    max_size = max(min_size + 1, int(target_size * max_ratio))
+    # 최소 길이 이후 평균 (target - min) 글자마다 경계가 나오도록 마스크 설정
+    bits = max(1, (target_size - min_size).bit_length() - 1)
+    mask = (1 << bits) - 1
+
+    chunks = []
+    start = 0
+    h = 0
+    n = len(text)
+    i = 0
+    while i < n:
+        h = ((h << 1) + _GEAR[ord(text[i]) & 0xFF]) & 0xFFFFFFFF
+        size = i - start + 1
+        if (size >= min_size and (h & mask) == 0) or size >= max_size:
+            # 단어 중간에서 자르지 않도록 다음 공백(가능하면 문장 끝)까지 이동
+            window_end = min(n, i + 200)
+            m = _SENTENCE_END.search(text, i, window_end) or _WHITESPACE.search(text, i, window_end)
+            cut = m.end() if m else i + 1
+            chunks.append(text[start:cut])
+            start = cut
+            h = 0
+            i = cut
+            continue
+        i += 1
+    if start < n:
+        tail = text[start:]
+        # 너무 짧은 마지막 조각은 앞 청크에 붙임
+        if chunks and len(tail) < min_size // 2:
+            chunks[-1] += tail
+        else:
+            chunks.append(tail)
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+class ChunkMemo:
+    """청크 요약 결과 메모 (청크 내용, 프롬프트, 모델, 디코딩 설정의 해시로 조회)
+
+    청크를 요약할 때마다 바로 기록하므로 중간에 실패한 긴 작업도 다시 실행하면 이어서 진행됨
+    max_rows를 넘으면 마지막 사용 시각이 가장 오래된 메모부터 삭제 (기록 PRUNE_EVERY건마다 확인)
+    """
+
+    _lock = threading.Lock()
+    PRUNE_EVERY = 100
+
+    def __init__(self, path=CHUNK_MEMO_PATH, max_rows=CHUNK_MEMO_MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 프로세스 전체 누적 (작업별 재사용 수는 Summarizer.summarize_text의 memo_stats로 따로 집계)
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, summary TEXT NOT NULL, created REAL, "
+                "last_used REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS memo_last_used ON memo (last_used)")
+            self._prune(conn)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _prune(self, conn):
+        """max_rows를 넘는 메모를 마지막 사용 시각이 오래된 순서로 삭제"""
+        conn.execute(
+            "DELETE FROM memo WHERE key IN (SELECT key FROM memo ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+
+    @staticmethod
+    def make_key(chunk, prompt, model_name, params):
+        raw = json.dumps([chunk, prompt, model_name, params], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT summary FROM memo WHERE key = ?", (key,)).fetchone()
+            if row:
+                conn.execute("UPDATE memo SET last_used = ? WHERE key = ?", (time.time(), key))
+        if row:
+            self.hits += 1
+            return row[0]
+        self.misses += 1
+        return None
+
+    def put(self, key, summary):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO memo (key, summary, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, summary, now, now)
+            )
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY == 0:
+                self._prune(conn)
+
+    def get_or_compute(self, chunk, prompt, model_name, params, compute):
+        """메모에 있으면 반환, 없으면 compute()로 생성 후 기록"""
+        key = self.make_key(chunk, prompt, model_name, params)
+        summary = self.get(key)
+        if summary is None:
+            summary = compute()
+            self.put(key, summary)
+        return summary
@@ -0,0 +1,216 @@
+import time
+
+from asr_backends import select_asr_backend, backend_tag
+from asr_progress import ASRThroughputHistory, history_device
+from calibration import ASR_CANDIDATES, load_profile, machine_fingerprint
+from parallel_asr import default_workers
+from settings import SUMMARY_FAN_IN, ASR_PARALLEL_MIN_SEC
+from streaming_asr import use_streaming_asr
+
+# 시간 예산 안에 끝나도록 자막 출처/Whisper 모델/요약 방식/디코딩 설정을 고르는 계획기
+# 단계별 비용은 보정 프로파일(calibration.py)과 Whisper 처리량 이력으로 추정
+
+# 시간 예산 최대값 (초, API/CLI 입력 검증)
+MAX_BUDGET_SEC = 3600
+
+# 자막 API 조회/다운로드 (초)
+CAPTION_FETCH_SEC = 3.0
+# 오디오 다운로드: 고정 비용 + 오디오 길이 / 배율
+AUDIO_DOWNLOAD_OVERHEAD_SEC = 5.0
+AUDIO_DOWNLOAD_RTF = 200.0
+# Whisper 모델 로드 (보정 프로파일이 없을 때)
+ASR_LOAD_SEC = 5.0
+# 자막 길이 추정 (오디오 1초당 글자 수)
+CHARS_PER_AUDIO_SEC = 12.0
+# 생성 요약 처리 속도 (보정 프로파일이 없을 때, 빔 4개 기준 입력 글자/초)
+DEFAULT_SUMMARY_CHARS_PER_SEC = {"cpu": 40.0, "cuda": 400.0}
+# 추출 요약 처리 속도 (입력 글자/초)
+EXTRACTIVE_CHARS_PER_SEC = 2_000_000.0
+
+# 요약 방식 (품질 높은 순)
+SUMMARY_TIERS = (
+    {"summarizer": "abstractive", "num_beams": 4},
+    {"summarizer": "abstractive", "num_beams": 2},
+    {"summarizer": "abstractive", "num_beams": 1},
+    {"summarizer": "extractive", "num_beams": None},
+)
+
+
+def _beam_cost(num_beams):
+    """빔 수에 따른 생성 비용 비율 (빔 4개 = 1.0, 인코딩 비용은 빔 수와 무관)"""
+    return 0.3 + 0.7 * num_beams / 4
+
+
+class CostModel:
+    """이 머신의 단계별 비용 추정"""
+
+    def __init__(self, profile=None, device=None, history=None):
+        self.profile = profile if profile is not None else (load_profile() or {})
+        self.device = device or machine_fingerprint()["device"]
+        self.history = history or ASRThroughputHistory()
+
+    def max_asr_model(self):
+        """품질 상한 Whisper 모델 (보정 결과, 없으면 디바이스 기본값)"""
+        selected = (self.profile.get("asr") or {}).get("selected")
+        if selected:
+            return selected
+        if self.device == "cpu":
+            return "base"
+        from gpu_utils import GPUDetector
+        return GPUDetector().select_optimal_whisper_model(machine_fingerprint()["vram_gb"])
+
+    def _asr_measured(self, model_name):
+        for row in (self.profile.get("asr") or {}).get("candidates", []):
+            if row.get("model") == model_name and row.get("ok"):
+                return row
+        return None
+
+    def history_key(self, duration_sec):
+        """이 길이의 오디오를 인식할 때 youtube_utils가 사용할 처리량 이력 키 (엔진/병렬 워커 수/스트리밍 여부)
+
+        계획 시점에는 PCM 캐시 여부를 모르므로 처음 처리하는 영상(캐시 없음) 기준
+        """
+        streaming = use_streaming_asr(duration_sec, self.device)
+        workers = default_workers() if self.device == "cpu" and duration_sec >= ASR_PARALLEL_MIN_SEC and not streaming else 1
+        tag = backend_tag(select_asr_backend(self.device), self.device)
+        return history_device(self.device, tag, workers, streaming)
+
+    def asr_sec(self, model_name, duration_sec, include_download=True):
+        measured = self._asr_measured(model_name)
+        rtf = measured["rtf"] if measured else self.history.estimate_rtf(model_name, self.history_key(duration_sec))
+        load_sec = measured["load_sec"] if measured else ASR_LOAD_SEC
+        download_sec = AUDIO_DOWNLOAD_OVERHEAD_SEC + duration_sec / AUDIO_DOWNLOAD_RTF if include_download else 0.0
+        return download_sec + load_sec + duration_sec / max(rtf, 1e-3)
+
+    def summary_sec(self, tier, text_chars):
+        if tier["summarizer"] == "extractive":
+            return 0.2 + text_chars / EXTRACTIVE_CHARS_PER_SEC
+        selected = (self.profile.get("summary") or {}).get("selected") or {}
+        chars_per_sec = selected.get("chars_per_sec") or DEFAULT_SUMMARY_CHARS_PER_SEC.get(self.device, 40.0)
+        # 트리 축소의 상위 단계 비용 (단계마다 약 1/fan_in로 줄어듦)
+        reduce_factor = 1 + 1 / max(SUMMARY_FAN_IN - 1, 1)
+        return text_chars / chars_per_sec * reduce_factor * _beam_cost(tier["num_beams"])
+
+
+def _tier_label(tier):
+    if tier["summarizer"] == "extractive":
+        return "추출 요약"
+    return f"AI 요약 (빔 {tier['num_beams']})"
+
+
+def plan(budget_sec, duration_sec=None, captions_available=True, text_chars=None, mode="abstractive",
+         cost_model=None):
+    """예산 안에서 가장 품질이 높은 (자막 출처, Whisper 모델, 요약 방식) 조합 선택
+
+    text_chars가 없으면 오디오 길이로 자막 길이를 추정하고, 자막이 이미 있으면(text_chars) 자막 단계 비용은 0
+    예산을 만족하는 조합이 없으면 가장 빠른 조합 (meets_budget=False)
+    """
+    cost_model = cost_model or CostModel()
+    duration_sec = duration_sec or 0.0
+    chars = text_chars if text_chars is not None else duration_sec * CHARS_PER_AUDIO_SEC
+
+    # 자막 단계 후보: (출처, Whisper 모델, 예상 초, 품질 점수)
+    if text_chars is not None:
+        transcripts = [("ready", None, 0.0, len(ASR_CANDIDATES))]
+    elif captions_available:
+        transcripts = [("captions", None, CAPTION_FETCH_SEC, len(ASR_CANDIDATES))]
+    else:
+        max_model = cost_model.max_asr_model()
+        models = ASR_CANDIDATES[:ASR_CANDIDATES.index(max_model) + 1] if max_model in ASR_CANDIDATES else (max_model,)
+        transcripts = [("whisper", name, cost_model.asr_sec(name, duration_sec), i) for i, name in enumerate(models)]
+
+    tiers = [tier for tier in SUMMARY_TIERS if mode != "extractive" or tier["summarizer"] == "extractive"]
+    options = []
+    for source, asr_model, transcript_sec, asr_quality in transcripts:
+        for rank, tier in enumerate(tiers):
+            summary_sec = cost_model.summary_sec(tier, chars)
+            options.append({
+                "transcript": source,
+                "asr_model": asr_model,
+                "summarizer": tier["summarizer"],
+                "num_beams": tier["num_beams"],
+                "label": _tier_label(tier),
+                "transcript_sec": transcript_sec,
+                "summary_sec": summary_sec,
+                "total_sec": transcript_sec + summary_sec,
+                "quality": asr_quality + (len(tiers) - rank),
+            })
+
+    feasible = [option for option in options if option["total_sec"] <= budget_sec]
+    if feasible:
+        best = max(feasible, key=lambda option: (option["quality"], -option["total_sec"]))
+    else:
+        best = min(options, key=lambda option: option["total_sec"])
+    return dict(best, budget_sec=budget_sec, meets_budget=bool(feasible), text_chars=round(chars))
+
+
+class DeadlinePlanner:
+    """작업 1건의 시간 예산 관리 (단계가 끝날 때마다 남은 예산으로 이후 단계를 다시 계획)
+
+    spent_sec/asr_plan: 다른 워커에서 이미 쓴 시간과 음성 인식 계획 (분산 워커의 요약 단계에서 이어서 계획)
+    """
+
+    def __init__(self, budget_sec, mode="abstractive", cost_model=None, spent_sec=0.0, asr_plan=None):
+        self.budget_sec = budget_sec
+        self.mode = mode
+        self.cost_model = cost_model or CostModel()
+        self.started_at = time.time() - spent_sec
+        self.asr_plan = asr_plan
+        self.summary_plan = None
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started_at
+
+    @property
+    def remaining(self):
+        return self.budget_sec - self.elapsed
+
+    def choose_asr_model(self, duration_sec):
+        """자막이 없을 때 오디오 길이를 보고 Whisper 모델 선택 (요약 단계 비용까지 포함해 예산 배분)"""
+        self.asr_plan = plan(self.remaining, duration_sec, captions_available=False, mode=self.mode,
+                             cost_model=self.cost_model)
+        return self.asr_plan["asr_model"]
+
+    def choose_summary(self, text_chars):
+        """실제 자막 길이로 요약 방식/디코딩 설정 선택"""
+        self.summary_plan = plan(self.remaining, text_chars=text_chars, mode=self.mode, cost_model=self.cost_model)
+        return self.summary_plan
+
+    def decoding(self):
+        """요약기에 전달할 디코딩 설정"""
+        if self.summary_plan and self.summary_plan["num_beams"]:
+            return {"num_beams": self.summary_plan["num_beams"]}
+        return None
+
+    def result(self, transcript_source=None):
+        """결과에 기록할 계획과 추정/실제 시간"""
+        summary_plan = self.summary_plan or {}
+        asr_plan = self.asr_plan or {}
+        transcript_sec = asr_plan.get("transcript_sec", 0.0)
+        return {
+            "budget_sec": self.budget_sec,
+            "transcript": transcript_source or ("whisper" if self.asr_plan else "captions"),
+            "asr_model": asr_plan.get("asr_model"),
+            "summarizer": summary_plan.get("summarizer"),
+            "num_beams": summary_plan.get("num_beams"),
+            "label": summary_plan.get("label"),
+            "estimate_transcript_sec": round(transcript_sec, 1),
+            "estimate_summary_sec": round(summary_plan.get("summary_sec", 0.0), 1),
+            "actual_sec": round(self.elapsed, 1),
+            "meets_budget": self.elapsed <= self.budget_sec,
+        }
+
+
+def describe_plan(plan_result):
+    """계획 설명 문자열 (예: "Whisper small + AI 요약 (빔 2) · 예상 52초 / 실제 48초 / 예산 60초")"""
+    if not plan_result:
+        return ""
+    if plan_result.get("asr_model"):
+        transcript = f"Whisper {plan_result['asr_model']}"
+    else:
+        transcript = "자막 API"
+    estimate = plan_result["estimate_transcript_sec"] + plan_result["estimate_summary_sec"]
+    status = "" if plan_result["meets_budget"] else " ⚠️ 예산 초과"
+    return (f"{transcript} + {plan_result['label']} · 예상 {estimate:.0f}초 / 실제 {plan_result['actual_sec']:.0f}초 "
+            f"/ 예산 {plan_result['budget_sec']:.0f}초{status}")
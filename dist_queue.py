@@ -0,0 +1,392 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from settings import DIST_QUEUE_PATH, DIST_REDIS_URL, DIST_MAX_ATTEMPTS
+
+# 작업 상태
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# 작업 단계 (단계별로 처리할 수 있는 노드가 다름: 자막/음성 인식은 CPU가 많은 노드, 요약은 GPU 노드 등)
+STAGE_TRANSCRIPT = "transcript"
+STAGE_SUMMARY = "summary"
+STAGES = (STAGE_TRANSCRIPT, STAGE_SUMMARY)
+
+
+class LeaseLostError(Exception):
+    """임대 기간이 만료되어 다른 워커가 작업을 가져감"""
+
+
+class DistJob:
+    """공유 큐의 작업 1건 (한 작업이 단계를 차례로 거치며 단계마다 새로 임대됨)"""
+
+    FIELDS = ("id", "key", "stage", "payload", "status", "attempts", "max_attempts", "worker",
+              "lease_expires", "progress", "message", "result", "error", "created_at", "updated_at")
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+        self.payload = self.payload or {}
+        self.attempts = int(self.attempts or 0)
+        self.progress = int(self.progress or 0)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class SQLiteLeaseQueue:
+    """단일 호스트용 임대 기반 작업 큐 (같은 파일을 여는 여러 워커 프로세스가 공유)"""
+
+    def __init__(self, path=DIST_QUEUE_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY, key TEXT, stage TEXT, payload TEXT, status TEXT,
+                    attempts INTEGER, max_attempts INTEGER, worker TEXT, lease_expires REAL,
+                    progress INTEGER, message TEXT, result TEXT, error TEXT,
+                    created_at REAL, updated_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, stage, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _row_to_job(row):
+        if row is None:
+            return None
+        fields = dict(zip(DistJob.FIELDS, row))
+        fields["payload"] = json.loads(fields["payload"] or "{}")
+        fields["result"] = json.loads(fields["result"]) if fields["result"] else None
+        return DistJob(**fields)
+
+    def enqueue(self, stage, payload, key=None, max_attempts=DIST_MAX_ATTEMPTS):
+        """작업 등록 (같은 key의 작업이 대기/진행 중이면 그 작업 ID 반환)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if key is not None:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE key = ? AND status IN (?, ?)", (key, QUEUED, LEASED)
+                ).fetchone()
+                if row:
+                    conn.execute("COMMIT")
+                    return row[0]
+            job_id = uuid.uuid4().hex[:12]
+            conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, 0, ?, NULL, NULL, 0, '대기 중', NULL, NULL, ?, ?)",
+                (job_id, key, stage, json.dumps(payload, ensure_ascii=False), QUEUED, max_attempts, now, now)
+            )
+            conn.execute("COMMIT")
+            return job_id
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def lease(self, worker, stages, lease_sec):
+        """처리할 수 있는 단계의 가장 오래된 작업을 임대 (만료된 임대는 먼저 회수)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._reclaim(conn, now)
+            marks = ",".join("?" * len(stages))
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE status = ? AND stage IN ({marks}) ORDER BY created_at LIMIT 1",
+                (QUEUED, *stages)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (LEASED, worker, now + lease_sec, now, row[0])
+            )
+            job = self._row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row[0],)).fetchone())
+            conn.execute("COMMIT")
+            return job
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _reclaim(conn, now):
+        """임대가 만료된 작업(워커 종료/중단) 재시도, 최대 시도 횟수를 넘으면 실패 처리"""
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = '최대 재시도 횟수 초과 (워커 응답 없음)', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+            (FAILED, now, LEASED, now)
+        )
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, message = '워커 응답 없음 - 재시도 대기', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (QUEUED, now, LEASED, now)
+        )
+
+    def _update_leased(self, job_id, worker, sql, params):
+        """임대 중인 워커만 갱신 가능 (임대를 잃었으면 LeaseLostError)"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {sql}, updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (*params, time.time(), job_id, worker, LEASED)
+            )
+            if cursor.rowcount == 0:
+                raise LeaseLostError(job_id)
+
+    def heartbeat(self, job_id, worker, lease_sec, progress=None, message=None):
+        """임대 연장 + 진행 상황 기록"""
+        self._update_leased(
+            job_id, worker, "lease_expires = ?, progress = COALESCE(?, progress), message = COALESCE(?, message)",
+            (time.time() + lease_sec, progress, message)
+        )
+
+    def advance(self, job_id, worker, next_stage, payload):
+        """현재 단계 완료 후 다음 단계로 다시 대기열에 넣음 (다음 단계는 다른 노드가 가져갈 수 있음)"""
+        self._update_leased(
+            job_id, worker, "stage = ?, payload = ?, status = ?, worker = NULL, attempts = 0",
+            (next_stage, json.dumps(payload, ensure_ascii=False), QUEUED)
+        )
+
+    def complete(self, job_id, worker, result):
+        self._update_leased(
+            job_id, worker, "status = ?, result = ?, progress = 100",
+            (DONE, json.dumps(result, ensure_ascii=False))
+        )
+
+    def fail(self, job_id, worker, error):
+        """작업 실패 (시도 횟수가 남아 있으면 다시 대기열로)"""
+        job = self.get(job_id)
+        retry = job is not None and job.attempts < job.max_attempts
+        self._update_leased(
+            job_id, worker, "status = ?, worker = NULL, error = ?",
+            (QUEUED if retry else FAILED, error)
+        )
+        return retry
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            return self._row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def stats(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status").fetchall()
+        stats = {}
+        for stage, status, count in rows:
+            stats.setdefault(stage, {})[status] = count
+        return stats
+
+
+# Redis 임대 스크립트 (대기열에서 꺼내기 + 임대 기록을 원자적으로 처리)
+_LEASE_SCRIPT = """
+for i, queue in ipairs(KEYS) do
+    local job_id = redis.call('LPOP', queue)
+    if job_id then
+        local job_key = ARGV[3] .. job_id
+        redis.call('HSET', job_key, 'status', 'leased', 'worker', ARGV[1], 'lease_expires', ARGV[2], 'updated_at', ARGV[4])
+        redis.call('HINCRBY', job_key, 'attempts', 1)
+        redis.call('ZADD', ARGV[5], ARGV[2], job_id)
+        return job_id
+    end
+end
+return nil
+"""
+
+# 임대 중인 워커만 필드 갱신 (ARGV: worker, 필드/값 쌍...)
+_UPDATE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'worker') ~= ARGV[1] or redis.call('HGET', KEYS[1], 'status') ~= 'leased' then
+    return 0
+end
+for i = 2, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+# 만료된 임대 회수 (KEYS: 임대 zset, ARGV: 현재 시각, 작업 키 접두사, 대기열 키 접두사)
+_RECLAIM_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for i, job_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], job_id)
+    local job_key = ARGV[2] .. job_id
+    if redis.call('HGET', job_key, 'status') == 'leased'
+        and tonumber(redis.call('HGET', job_key, 'lease_expires')) < tonumber(ARGV[1]) then
+        if tonumber(redis.call('HGET', job_key, 'attempts')) >= tonumber(redis.call('HGET', job_key, 'max_attempts')) then
+            redis.call('HSET', job_key, 'status', 'failed', 'error', '최대 재시도 횟수 초과 (워커 응답 없음)')
+        else
+            redis.call('HSET', job_key, 'status', 'queued', 'worker', '', 'message', '워커 응답 없음 - 재시도 대기')
+            redis.call('RPUSH', ARGV[3] .. redis.call('HGET', job_key, 'stage'), job_id)
+        end
+    end
+end
+return #expired
+"""
+
+
+class RedisLeaseQueue:
+    """여러 노드가 공유하는 Redis 호환 임대 기반 작업 큐 (SQLiteLeaseQueue와 같은 인터페이스)
+
+    - yts:job:<id>     : 작업 해시
+    - yts:queue:<단계> : 단계별 대기열 (리스트)
+    - yts:leases       : 임대 만료 시각 (정렬 집합, 만료된 작업 회수용)
+    - yts:key:<key>    : 중복 요청 합치기용 key → 작업 ID
+    """
+
+    def __init__(self, url=DIST_REDIS_URL, prefix="yts:"):
+        import redis
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._lease = self.redis.register_script(_LEASE_SCRIPT)
+        self._update = self.redis.register_script(_UPDATE_SCRIPT)
+        self._reclaim = self.redis.register_script(_RECLAIM_SCRIPT)
+
+    def _job_key(self, job_id):
+        return f"{self.prefix}job:{job_id}"
+
+    def _queue_key(self, stage):
+        return f"{self.prefix}queue:{stage}"
+
+    def enqueue(self, stage, payload, key=None, max_attempts=DIST_MAX_ATTEMPTS):
+        job_id = uuid.uuid4().hex[:12]
+        if key is not None:
+            dedup_key = f"{self.prefix}key:{key}"
+            if not self.redis.set(dedup_key, job_id, nx=True):
+                existing = self.redis.get(dedup_key)
+                job = self.get(existing) if existing else None
+                if job is not None and job.status in (QUEUED, LEASED):
+                    return existing
+                self.redis.set(dedup_key, job_id)
+        now = time.time()
+        pipe = self.redis.pipeline()
+        pipe.hset(self._job_key(job_id), mapping={
+            "id": job_id, "key": key or "", "stage": stage, "payload": json.dumps(payload, ensure_ascii=False),
+            "status": QUEUED, "attempts": 0, "max_attempts": max_attempts, "worker": "", "lease_expires": 0,
+            "progress": 0, "message": "대기 중", "result": "", "error": "", "created_at": now, "updated_at": now,
+        })
+        pipe.rpush(self._queue_key(stage), job_id)
+        pipe.execute()
+        return job_id
+
+    def lease(self, worker, stages, lease_sec):
+        now = time.time()
+        self._reclaim(keys=[f"{self.prefix}leases"],
+                      args=[now, f"{self.prefix}job:", f"{self.prefix}queue:"])
+        job_id = self._lease(
+            keys=[self._queue_key(stage) for stage in stages],
+            args=[worker, now + lease_sec, f"{self.prefix}job:", now, f"{self.prefix}leases"]
+        )
+        return self.get(job_id) if job_id else None
+
+    def _update_leased(self, job_id, worker, fields):
+        fields = dict(fields, updated_at=time.time())
+        args = [worker]
+        for name, value in fields.items():
+            args.extend([name, value])
+        if not self._update(keys=[self._job_key(job_id)], args=args):
+            raise LeaseLostError(job_id)
+
+    def heartbeat(self, job_id, worker, lease_sec, progress=None, message=None):
+        expires = time.time() + lease_sec
+        fields = {"lease_expires": expires}
+        if progress is not None:
+            fields["progress"] = progress
+        if message is not None:
+            fields["message"] = message
+        self._update_leased(job_id, worker, fields)
+        self.redis.zadd(f"{self.prefix}leases", {job_id: expires})
+
+    def advance(self, job_id, worker, next_stage, payload):
+        self._update_leased(job_id, worker, {
+            "stage": next_stage, "payload": json.dumps(payload, ensure_ascii=False),
+            "status": QUEUED, "worker": "", "attempts": 0,
+        })
+        self.redis.zrem(f"{self.prefix}leases", job_id)
+        self.redis.rpush(self._queue_key(next_stage), job_id)
+
+    def complete(self, job_id, worker, result):
+        self._update_leased(job_id, worker, {
+            "status": DONE, "result": json.dumps(result, ensure_ascii=False), "progress": 100,
+        })
+        self.redis.zrem(f"{self.prefix}leases", job_id)
+
+    def fail(self, job_id, worker, error):
+        job = self.get(job_id)
+        retry = job is not None and job.attempts < job.max_attempts
+        self._update_leased(job_id, worker, {
+            "status": QUEUED if retry else FAILED, "worker": "", "error": error,
+        })
+        self.redis.zrem(f"{self.prefix}leases", job_id)
+        if retry:
+            self.redis.rpush(self._queue_key(job.stage), job_id)
+        return retry
+
+    def get(self, job_id):
+        fields = self.redis.hgetall(self._job_key(job_id))
+        if not fields:
+            return None
+        fields["payload"] = json.loads(fields.get("payload") or "{}")
+        fields["result"] = json.loads(fields["result"]) if fields.get("result") else None
+        fields["lease_expires"] = float(fields.get("lease_expires") or 0)
+        fields["max_attempts"] = int(fields.get("max_attempts") or DIST_MAX_ATTEMPTS)
+        for name in ("key", "worker", "error"):
+            fields[name] = fields.get(name) or None
+        return DistJob(**fields)
+
+    def stats(self):
+        return {stage: {QUEUED: self.redis.llen(self._queue_key(stage))} for stage in STAGES}
+
+
+def get_lease_queue(backend):
+    """설정된 백엔드의 공유 작업 큐 (sqlite | redis)"""
+    if backend == "redis":
+        return RedisLeaseQueue()
+    return SQLiteLeaseQueue()
+
+
+class Heartbeat:
+    """작업 실행 중 주기적으로 임대를 연장하는 스레드 (임대를 잃으면 lost 표시)"""
+
+    def __init__(self, queue, job_id, worker, lease_sec, interval):
+        self.queue = queue
+        self.job_id = job_id
+        self.worker = worker
+        self.lease_sec = lease_sec
+        self.interval = interval
+        self.progress = None
+        self.message = None
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.queue.heartbeat(self.job_id, self.worker, self.lease_sec, self.progress, self.message)
+            except LeaseLostError:
+                self.lost = True
+                return
+            except Exception:
+                continue  # 일시적인 저장소 오류는 다음 주기에 재시도
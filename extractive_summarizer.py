@@ -0,0 +1,104 @@
+import re
+
+import numpy as np
+
+from text_utils import preprocess_text, postprocess_summary
+
+# 모델 없는 추출 요약 (numpy만 사용, torch/transformers를 불러오지 않음)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+_WORD = re.compile(r"[가-힣]+|[a-z]+|\d+")
+
+
+def split_sentences(text, max_words=40):
+    """문장 분할 (문장부호가 없는 자동 생성 자막은 max_words 단어씩 끊음)"""
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        for i in range(0, len(words), max_words):
+            piece = " ".join(words[i:i + max_words])
+            if piece:
+                sentences.append(piece)
+    return sentences
+
+
+def _tfidf(sentences):
+    """문장별 TF-IDF (희소 행렬을 (행, 열, 값) 배열로 표현, 행 단위 L2 정규화)"""
+    vocab = {}
+    rows = []
+    cols = []
+    for i, sentence in enumerate(sentences):
+        for word in _WORD.findall(sentence.lower()):
+            rows.append(i)
+            cols.append(vocab.setdefault(word, len(vocab)))
+    if not cols:
+        return None
+
+    vocab_size = len(vocab)
+    pairs, tf = np.unique(np.asarray(rows, dtype=np.int64) * vocab_size + np.asarray(cols, dtype=np.int64),
+                          return_counts=True)
+    rows = pairs // vocab_size
+    cols = pairs % vocab_size
+    df = np.bincount(cols, minlength=vocab_size)
+    idf = np.log((1 + len(sentences)) / (1 + df)) + 1
+    weights = (1 + np.log(tf)) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(sentences)))
+    weights = weights / np.maximum(norms[rows], 1e-12)
+    return rows, cols, weights, vocab_size
+
+
+class ExtractiveSummarizer:
+    """TF-IDF 중심성(centroid) 점수 + MMR 다양성 선택으로 문장을 뽑는 빠른 요약
+
+    Summarizer와 같은 summarize_text 인터페이스와 결과 구조(_postprocess_summary)를 사용하며,
+    모델 로드 없이 100만 자 자막도 1초 이내에 처리
+    """
+
+    def __init__(self, max_sentences=8, diversity=0.3, min_sentence_chars=20):
+        self.max_sentences = max_sentences
+        self.diversity = diversity
+        self.min_sentence_chars = min_sentence_chars
+
+    def rank_sentences(self, sentences, max_sentences=None):
+        """선택된 문장 인덱스 (원문 순서)"""
+        max_sentences = max_sentences or self.max_sentences
+        matrix = _tfidf(sentences)
+        if matrix is None:
+            return list(range(min(len(sentences), max_sentences)))
+        rows, cols, weights, vocab_size = matrix
+        n = len(sentences)
+
+        # 전체 평균 벡터(중심)와의 유사도가 높을수록 대표 문장
+        centroid = np.bincount(cols, weights=weights, minlength=vocab_size) / n
+        centroid /= max(np.linalg.norm(centroid), 1e-12)
+        scores = np.bincount(rows, weights=weights * centroid[cols], minlength=n)
+        lengths = np.fromiter((len(sentence) for sentence in sentences), dtype=np.int64, count=n)
+        scores[lengths < self.min_sentence_chars] = -1.0
+
+        # MMR: 이미 고른 문장과 비슷한 문장은 감점
+        selected = []
+        max_sim = np.zeros(n)
+        for _ in range(min(max_sentences, n)):
+            mmr = (1 - self.diversity) * scores - self.diversity * max_sim
+            if selected:
+                mmr[selected] = -np.inf
+            best = int(np.argmax(mmr))
+            if scores[best] < 0:
+                break
+            selected.append(best)
+            vector = np.zeros(vocab_size)
+            mask = rows == best
+            vector[cols[mask]] = weights[mask]
+            max_sim = np.maximum(max_sim, np.bincount(rows, weights=weights * vector[cols], minlength=n))
+        return sorted(selected)
+
+    def summarize_text(self, text, language='en', max_length=None, min_length=None, stats=None, progress=None,
+                       memo_stats=None):
+        """추출 요약 (stats/progress/memo_stats는 Summarizer와 인터페이스를 맞추기 위한 인자, 트리 단계/메모가 없으므로 비워 둠)"""
+        if not text.strip():
+            return "요약할 텍스트가 없습니다."
+
+        sentences = split_sentences(preprocess_text(text))
+        selected = self.rank_sentences(sentences)
+        summary = ". ".join(sentences[i].rstrip(".!?") for i in selected) + "."
+        return postprocess_summary(summary, language)
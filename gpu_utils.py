@@ -3,6 +3,7 @@ import torch
 import subprocess
 import re
 from typing import Tuple, Optional
+from calibration import calibrated_asr_model
 
 class GPUDetector:
     def __init__(self):
@@ -110,7 +111,7 @@ class GPUDetector:
             return "tiny"      # 1GB 필요
     
     def get_device_info(self) -> dict:
-        """디바이스 정보 반환"""
+        """디바이스 정보 반환 (보정 프로파일이 있으면 측정된 처리량으로 고른 Whisper 모델 사용)"""
         gpu_available, gpu_name, vram_gb = self.detect_gpu()
         
         if gpu_available:
@@ -120,12 +121,17 @@ class GPUDetector:
             optimal_model = "base"  # CPU에서는 base 모델 사용
             device = "cpu"
         
+        calibrated_model = calibrated_asr_model()
+        if calibrated_model:
+            optimal_model = calibrated_model
+        
         return {
             "gpu_available": gpu_available,
             "gpu_name": gpu_name,
             "vram_gb": vram_gb,
             "device": device,
-            "optimal_model": optimal_model
+            "optimal_model": optimal_model,
+            "calibrated": calibrated_model is not None
         }
 
 def get_whisper_model_info() -> dict:
@@ -157,4 +163,7 @@ def display_gpu_status():
         st.warning("⚠️ GPU를 감지할 수 없습니다. CPU 모드로 실행됩니다.")
         st.info("🎯 CPU 모드: BART 모델 사용")
     
+    if device_info["calibrated"]:
+        st.caption(f"📏 보정 프로파일 기준 Whisper 모델: {device_info['optimal_model']}")
+    
     return device_info
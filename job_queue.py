@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from settings import JOB_QUEUE_DEPTH, JOB_RETENTION, JOB_WORKERS
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음 (입장 제어)"""
+
+
+class Job:
+    """백그라운드 작업 1건의 상태 (워커 스레드가 갱신, UI는 읽기만 함)"""
+
+    def __init__(self, job_id: str, fn: Callable, args: tuple, kwargs: dict, key: Optional[Hashable] = None):
+        self.id = job_id
+        self.key = key
+        self.subscribers = 1
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = QUEUED
+        self.stage = "대기 중"
+        self.progress = 0
+        self.messages = []
+        self.partial = []  # 완료되는 대로 추가되는 부분 결과 (재생목록의 영상별 요약 등)
+        self.draft = None  # 최종 결과 전에 먼저 보여줄 초안 (추출 요약 등)
+        self.wants_draft = False  # 초안을 보여줄 화면이 있는 작업인지 (없으면 초안을 만들지 않음)
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def update(self, stage: str, progress: Optional[int] = None):
+        """진행 단계/진행률 갱신"""
+        self.stage = stage
+        if progress is not None:
+            self.progress = progress
+
+    def log(self, message: str):
+        """사용자에게 보여줄 안내 메시지 추가"""
+        self.messages.append(message)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def wait_time(self) -> float:
+        """대기열에서 기다린 시간 (초)"""
+        end = self.started_at or time.time()
+        return end - self.submitted_at
+
+    @property
+    def run_time(self) -> float:
+        """실행 시간 (초)"""
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class JobQueue:
+    """고정 크기 워커 풀 + 제한된 대기열 (한 노드에서 여러 사용자 요청 처리)"""
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_queue_depth: int = JOB_QUEUE_DEPTH,
+                 retention: int = JOB_RETENTION):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.retention = retention
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self._counters = {"submitted": 0, "coalesced": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._wait_total = 0.0
+        self._workers = []
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, fn: Callable[..., Any], *args, key: Optional[Hashable] = None, wants_draft: bool = False,
+               **kwargs) -> str:
+        """작업 등록 후 즉시 작업 ID 반환 (fn의 첫 인자로 Job이 전달됨)
+
+        같은 key의 작업이 대기/실행 중이면 새로 실행하지 않고 그 작업 ID를 반환
+        wants_draft: 최종 결과 전에 초안을 보여줄 화면(단일 영상 UI, API 스트림)이 있는 작업
+        """
+        with self._lock:
+            if key is not None and key in self._inflight:
+                job = self._jobs[self._inflight[key]]
+                job.subscribers += 1
+                job.wants_draft = job.wants_draft or wants_draft
+                self._counters["coalesced"] += 1
+                return job.id
+            if self._queue.qsize() >= self.max_queue_depth:
+                self._counters["rejected"] += 1
+                raise QueueFullError(
+                    f"대기 중인 작업이 너무 많습니다 ({self.max_queue_depth}건). 잠시 후 다시 시도하세요."
+                )
+            job = Job(uuid.uuid4().hex[:12], fn, args, kwargs, key=key)
+            job.wants_draft = wants_draft
+            self._jobs[job.id] = job
+            if key is not None:
+                self._inflight[key] = job.id
+            self._counters["submitted"] += 1
+            self._trim()
+        self._queue.put(job)
+        return job.id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job_id: str) -> int:
+        """대기열 내 순번 (1부터, 대기 중이 아니면 0)"""
+        with self._lock:
+            waiting = [job.id for job in self._jobs.values() if job.status == QUEUED]
+        return waiting.index(job_id) + 1 if job_id in waiting else 0
+
+    def stats(self) -> dict:
+        """대기열 깊이, 동시 실행 수, 평균 대기 시간 등"""
+        with self._lock:
+            started = self._counters["completed"] + self._counters["failed"] + self._running
+            return {
+                "queue_depth": self._queue.qsize(),
+                "running": self._running,
+                "in_flight_keys": len(self._inflight),
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "avg_wait_sec": self._wait_total / started if started else 0.0,
+                **self._counters,
+            }
+
+    def _trim(self):
+        """완료된 오래된 작업 기록 정리 (메모리 상한)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.retention)]:
+            del self._jobs[job_id]
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._running += 1
+                self._wait_total += job.wait_time
+            try:
+                job.result = job.fn(job, *job.args, **job.kwargs)
+                job.status = DONE
+                job.progress = 100
+            except Exception as e:
+                job.error = str(e)
+                job.status = FAILED
+            finally:
+                job.finished_at = time.time()
+                with self._lock:
+                    self._running -= 1
+                    if job.key is not None:
+                        self._inflight.pop(job.key, None)
+                    self._counters["completed" if job.status == DONE else "failed"] += 1
+                    self._trim()
+                self._queue.task_done()
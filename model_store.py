@@ -0,0 +1,190 @@
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+
+from settings import MODEL_STORE_DIR, MODEL_OFFLINE
+
+# 앱에서 사용하는 요약 모델
+SUMMARY_MODELS = ("google/long-t5-tglobal-base", "gogamza/kobart-base-v2", "facebook/bart-large-cnn")
+
+
+class ModelNotAvailableError(Exception):
+    """오프라인 모드에서 로컬 스냅샷이 없는 모델을 요청함"""
+
+
+def _rss_bytes():
+    """현재 프로세스 RSS (리눅스 /proc, 그 외에는 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+
+class ModelStore:
+    """리비전을 고정한 로컬 모델 스냅샷 저장소 (safetensors 변환, 오프라인 로드)
+
+    - models/<모델명>/<커밋>/ : config, 토크나이저, model.safetensors
+    - manifest.json : 모델명 → 고정된 커밋 (처음 받은 리비전으로 고정, 이후 허브 조회 없음)
+    safetensors 가중치는 메모리 매핑으로 읽으므로 같은 스냅샷을 여는 여러 워커 프로세스가 페이지 캐시를 공유함
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, root=MODEL_STORE_DIR, offline=MODEL_OFFLINE):
+        self.root = root
+        self.offline = offline
+        self.manifest_path = os.path.join(root, "manifest.json")
+        os.makedirs(root, exist_ok=True)
+
+    # --- 매니페스트 ---
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _snapshot_dir(self, model_name, commit):
+        return os.path.join(self.root, model_name.replace("/", "--"), commit)
+
+    def pinned(self, model_name):
+        """고정된 리비전 정보 (없으면 None)"""
+        return self._load_manifest().get(model_name)
+
+    # --- 스냅샷 ---
+    def resolve(self, model_name, revision=None):
+        """로컬 스냅샷 경로와 고정 커밋 반환 (없으면 받아서 safetensors로 변환, 오프라인이면 오류)"""
+        entry = self.pinned(model_name)
+        if entry and (revision is None or revision in (entry["revision"], entry["commit"])):
+            path = self._snapshot_dir(model_name, entry["commit"])
+            if os.path.exists(os.path.join(path, "config.json")):
+                return path, entry["commit"]
+        if self.offline:
+            raise ModelNotAvailableError(
+                f"오프라인 모드에서 {model_name}의 로컬 스냅샷이 없습니다. "
+                f"온라인 환경에서 `python model_store.py pull {model_name}`을 먼저 실행하세요."
+            )
+        return self.pull(model_name, revision or (entry["revision"] if entry else "main"))
+
+    def pull(self, model_name, revision="main"):
+        """허브에서 스냅샷을 받아 safetensors로 변환 후 매니페스트에 고정"""
+        from huggingface_hub import list_repo_files, snapshot_download
+
+        # 가중치는 safetensors가 있으면 그것만 받고, 없을 때만 .bin을 받아 변환 (같은 가중치를 두 번 받지 않도록)
+        files = list_repo_files(model_name, revision=revision)
+        weights = "*.safetensors" if any(name.endswith(".safetensors") for name in files) else "*.bin"
+        with self._lock:
+            downloaded = snapshot_download(
+                model_name, revision=revision,
+                allow_patterns=["*.json", weights, "*.model", "*.txt", "spiece.*"],
+            )
+            commit = os.path.basename(os.path.normpath(downloaded))
+            path = self._snapshot_dir(model_name, commit)
+            if not os.path.exists(os.path.join(path, "config.json")):
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                self._convert(downloaded, tmp_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+
+            manifest = self._load_manifest()
+            manifest[model_name] = {"revision": revision, "commit": commit, "pulled_at": time.time()}
+            self._save_manifest(manifest)
+        return path, commit
+
+    @staticmethod
+    def _convert(source, target):
+        """토크나이저/설정 복사, 가중치는 safetensors로 저장 (이미 safetensors면 그대로 복사)"""
+        os.makedirs(target)
+        has_safetensors = any(name.endswith(".safetensors") for name in os.listdir(source))
+        for name in os.listdir(source):
+            if not name.endswith(".bin"):
+                shutil.copy(os.path.join(source, name), os.path.join(target, name))
+        if not has_safetensors:
+            from transformers import AutoModelForSeq2SeqLM
+            model = AutoModelForSeq2SeqLM.from_pretrained(source, low_cpu_mem_usage=True)
+            model.save_pretrained(target, safe_serialization=True)
+
+    def list_models(self):
+        """고정된 모델 목록과 스냅샷 크기"""
+        models = []
+        for model_name, entry in sorted(self._load_manifest().items()):
+            path = self._snapshot_dir(model_name, entry["commit"])
+            size = sum(
+                os.path.getsize(os.path.join(dirpath, name))
+                for dirpath, _, names in os.walk(path) for name in names
+            ) if os.path.exists(path) else 0
+            models.append({"model": model_name, "revision": entry["revision"], "commit": entry["commit"],
+                           "path": path, "bytes": size})
+        return models
+
+
+def load_seq2seq(model_name, store=None, **load_kwargs):
+    """스냅샷에서 토크나이저/모델 로드 (safetensors 메모리 매핑, 허브 접근 없음)
+
+    반환: (토크나이저, 모델, "모델명@커밋")
+    """
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+    store = store or ModelStore()
+    path, commit = store.resolve(model_name)
+    load_kwargs.setdefault("low_cpu_mem_usage", True)
+    tokenizer = AutoTokenizer.from_pretrained(path, local_files_only=True)
+    model = AutoModelForSeq2SeqLM.from_pretrained(path, local_files_only=True, use_safetensors=True, **load_kwargs)
+    return tokenizer, model, f"{model_name}@{commit}"
+
+
+def benchmark_load(model_names=SUMMARY_MODELS, store=None):
+    """모델별 로드 시간과 RSS 증가량 측정 (같은 프로세스에서 순서대로 로드)"""
+    import gc
+    import transformers  # noqa: F401 (라이브러리 import 비용은 측정에서 제외)
+
+    store = store or ModelStore()
+    results = []
+    for model_name in model_names:
+        gc.collect()
+        rss_before = _rss_bytes()
+        start = time.time()
+        tokenizer, model, pinned_name = load_seq2seq(model_name, store)
+        load_sec = time.time() - start
+        rss_after = _rss_bytes()
+        params = sum(p.numel() * p.element_size() for p in model.parameters())
+        results.append({
+            "model": pinned_name,
+            "load_sec": load_sec,
+            "rss_delta_bytes": rss_after - rss_before,
+            "param_bytes": params,
+        })
+        del tokenizer, model
+    return results
+
+
+if __name__ == "__main__":
+    # python model_store.py pull|list|bench [모델명 ...]
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    names = sys.argv[2:] or list(SUMMARY_MODELS)
+    store = ModelStore(offline=MODEL_OFFLINE and command != "pull")
+    if command == "pull":
+        for name in names:
+            path, commit = store.pull(name)
+            print(f"{name} → {commit} ({path})")
+    elif command == "bench":
+        print(f"{'model':<60} {'load(s)':>8} {'RSS +MB':>9} {'params MB':>10}")
+        for row in benchmark_load(names, store):
+            print(f"{row['model']:<60} {row['load_sec']:>8.2f} "
+                  f"{row['rss_delta_bytes'] / 1024 ** 2:>9.1f} {row['param_bytes'] / 1024 ** 2:>10.1f}")
+    else:
+        for row in store.list_models():
+            print(f"{row['model']:<40} {row['commit'][:12]} {row['bytes'] / 1024 ** 2:>8.1f}MB  {row['path']}")
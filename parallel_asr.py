@@ -0,0 +1,157 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from asr_backends import load_asr_backend, select_asr_backend
+from audio_utils import SAMPLE_RATE
+from settings import ASR_PARALLEL_WORKERS, ASR_SEGMENT_SEC
+from vad import get_vad
+
+# 워커 프로세스별 음성 인식 엔진 (initializer에서 한 번만 로드)
+_worker_model = None
+
+
+def _init_worker(model_name, num_threads, backend):
+    """워커 프로세스 초기화: 스레드 예산을 지정해 CPU용 음성 인식 엔진 로드"""
+    global _worker_model
+    _worker_model = load_asr_backend(model_name, device="cpu", name=backend, cpu_threads=num_threads)
+
+
+def _load_slice(source, start, end):
+    """PCM 파일(mmap) 경로 또는 배열에서 구간 추출"""
+    if isinstance(source, str):
+        return np.array(np.load(source, mmap_mode="r")[start:end], dtype=np.float32)
+    return np.asarray(source, dtype=np.float32)
+
+
+def _detect_language_task(source, start, end):
+    """첫 구간으로 언어 감지 (모든 세그먼트를 같은 언어로 인식하기 위함)"""
+    return _worker_model.detect_language(_load_slice(source, start, end))
+
+
+def _transcribe_task(index, source, start, end, language):
+    """세그먼트 1개 인식 (타임스탬프는 세그먼트 시작 기준)"""
+    audio = _load_slice(source, start, end)
+    return index, _worker_model.transcribe(audio, language=language)["segments"]
+
+
+def split_at_silence(audio, target_sec=ASR_SEGMENT_SEC, detector=None,
+                     sample_rate=SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """무음 경계에서 약 target_sec 길이의 세그먼트로 분할 (전체 구간을 빠짐없이 덮음)"""
+    total = len(audio)
+    target = int(target_sec * sample_rate)
+    if total <= target * 1.5:
+        return [(0, total)]
+
+    detector = detector or get_vad()
+    regions = detector(audio, sample_rate)
+    # 음성 구간 사이의 무음 중간 지점이 자를 수 있는 후보
+    candidates = [(regions[i][1] + regions[i + 1][0]) // 2 for i in range(len(regions) - 1)]
+
+    bounds = []
+    start = 0
+    for cut in candidates:
+        # 무음 후보 사이가 너무 멀면 (긴 연속 발화) 먼저 target 길이로 강제로 자름 (세그먼트 최대 2배 길이)
+        while cut - start > 2 * target:
+            bounds.append((start, start + target))
+            start += target
+        if cut - start >= target:
+            bounds.append((start, cut))
+            start = cut
+    while total - start > 2 * target:
+        bounds.append((start, start + target))
+        start += target
+    if bounds and total - start < target // 4:
+        bounds[-1] = (bounds[-1][0], total)  # 너무 짧은 꼬리는 앞 세그먼트에 합침
+    else:
+        bounds.append((start, total))
+    return bounds
+
+
+def _dedup_boundary(prev_text, next_text, max_words=8):
+    """이전 세그먼트 끝과 다음 세그먼트 시작에서 반복된 단어 제거"""
+    prev_words = prev_text.split()
+    next_words = next_text.split()
+    for n in range(min(max_words, len(prev_words), len(next_words)), 0, -1):
+        if [w.lower() for w in prev_words[-n:]] == [w.lower() for w in next_words[:n]]:
+            return " ".join(next_words[n:])
+    return next_text
+
+
+def stitch_segments(results) -> list:
+    """세그먼트 순서대로 이어붙이고 경계 단어 중복 제거"""
+    stitched = []
+    for _, segments in sorted(results, key=lambda r: r[0]):
+        if stitched and segments:
+            first = dict(segments[0])
+            first["text"] = _dedup_boundary(stitched[-1]["text"], first["text"])
+            segments = [first] + segments[1:]
+        stitched.extend(seg for seg in segments if seg["text"].strip())
+    return stitched
+
+
+def default_workers():
+    """워커 수 (설정값, 0이면 코어 수의 절반)"""
+    if ASR_PARALLEL_WORKERS > 0:
+        return ASR_PARALLEL_WORKERS
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def transcribe_parallel(audio, model_name="base", workers=None, language=None,
+                        target_sec=ASR_SEGMENT_SEC, pcm_path=None, backend=None,
+                        on_progress: Optional[Callable[[float, float], None]] = None) -> dict:
+    """무음 경계로 나눈 세그먼트를 프로세스 풀에서 동시에 인식
+
+    audio: 16kHz PCM 배열
+    pcm_path: audio와 같은 내용의 .npy 파일 (주어지면 워커가 자기 구간만 mmap으로 읽어 프로세스 간 복사 생략)
+    backend: 음성 인식 엔진 이름 (기본: 노드 하드웨어에 맞게 선택)
+    반환: model.transcribe와 같은 {"text", "segments", "language"} 형식
+    """
+    workers = workers or default_workers()
+    backend = backend or select_asr_backend("cpu")
+    bounds = split_at_silence(audio, target_sec)
+    workers = min(workers, len(bounds))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    total_sec = len(audio) / SAMPLE_RATE
+
+    def source_for(start, end):
+        return (pcm_path, start, end) if pcm_path else (audio[start:end], 0, end - start)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_name, threads, backend)) as pool:
+        if language is None:
+            first_start, first_end = bounds[0]
+            language = pool.submit(
+                _detect_language_task, *source_for(first_start, min(first_end, first_start + 30 * SAMPLE_RATE))
+            ).result()
+
+        futures = {}
+        for i, (start, end) in enumerate(bounds):
+            source, s, e = source_for(start, end)
+            future = pool.submit(_transcribe_task, i, source, s, e, language)
+            futures[future] = (start, end)
+
+        results = []
+        done_sec = 0.0
+        for future in as_completed(futures):
+            index, segments = future.result()
+            start, end = futures[future]
+            # 세그먼트 시작 위치만큼 시각 보정
+            offset = start / SAMPLE_RATE
+            segments = [dict(seg, start=seg["start"] + offset, end=seg["end"] + offset) for seg in segments]
+            results.append((index, segments))
+            done_sec += (end - start) / SAMPLE_RATE
+            if on_progress:
+                on_progress(done_sec, total_sec)
+
+    segments = stitch_segments(results)
+    return {
+        "text": " ".join(seg["text"].strip() for seg in segments),
+        "segments": segments,
+        "language": language,
+        "num_segments": len(bounds),
+        "workers": workers,
+        "backend": backend,
+    }
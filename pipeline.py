@@ -0,0 +1,308 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from youtube_utils import extract_video_id, get_transcript, format_transcript, detect_language
+from singleflight import SingleFlight
+from result_store import ResultStore
+from playlist import expand_playlist
+from settings import PLAYLIST_CONCURRENCY, CAPTION_DEDUP_ENABLED, PROGRESSIVE_DRAFT, SEARCH_INDEX_ENABLED
+from caption_dedup import dedup_segments, is_rolling_captions
+from tree_reduce import format_level_stats
+from extractive_summarizer import ExtractiveSummarizer
+from transcript_sources import describe_source
+from deadline_planner import DeadlinePlanner, describe_plan
+from search_index import SearchIndex
+
+_models = None
+_models_lock = threading.Lock()
+
+# 같은 영상의 자막/음성 추출은 요약 언어와 무관하므로 영상 ID 단위로 합침
+transcript_flight = SingleFlight()
+
+# 같은 (영상, 언어, 설정)의 요약은 단일 작업/재생목록 작업 어디서 요청되든 한 번만 실행
+summary_flight = SingleFlight()
+
+# 처리 완료된 자막/요약 캐시
+result_store = ResultStore()
+
+# 처리 완료된 영상의 제목/요약/자막 전문 검색 색인 (완료된 작업마다 갱신)
+search_index = SearchIndex() if SEARCH_INDEX_ENABLED else None
+
+# 현재 요약 설정 (같은 영상이라도 설정이 다르면 별도 작업)
+SUMMARY_CONFIG = ("auto",)
+
+# 요약 방식 (abstractive: LongT5/BART 생성 요약, extractive: 모델 없이 문장 추출)
+ABSTRACTIVE = "abstractive"
+EXTRACTIVE = "extractive"
+_extractive_summarizer = ExtractiveSummarizer()
+
+
+def get_models(log=None):
+    """요약 모델을 프로세스당 한 번만 로드 (워커 스레드 간 공유, log: 처음 로드할 때 안내 메시지를 받는 함수)"""
+    global _models
+    with _models_lock:
+        if _models is None:
+            # 추출 요약만 쓰는 경우 torch/transformers를 불러오지 않도록 필요할 때 import
+            from summarizer import Summarizer
+            from gpu_utils import GPUDetector
+            _models = (Summarizer(log), GPUDetector())
+        return _models
+
+
+def generation_stats():
+    """요약 생성 배치 스케줄러 통계 (모델이 아직 로드되지 않았거나 LongT5가 아니면 None)"""
+    if _models is None or _models[0].scheduler is None:
+        return None
+    return _models[0].scheduler.stats()
+
+
+def describe_summary_method(summarizer):
+    """사용된 요약 모델 설명 문자열 (요약기가 실제로 로드한 모델/로드 방식 기준)"""
+    return summarizer.describe()
+
+
+def get_summarizer(mode=ABSTRACTIVE, progress=None):
+    """요약 방식별 (요약기, 요약 방식 설명) - progress: 모델을 처음 로드할 때 안내를 기록할 작업 객체"""
+    if mode == EXTRACTIVE:
+        return _extractive_summarizer, "빠른 추출 요약 (TF-IDF 중심성 + MMR, 모델 없음)"
+    summarizer, _ = get_models(progress.log if progress is not None else None)
+    return summarizer, describe_summary_method(summarizer)
+
+
+def summary_config(mode=ABSTRACTIVE, budget_sec=None):
+    """요약 방식별 설정 (생성 요약은 기존 설정 그대로 사용해 이전 캐시 유지, 시간 예산이 있으면 예산별로 구분)"""
+    config = SUMMARY_CONFIG if mode == ABSTRACTIVE else (mode,)
+    if budget_sec:
+        config += (f"budget={budget_sec}",)
+    return config
+
+
+def job_key(video_id, target_lang, config=SUMMARY_CONFIG):
+    """동일 요청 판별 키 (영상 ID, 요약 언어, 요약 설정)"""
+    return (video_id, target_lang, config)
+
+
+def load_transcript(video_id, url, choose_asr_model=None, progress=None):
+    """자막/음성 추출 (캐시 우선, 같은 영상의 동시 요청은 한 번만 실행)
+
+    progress: 작업 객체 (워커 스레드에서는 st.* 표시가 보이지 않으므로 음성 인식 진행률/안내를 작업에 기록)
+    """
+    key = ResultStore.make_key("transcript", video_id)
+    transcript_data = result_store.get(key)
+    if transcript_data:
+        return transcript_data
+    transcript_data, source = transcript_flight.do(
+        video_id, get_transcript, url, use_whisper=True, choose_asr_model=choose_asr_model, progress=progress
+    )
+    if transcript_data:
+        # 어떤 자막 트랙(또는 음성 인식)을 사용했는지 함께 기록
+        result_store.put(ResultStore.make_key("transcript_source", video_id), source)
+        result_store.put(key, transcript_data)
+    return transcript_data
+
+
+def transcript_source(video_id):
+    """영상 자막의 출처 (수동/자동/번역/다른 언어 자막, Whisper - 기록이 없으면 None)"""
+    return result_store.get(ResultStore.make_key("transcript_source", video_id))
+
+
+def summarize_video(job, video_id, url, target_lang, mode=ABSTRACTIVE, budget_sec=None, title=None, planner=None,
+                    transcript=None):
+    """영상 1개 자막 추출 → 요약 (이전 결과가 있으면 재사용)
+
+    budget_sec: 시간 예산 (주어지면 예산 안에 끝나도록 Whisper 모델/요약 방식/디코딩 설정을 고름)
+    title: 영상 제목 (재생목록 항목처럼 알고 있으면 검색 색인에 함께 기록)
+    planner: 이미 진행 중인 시간 예산 계획 (분산 워커에서 자막 단계의 계획을 이어받을 때)
+    transcript: 이미 추출한 (자막 세그먼트, 자막 출처) - 주어지면 자막/음성 추출을 하지 않음 (분산 워커의 요약 단계)
+    결과는 저장소에 압축 저장하고 결과 키만 반환
+    """
+    key = ResultStore.make_key("summary", *job_key(video_id, target_lang, summary_config(mode, budget_sec)))
+    reuse_keys = [key]
+    if budget_sec:
+        # 시간 예산이 있어도 예산 없이 만든 결과가 있으면 그대로 사용 (품질이 더 높고 바로 반환)
+        reuse_keys.insert(0, ResultStore.make_key("summary", *job_key(video_id, target_lang, summary_config(mode))))
+    for reuse_key in reuse_keys:
+        if result_store.get_result(reuse_key):
+            job.log("💾 이전에 처리한 결과를 재사용합니다")
+            return reuse_key
+    if planner is None and budget_sec:
+        planner = DeadlinePlanner(budget_sec, mode)
+
+    # 자막/음성 추출
+    job.update("자막/음성 추출 중...", 30)
+    if transcript is not None:
+        transcript_data, source = transcript
+    else:
+        transcript_data = load_transcript(video_id, url, planner.choose_asr_model if planner else None, job)
+        source = transcript_source(video_id)
+    if not transcript_data:
+        raise RuntimeError("자막/음성 추출에 실패했습니다.")
+    job.log(f"📜 자막 출처: {describe_source(source)}")
+
+    # 텍스트 변환 (자동 생성 자막의 반복 구간 제거 후)
+    job.update("텍스트 변환 중...", 50)
+    dedup_stats = None
+    if CAPTION_DEDUP_ENABLED and is_rolling_captions(source):
+        transcript_data, dedup_stats = dedup_segments(transcript_data)
+        job.log(f"🧹 중복 자막 제거: {dedup_stats['removed_fraction'] * 100:.1f}% "
+                f"({dedup_stats['chars_before']:,}자 → {dedup_stats['chars_after']:,}자)")
+    transcript_text = format_transcript(transcript_data)
+
+    # 원본 언어 감지
+    detected_lang = detect_language(transcript_text)
+    job.log(f"원본 텍스트 언어 감지: {'한국어' if detected_lang == 'ko' else '영어'}")
+    job.log(f"✅ 요약 언어: {'한국어' if target_lang == 'ko' else '영어'}로 요약합니다")
+    if detected_lang != target_lang:
+        job.log("💡 원본 언어와 다른 언어로 요약합니다. 번역 품질에 따라 결과가 달라질 수 있습니다.")
+
+    # 시간 예산이 있으면 실제 자막 길이와 남은 시간으로 요약 방식/디코딩 설정 선택
+    summary_mode = mode
+    decoding = None
+    if planner:
+        summary_plan = planner.choose_summary(len(transcript_text))
+        summary_mode = summary_plan["summarizer"]
+        decoding = planner.decoding()
+        job.log(f"⏱️ 남은 예산 {planner.remaining:.0f}초 → {summary_plan['label']} "
+                f"(예상 {summary_plan['summary_sec']:.0f}초{'' if summary_plan['meets_budget'] else ', 예산 초과'})")
+
+    # 생성 요약은 오래 걸리므로 추출 요약 초안을 먼저 보여주고, 완료되면 최종 결과로 교체
+    # (재생목록 항목/분산 워커처럼 초안을 보여줄 화면이 없는 작업은 만들지 않음)
+    if summary_mode == ABSTRACTIVE and PROGRESSIVE_DRAFT and job.wants_draft:
+        job.update("요약 초안 생성 중...", 60)
+        job.draft = {
+            'summary': _extractive_summarizer.summarize_text(transcript_text, language=target_lang),
+            'video_id': video_id,
+        }
+
+    # 요약 생성
+    job.update("AI 요약 생성 중...", 70)
+    summarizer, summary_method = get_summarizer(summary_mode, job)
+    reduce_stats = []
+    memo_stats = {}
+    if decoding:
+        summary = summarizer.summarize_text(transcript_text, language=target_lang, stats=reduce_stats,
+                                            decoding=decoding, progress=job, memo_stats=memo_stats)
+    else:
+        summary = summarizer.summarize_text(transcript_text, language=target_lang, stats=reduce_stats, progress=job,
+                                            memo_stats=memo_stats)
+    for line in format_level_stats(reduce_stats):
+        job.log(f"📈 {line}")
+    if memo_stats.get("hits"):
+        job.log(f"♻️ 청크 메모 재사용 {memo_stats['hits']}개 · 새로 생성 {memo_stats['misses']}개")
+    plan = planner.result(source["kind"] if source else None) if planner else None
+    if plan:
+        job.log(f"⏱️ {describe_plan(plan)}")
+
+    result = {
+        'summary': summary,
+        'summary_method': summary_method,
+        'summary_mode': summary_mode,
+        'video_id': video_id,
+        'transcript_text': transcript_text,
+        'transcript_source': source,
+        'plan': plan,
+        'reduce_stats': reduce_stats,
+        'memo_stats': memo_stats or None,
+        'dedup_stats': dedup_stats,
+    }
+    key = result_store.put_result(key, result)
+
+    # 검색 색인 (색인에 실패해도 요약 결과는 그대로 반환)
+    if search_index is not None:
+        try:
+            search_index.add_video(video_id, summary, transcript_data, title=title, language=target_lang,
+                                   source=describe_source(source))
+        except sqlite3.Error as e:
+            job.log(f"⚠️ 검색 색인 실패: {e}")
+    return key
+
+
+def run_summary_job(job, url, target_lang, mode=ABSTRACTIVE, budget_sec=None):
+    """유튜브 URL → 자막/음성 추출 → 요약 (작업 큐 워커에서 실행)"""
+    job.update("비디오 ID 추출 중...", 10)
+    video_id = extract_video_id(url)
+    if not video_id:
+        raise ValueError("유효하지 않은 유튜브 URL입니다.")
+    # 재생목록 작업 등 다른 경로에서 같은 영상을 처리 중이면 그 결과를 함께 사용
+    key = summary_flight.do(
+        job_key(video_id, target_lang, summary_config(mode, budget_sec)), summarize_video,
+        job, video_id, url, target_lang, mode, budget_sec
+    )
+    # 세션/작업에는 작은 핸들만 보관 (본문은 저장소에서 필요할 때 읽음)
+    return result_store.handle(key)
+
+
+class _VideoProgress:
+    """재생목록 안의 개별 영상 진행 상황 (부모 작업에는 완료 건수만 표시)"""
+
+    wants_draft = False
+
+    def update(self, stage, progress=None):
+        pass
+
+    def log(self, message):
+        pass
+
+
+def _summarize_playlist_item(index, video, target_lang, mode):
+    video_id = video["video_id"]
+    item = {"index": index, "video_id": video_id, "title": video["title"], "url": video["url"]}
+    try:
+        key = summary_flight.do(
+            job_key(video_id, target_lang, summary_config(mode)), summarize_video,
+            _VideoProgress(), video_id, video["url"], target_lang, mode, None, video["title"]
+        )
+        item["summary"] = result_store.get_result(key)["summary"]
+        item["result_key"] = key
+    except Exception as e:
+        item["error"] = str(e)
+    return item
+
+
+def run_playlist_job(job, url, target_lang, mode=ABSTRACTIVE):
+    """재생목록/채널 URL → 영상별 요약(제한된 동시 처리) → 통합 요약
+
+    영상별 결과는 완료되는 대로 job.partial에 추가됨
+    """
+    job.update("재생목록 영상 목록 가져오는 중...", 5)
+    playlist = expand_playlist(url)
+    if not playlist or not playlist["videos"]:
+        raise RuntimeError("재생목록에서 영상을 찾을 수 없습니다.")
+    videos = playlist["videos"]
+    job.log(f"📃 {playlist['title']}: 영상 {len(videos)}개")
+
+    with ThreadPoolExecutor(max_workers=PLAYLIST_CONCURRENCY) as pool:
+        futures = [
+            pool.submit(_summarize_playlist_item, i, video, target_lang, mode)
+            for i, video in enumerate(videos)
+        ]
+        for future in as_completed(futures):
+            job.partial.append(future.result())
+            done = len(job.partial)
+            job.update(f"영상별 요약 중... ({done}/{len(videos)})", 10 + int(80 * done / len(videos)))
+
+    items = sorted(job.partial, key=lambda item: item["index"])
+    succeeded = [item for item in items if "summary" in item]
+    if not succeeded:
+        raise RuntimeError("재생목록의 모든 영상 요약에 실패했습니다.")
+
+    # 영상별 요약을 모아 재생목록 전체 요약 생성
+    job.update("재생목록 통합 요약 생성 중...", 90)
+    summarizer, summary_method = get_summarizer(mode, job)
+    combined = "\n\n".join(f"{item['title']}. {item['summary']}" for item in succeeded)
+    reduce_stats = []
+    summary = summarizer.summarize_text(combined, language=target_lang, stats=reduce_stats, progress=job)
+
+    key = ResultStore.make_key("playlist", *job_key(playlist['playlist_id'], target_lang, summary_config(mode)))
+    result_store.put_result(key, {
+        'summary': summary,
+        'summary_method': summary_method,
+        'summary_mode': mode,
+        'video_id': playlist['playlist_id'],
+        'transcript_text': "\n\n".join(result_store.get_transcript_text(item['result_key']) for item in succeeded),
+        'reduce_stats': reduce_stats,
+        'playlist_title': playlist['title'],
+        'videos': items,
+    })
+    return result_store.handle(key)
@@ -0,0 +1,98 @@
+import re
+
+import yt_dlp
+
+from settings import PLAYLIST_MAX_VIDEOS
+
+# 재생목록/채널 URL 패턴
+_PLAYLIST_PATTERN = re.compile(r"[?&]list=([A-Za-z0-9_-]+)")
+_CHANNEL_PATTERN = re.compile(r"youtube\.com/(@[^/?#]+|channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+)(/[^?#]*)?")
+_CHANNEL_TABS = ("/videos", "/streams", "/shorts", "/playlists")
+# 믹스/라디오 재생목록 (list=RD..., 자동 생성되는 끝없는 목록이라 재생목록으로 처리하지 않음)
+_MIX_PREFIX = "RD"
+
+
+def extract_playlist_id(url):
+    """URL의 재생목록 ID (없으면 None)"""
+    m = _PLAYLIST_PATTERN.search(url)
+    return m.group(1) if m else None
+
+
+def is_channel_url(url):
+    return bool(_CHANNEL_PATTERN.search(url))
+
+
+def is_playlist_url(url, include_watch_lists=False):
+    """재생목록/채널 URL 여부
+
+    include_watch_lists: watch?v=...&list=... 형태(재생목록 안의 영상)도 재생목록으로 볼지 여부
+    (기본은 /playlist, 채널 URL만 재생목록, 믹스(list=RD...)는 항상 단일 영상)
+    """
+    if is_channel_url(url):
+        return True
+    playlist_id = extract_playlist_id(url)
+    if not playlist_id or playlist_id.startswith(_MIX_PREFIX):
+        return False
+    return include_watch_lists or "/playlist" in url
+
+
+def _normalize_channel_url(url):
+    """채널 URL은 동영상 탭으로 (탭 목록 대신 영상 목록을 받기 위함)"""
+    m = _CHANNEL_PATTERN.search(url)
+    if m and not (m.group(2) or "").startswith(_CHANNEL_TABS):
+        return f"https://www.youtube.com/{m.group(1)}/videos"
+    return url
+
+
+def _flatten_entries(entries, depth=0):
+    """중첩된 재생목록(채널 탭 등)을 펼쳐 영상 항목만 반환"""
+    for entry in entries or []:
+        if not entry:
+            continue
+        if entry.get("_type") == "playlist" or entry.get("entries"):
+            if depth < 2:
+                yield from _flatten_entries(entry.get("entries"), depth + 1)
+            continue
+        video_id = entry.get("id")
+        if video_id and len(video_id) == 11:
+            yield entry
+
+
+def expand_playlist(url, max_videos=PLAYLIST_MAX_VIDEOS):
+    """yt-dlp flat 추출로 재생목록/채널의 영상 목록 반환 (영상 페이지는 열지 않음)"""
+    if is_channel_url(url):
+        url = _normalize_channel_url(url)
+    elif extract_playlist_id(url):
+        url = f"https://www.youtube.com/playlist?list={extract_playlist_id(url)}"
+
+    ydl_opts = {
+        "extract_flat": "in_playlist",
+        "skip_download": True,
+        "quiet": True,
+        "no_warnings": True,
+        "ignoreerrors": True,
+        "playlistend": max_videos,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if not info:
+        return None
+
+    videos = []
+    seen = set()
+    for entry in _flatten_entries(info.get("entries")):
+        if entry["id"] in seen:
+            continue
+        seen.add(entry["id"])
+        videos.append({
+            "video_id": entry["id"],
+            "title": entry.get("title") or entry["id"],
+            "url": f"https://www.youtube.com/watch?v={entry['id']}",
+        })
+        if len(videos) >= max_videos:
+            break
+    return {
+        "playlist_id": info.get("id") or extract_playlist_id(url),
+        "title": info.get("title") or "재생목록",
+        "videos": videos,
+    }
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+
+from settings import RESULT_CACHE_DIR, RESULT_MEMORY_MB
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성 (없으면 zlib 사용)
+    zstandard = None
+
+# 압축 파일 앞에 붙이는 형식 표시
+_ZSTD_MAGIC = b"ZST1"
+_ZLIB_MAGIC = b"ZLB1"
+
+
+def _compress(raw):
+    if zstandard is not None:
+        return _ZSTD_MAGIC + zstandard.ZstdCompressor(level=6).compress(raw)
+    return _ZLIB_MAGIC + zlib.compress(raw, 6)
+
+
+def _decompress(data):
+    magic, body = data[:4], data[4:]
+    if magic == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstandard 패키지가 없어 zstd 압축 결과를 읽을 수 없습니다")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if magic == _ZLIB_MAGIC:
+        return zlib.decompress(body)
+    raise ValueError("알 수 없는 압축 형식")
+
+
+def _size_of(value):
+    """메모리 사용량 추정 (문자열/리스트/딕셔너리 재귀)"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_size_of(k) + _size_of(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_size_of(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class MemoryBoundedCache:
+    """프로세스 메모리 상한이 있는 LRU 캐시 (상한을 넘으면 오래 사용하지 않은 항목부터 제거)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        size = _size_of(value)
+        with self._lock:
+            if key in self._items:
+                self.bytes_held -= self._items.pop(key)[1]
+            if size > self.max_bytes:
+                return  # 상한보다 큰 값은 보관하지 않음 (매번 디스크에서 읽음)
+            self._items[key] = (value, size)
+            self.bytes_held += size
+            while self.bytes_held > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.bytes_held -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes_held": self.bytes_held,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class ResultStore:
+    """처리 완료된 자막/요약 결과의 압축 디스크 저장소 (재요청 시 재사용)
+
+    - 값은 JSON을 zstd(설치된 경우) 또는 zlib으로 압축해 <key 앞 2자리>/<key>.bin에 저장
+    - 요약 결과의 원본 자막은 따로 저장해 화면에서 펼칠 때만 읽음
+    - 최근 읽은 값은 메모리 상한이 있는 LRU 캐시에 보관
+    """
+
+    _lock = threading.Lock()
+    # 호출마다 인스턴스를 만들어도 메모리 상한이 프로세스 전체에 적용되도록 공유
+    _memory = MemoryBoundedCache(int(RESULT_MEMORY_MB * 1024 ** 2))
+    _bytes_raw = 0
+    _bytes_compressed = 0
+
+    def __init__(self, root=RESULT_CACHE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """임의 값들로 파일명에 쓸 수 있는 키 생성"""
+        raw = json.dumps(parts, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key + ".bin")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return json.loads(_decompress(f.read()).decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key):
+        value = self._memory.get(key)
+        if value is None:
+            value = self._read(key)
+            if value is not None:
+                self._memory.put(key, value)
+        return value
+
+    def put(self, key, value):
+        raw = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        data = _compress(raw)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with self._lock:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            ResultStore._bytes_raw += len(raw)
+            ResultStore._bytes_compressed += len(data)
+        self._memory.put(key, value)
+        return key
+
+    # --- 요약 결과 (세션에는 핸들만 보관) ---
+    @staticmethod
+    def _transcript_key(key):
+        return ResultStore.make_key("transcript_text", key)
+
+    def put_result(self, key, result):
+        """요약 결과 저장 (원본 자막은 별도 항목으로 분리)"""
+        result = dict(result)
+        transcript_text = result.pop("transcript_text", "")
+        result["transcript_chars"] = len(transcript_text)
+        self.put(self._transcript_key(key), transcript_text)
+        self.put(key, result)
+        return key
+
+    def get_result(self, key):
+        """원본 자막을 제외한 요약 결과 (없으면 None)"""
+        return self.get(key)
+
+    def get_transcript_text(self, key):
+        """요약 결과의 원본 자막 (필요할 때만 읽음)"""
+        transcript_text = self.get(self._transcript_key(key))
+        return transcript_text if transcript_text is not None else ""
+
+    def handle(self, key):
+        """세션에 보관할 작은 핸들 (결과 본문은 저장소에서 필요할 때 읽음)"""
+        result = self.get_result(key) or {}
+        return {
+            "key": key,
+            "video_id": result.get("video_id"),
+            "summary_method": result.get("summary_method"),
+        }
+
+    def stats(self):
+        """메모리/디스크 사용량 지표"""
+        stats = self._memory.stats()
+        stats.update({
+            "codec": "zstd" if zstandard is not None else "zlib",
+            "bytes_written_raw": ResultStore._bytes_raw,
+            "bytes_written_compressed": ResultStore._bytes_compressed,
+        })
+        return stats
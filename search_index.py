@@ -0,0 +1,257 @@
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from settings import SEARCH_INDEX_PATH, SEARCH_PASSAGE_CHARS, SEARCH_MAX_CANDIDATES
+
+# 한글/가나/한자는 띄어쓰기와 조사 때문에 단어 단위 색인으로는 부분 일치가 안 되므로 2글자 단위(bigram)로 색인
+# (FTS5 trigram 토크나이저는 "경제" 같은 2글자 검색어를 찾지 못함)
+_CJK = "぀-ヿ㐀-䶿一-鿿가-힣"
+_TOKEN = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+")
+_CJK_RUN = re.compile(rf"[{_CJK}]+")
+
+# 검색 결과 종류
+TITLE = "title"
+SUMMARY = "summary"
+TRANSCRIPT = "transcript"
+
+
+def _is_cjk(run):
+    return _CJK_RUN.fullmatch(run) is not None
+
+
+def ngram_tokens(text):
+    """색인/검색용 토큰 (한글 등은 겹치는 2글자 단위, 그 외 단어는 소문자 그대로)"""
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        run = match.group()
+        if _is_cjk(run) and len(run) > 1:
+            tokens += [run[i:i + 2] for i in range(len(run) - 1)]
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def build_match_query(query):
+    """검색어 → FTS5 MATCH 식 (띄어쓴 검색어는 모두 포함, 각 검색어는 토큰이 연속으로 나오는 구절)
+
+    한 글자 한글 검색어는 그 글자로 시작하는 2글자 토큰의 접두어 검색
+    """
+    phrases = []
+    for term in query.split():
+        parts = []
+        for match in _TOKEN.finditer(term.lower()):
+            run = match.group()
+            if _is_cjk(run) and len(run) == 1:
+                parts.append(f'"{run}"*')
+            else:
+                parts.append('"' + " ".join(ngram_tokens(run)) + '"')
+        if parts:
+            phrases.append(" + ".join(parts))
+    return " AND ".join(phrases)
+
+
+def make_passages(segments, max_chars=SEARCH_PASSAGE_CHARS):
+    """자막 세그먼트를 검색 결과 단위 구간으로 묶음 → [(시작 초 또는 None, 텍스트)]
+
+    자동 생성 자막은 한 줄이 짧아 검색어가 줄 경계에 걸리기 쉬우므로 max_chars까지 이어 붙임
+    """
+    passages = []
+    start = None
+    texts = []
+    length = 0
+    for seg in segments:
+        text = (seg.get("text") or "").strip()
+        if not text:
+            continue
+        if texts and length + len(text) > max_chars:
+            passages.append((start, " ".join(texts)))
+            texts, length = [], 0
+        if not texts:
+            start = seg.get("start")
+        texts.append(text)
+        length += len(text) + 1
+    if texts:
+        passages.append((start, " ".join(texts)))
+    return passages
+
+
+def format_timestamp(seconds):
+    """초 → "1:02:03" / "2:03" """
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def timestamp_url(video_id, seconds=None):
+    """영상 URL (시작 시각이 있으면 해당 위치부터 재생)"""
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    return f"{url}&t={int(seconds)}s" if seconds is not None else url
+
+
+class SearchIndex:
+    """처리 완료된 영상의 제목/요약/자막 전문 검색 색인 (SQLite FTS5)
+
+    영상마다 요약 1건과 자막 구간(시작 시각 포함)을 색인하고, 같은 영상을 다시 색인하면 기존 내용을 교체
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path=SEARCH_INDEX_PATH, max_candidates=SEARCH_MAX_CANDIDATES):
+        self.path = path
+        self.max_candidates = max_candidates
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.searches = 0
+        self.total_search_ms = 0.0
+        self.max_search_ms = 0.0
+        self.last_search_ms = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS videos (video_id TEXT PRIMARY KEY, title TEXT, language TEXT, "
+                "source TEXT, summary TEXT, passages INTEGER, indexed_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS passages (id INTEGER PRIMARY KEY, video_id TEXT NOT NULL, "
+                "kind TEXT NOT NULL, start REAL, text TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS passages_video ON passages (video_id)")
+            # rowid = passages.id, 색인 열에는 원문 대신 n-gram 토큰 문자열을 저장
+            # prefix='1': 한 글자 검색어("금"*)를 2글자 토큰 전체를 훑지 않고 접두어 색인으로 찾음
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(grams, tokenize='unicode61', prefix='1')"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add_video(self, video_id, summary, segments=None, title=None, language=None, source=None):
+        """영상 1건 색인 (segments: [{"text", "start", ...}], 시작 시각이 없으면 자막 검색 결과에 시각 없이 표시)"""
+        rows = []
+        if title:
+            rows.append((TITLE, None, title))
+        if summary:
+            rows.append((SUMMARY, None, summary))
+        rows += [(TRANSCRIPT, start, text) for start, text in make_passages(segments or [])]
+
+        with self._lock, self._connect() as conn:
+            self._delete(conn, video_id)
+            for kind, start, text in rows:
+                cursor = conn.execute(
+                    "INSERT INTO passages (video_id, kind, start, text) VALUES (?, ?, ?, ?)",
+                    (video_id, kind, start, text)
+                )
+                conn.execute(
+                    "INSERT INTO passages_fts (rowid, grams) VALUES (?, ?)",
+                    (cursor.lastrowid, " ".join(ngram_tokens(text)))
+                )
+            conn.execute(
+                "INSERT INTO videos (video_id, title, language, source, summary, passages, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (video_id, title, language, source, summary, len(rows), time.time())
+            )
+        return len(rows)
+
+    @staticmethod
+    def _delete(conn, video_id):
+        conn.execute(
+            "DELETE FROM passages_fts WHERE rowid IN (SELECT id FROM passages WHERE video_id = ?)", (video_id,)
+        )
+        conn.execute("DELETE FROM passages WHERE video_id = ?", (video_id,))
+        conn.execute("DELETE FROM videos WHERE video_id = ?", (video_id,))
+
+    def remove_video(self, video_id):
+        with self._lock, self._connect() as conn:
+            self._delete(conn, video_id)
+
+    def search(self, query, limit=20, hits_per_video=3):
+        """검색어가 나온 영상 목록 (관련도 순, 일치 구간이 max_candidates개를 넘으면 최근 색인된 구간 안에서)
+
+        반환: [{"video_id", "title", "summary", "url", "hits": [{"kind", "start", "text", "url"}]}]
+        자막 검색 결과의 url은 해당 시각부터 재생하는 링크
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        start_time = time.perf_counter()
+        with self._connect() as conn:
+            # 자주 나오는 검색어는 일치 구간 전체의 관련도를 계산하면 느리므로,
+            # 최근에 색인된 max_candidates개 구간의 rowid 하한을 먼저 찾고 그 안에서만 순위 계산
+            floor = conn.execute(
+                "SELECT rowid FROM passages_fts WHERE passages_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                (match, self.max_candidates - 1)
+            ).fetchone()
+            rows = conn.execute(
+                "SELECT p.video_id, p.kind, p.start, p.text FROM passages_fts "
+                "JOIN passages p ON p.id = passages_fts.rowid "
+                "WHERE passages_fts MATCH ? AND passages_fts.rowid >= ? ORDER BY passages_fts.rank LIMIT ?",
+                (match, floor[0] if floor else 0, limit * hits_per_video * 4)
+            ).fetchall()
+
+            # 영상별로 묶음 (가장 관련도 높은 구간 순서 유지)
+            results = {}
+            for video_id, kind, start, text in rows:
+                result = results.get(video_id)
+                if result is None:
+                    if len(results) >= limit:
+                        continue
+                    result = results[video_id] = {"video_id": video_id, "hits": []}
+                if len(result["hits"]) < hits_per_video:
+                    result["hits"].append({
+                        "kind": kind,
+                        "start": start,
+                        "text": text,
+                        "url": timestamp_url(video_id, start),
+                    })
+
+            if results:
+                placeholders = ",".join("?" * len(results))
+                for video_id, title, summary in conn.execute(
+                    f"SELECT video_id, title, summary FROM videos WHERE video_id IN ({placeholders})",
+                    list(results)
+                ):
+                    results[video_id].update(title=title, summary=summary, url=timestamp_url(video_id))
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.last_search_ms = elapsed_ms
+        self.searches += 1
+        self.total_search_ms += elapsed_ms
+        self.max_search_ms = max(self.max_search_ms, elapsed_ms)
+        return list(results.values())
+
+    def stats(self):
+        with self._connect() as conn:
+            videos = conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            passages = conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+        return {
+            "videos": videos,
+            "passages": passages,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "searches": self.searches,
+            "avg_search_ms": self.total_search_ms / self.searches if self.searches else 0.0,
+            "max_search_ms": self.max_search_ms,
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="처리한 영상 전문 검색")
+    parser.add_argument("query", nargs="?", help="검색어 (띄어쓴 검색어는 모두 포함)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--stats", action="store_true", help="색인 통계 출력")
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    if args.query:
+        results = index.search(args.query, limit=args.limit)
+        for result in results:
+            print(f"{result.get('title') or result['video_id']}  {result['url']}")
+            for hit in result["hits"]:
+                position = format_timestamp(hit["start"]) if hit["start"] is not None else hit["kind"]
+                print(f"  [{position}] {hit['text'][:120]}")
+        print(f"{len(results)}개 영상 ({index.last_search_ms:.1f}ms)")
+    if args.stats or not args.query:
+        stats = index.stats()
+        print(f"영상 {stats['videos']:,}개 · 구간 {stats['passages']:,}개 · {stats['bytes'] / 1024 ** 2:.1f}MB")
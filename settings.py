@@ -0,0 +1,111 @@
+import os
+
+# 앱 전역 설정 (환경변수로 재정의 가능)
+
+# 캐시/이력 파일을 저장할 기본 디렉토리
+CACHE_DIR = os.environ.get("YTS_CACHE_DIR", "cache")
+
+# Whisper 처리량(실시간 배율) 이력 파일
+ASR_HISTORY_PATH = os.path.join(CACHE_DIR, "asr_throughput.json")
+
+# 백그라운드 작업 큐 (동시 실행 워커 수, 대기열 최대 깊이, 완료 기록 보관 수)
+JOB_WORKERS = int(os.environ.get("YTS_JOB_WORKERS", "2"))
+JOB_QUEUE_DEPTH = int(os.environ.get("YTS_JOB_QUEUE_DEPTH", "8"))
+JOB_RETENTION = int(os.environ.get("YTS_JOB_RETENTION", "50"))
+
+# 오디오/PCM 디스크 캐시 (용량 초과 시 오래 사용하지 않은 파일부터 삭제)
+AUDIO_CACHE_DIR = os.path.join(CACHE_DIR, "audio")
+AUDIO_CACHE_QUOTA_GB = float(os.environ.get("YTS_AUDIO_CACHE_GB", "5"))
+
+# 음성 구간 검출 (Whisper 전에 무음/비음성 구간 제거, 백엔드: energy | silero)
+VAD_ENABLED = os.environ.get("YTS_VAD", "1") == "1"
+VAD_BACKEND = os.environ.get("YTS_VAD_BACKEND", "energy")
+
+# CPU 병렬 음성 인식 (워커 수 0 = 코어 수의 절반, 세그먼트 길이, 병렬 처리를 시작할 최소 오디오 길이)
+ASR_PARALLEL_WORKERS = int(os.environ.get("YTS_ASR_WORKERS", "0"))
+ASR_SEGMENT_SEC = int(os.environ.get("YTS_ASR_SEGMENT_SEC", "180"))
+ASR_PARALLEL_MIN_SEC = int(os.environ.get("YTS_ASR_PARALLEL_MIN_SEC", "600"))
+
+# 음성 인식 엔진 (auto: CPU 노드는 faster-whisper가 있으면 CTranslate2 int8, 그 외 openai-whisper)
+ASR_BACKEND = os.environ.get("YTS_ASR_BACKEND", "auto")
+ASR_CT2_COMPUTE_TYPE = os.environ.get("YTS_ASR_CT2_COMPUTE_TYPE", "")
+
+# 스트리밍 음성 인식 (ffmpeg로 고정 길이 구간씩 읽어 인식, 메모리 사용량이 오디오 길이와 무관)
+# auto: ASR_STREAMING_MIN_SEC 이상인 오디오만, 1: 항상, 0: 사용 안 함
+ASR_STREAMING = os.environ.get("YTS_ASR_STREAMING", "auto")
+ASR_STREAMING_MIN_SEC = int(os.environ.get("YTS_ASR_STREAMING_MIN_SEC", "1800"))
+ASR_STREAM_WINDOW_SEC = int(os.environ.get("YTS_ASR_STREAM_WINDOW_SEC", "60"))
+
+# 처리 완료 결과(자막/요약) 캐시
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, "results")
+
+# 재생목록/채널 요약 (동시에 처리할 영상 수, 최대 영상 수)
+PLAYLIST_CONCURRENCY = int(os.environ.get("YTS_PLAYLIST_CONCURRENCY", "2"))
+PLAYLIST_MAX_VIDEOS = int(os.environ.get("YTS_PLAYLIST_MAX_VIDEOS", "50"))
+
+# 청크 요약 메모 (같은 청크/프롬프트/모델/디코딩 설정이면 재사용)
+CHUNK_MEMO_PATH = os.path.join(CACHE_DIR, "chunk_memo.sqlite")
+# 보관할 최대 메모 수 (넘으면 가장 오래 사용하지 않은 메모부터 삭제)
+CHUNK_MEMO_MAX_ROWS = int(os.environ.get("YTS_CHUNK_MEMO_MAX_ROWS", "50000"))
+
+# 트리 축소 요약 (묶음당 하위 요약 수, 최종 요약 목표 토큰 수 0 = 모델 기본값, 배치 크기, 동시 실행 스레드 수)
+SUMMARY_FAN_IN = int(os.environ.get("YTS_SUMMARY_FAN_IN", "4"))
+SUMMARY_TARGET_TOKENS = int(os.environ.get("YTS_SUMMARY_TARGET_TOKENS", "0"))
+SUMMARY_BATCH_SIZE = int(os.environ.get("YTS_SUMMARY_BATCH_SIZE", "4"))
+SUMMARY_REDUCE_WORKERS = int(os.environ.get("YTS_SUMMARY_REDUCE_WORKERS", "1"))
+
+# 자동 생성 자막의 반복 구간 제거 (사용 여부, 비교할 직전 단어 수)
+CAPTION_DEDUP_ENABLED = os.environ.get("YTS_CAPTION_DEDUP", "1") == "1"
+CAPTION_DEDUP_WINDOW = int(os.environ.get("YTS_CAPTION_DEDUP_WINDOW", "50"))
+
+# AI 요약 전에 추출 요약 초안을 먼저 표시
+PROGRESSIVE_DRAFT = os.environ.get("YTS_PROGRESSIVE_DRAFT", "1") == "1"
+
+# 결과 저장소가 프로세스 메모리에 보관할 최대 크기 (MB, 초과분은 압축된 디스크 파일에서 다시 읽음)
+RESULT_MEMORY_MB = float(os.environ.get("YTS_RESULT_MEMORY_MB", "256"))
+
+# 서버 시작 시 요약 모델 미리 로드 및 준비 상태 파일 (로드밸런서 헬스 체크용)
+MODEL_WARMUP = os.environ.get("YTS_MODEL_WARMUP", "1") == "1"
+READINESS_PATH = os.path.join(CACHE_DIR, "readiness.json")
+
+# 로컬 모델 스냅샷 저장소 (리비전 고정 + safetensors, 오프라인이면 허브에 접근하지 않음)
+MODEL_STORE_DIR = os.environ.get("YTS_MODEL_STORE_DIR", os.path.join(CACHE_DIR, "models"))
+MODEL_OFFLINE = os.environ.get("YTS_MODEL_OFFLINE", "0") == "1"
+
+# HTTP API 서비스 준비 상태 파일 (Streamlit UI 프로세스와 별도)
+API_READINESS_PATH = os.path.join(CACHE_DIR, "readiness_api.json")
+
+# 분산 작업 큐 (local: Streamlit 프로세스 안에서 실행, sqlite: 단일 호스트 공유, redis: 여러 노드 공유)
+JOB_BACKEND = os.environ.get("YTS_JOB_BACKEND", "local")
+DIST_QUEUE_PATH = os.path.join(CACHE_DIR, "dist_queue.sqlite")
+DIST_REDIS_URL = os.environ.get("YTS_REDIS_URL", "redis://localhost:6379/0")
+DIST_MAX_ATTEMPTS = int(os.environ.get("YTS_DIST_MAX_ATTEMPTS", "3"))
+DIST_LEASE_SEC = int(os.environ.get("YTS_DIST_LEASE_SEC", "60"))
+DIST_HEARTBEAT_SEC = int(os.environ.get("YTS_DIST_HEARTBEAT_SEC", "15"))
+
+# 분산 워커가 처리할 단계 (auto: 코어 수가 기준 이상인 노드만 자막/음성 인식 단계 처리)
+WORKER_STAGES = os.environ.get("YTS_WORKER_STAGES", "auto")
+WORKER_ASR_MIN_CPUS = int(os.environ.get("YTS_WORKER_ASR_MIN_CPUS", "8"))
+
+# 요약 생성 동적 배치 (여러 작업의 청크 요청을 모아 한 번에 generate, 첫 요청 후 최대 대기 시간 ms)
+GEN_BATCH_MAX = int(os.environ.get("YTS_GEN_BATCH_MAX", "8"))
+GEN_BATCH_WAIT_MS = float(os.environ.get("YTS_GEN_BATCH_WAIT_MS", "20"))
+
+# 자막 트랙 선택 언어 우선순위 (수동 → 자동 → 번역 → 다른 언어 자막 순, 모두 없을 때만 음성 인식)
+TRANSCRIPT_LANGUAGES = tuple(
+    code.strip() for code in os.environ.get("YTS_TRANSCRIPT_LANGUAGES", "ko,en").split(",") if code.strip()
+)
+
+# 처리량 보정 프로파일 (모델/청크 크기를 이 머신에서 측정한 속도로 선택, 첫 시작 시 자동 보정 여부)
+CALIBRATION_PATH = os.path.join(CACHE_DIR, "calibration.json")
+CALIBRATE_ON_START = os.environ.get("YTS_CALIBRATE_ON_START", "0") == "1"
+CALIBRATION_MIN_ASR_RTF = float(os.environ.get("YTS_CALIBRATION_MIN_ASR_RTF", "1.0"))
+CALIBRATION_SAMPLE_SEC = int(os.environ.get("YTS_CALIBRATION_SAMPLE_SEC", "60"))
+CALIBRATION_MAX_CANDIDATE_SEC = int(os.environ.get("YTS_CALIBRATION_MAX_CANDIDATE_SEC", "120"))
+
+# 처리한 영상 전문 검색 색인 (SQLite FTS5, 자막 구간 길이 = 검색 결과 한 건의 최대 글자 수)
+SEARCH_INDEX_ENABLED = os.environ.get("YTS_SEARCH_INDEX", "1") == "1"
+SEARCH_INDEX_PATH = os.path.join(CACHE_DIR, "search_index.sqlite")
+SEARCH_PASSAGE_CHARS = int(os.environ.get("YTS_SEARCH_PASSAGE_CHARS", "200"))
+# 관련도 순위를 계산할 최대 일치 구간 수 (자주 나오는 검색어는 가장 최근에 색인된 구간부터)
+SEARCH_MAX_CANDIDATES = int(os.environ.get("YTS_SEARCH_MAX_CANDIDATES", "1000"))
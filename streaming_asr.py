@@ -0,0 +1,94 @@
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from audio_utils import SAMPLE_RATE
+from settings import ASR_PARALLEL_MIN_SEC, ASR_STREAM_WINDOW_SEC, ASR_STREAMING, ASR_STREAMING_MIN_SEC
+
+
+def use_streaming_asr(duration_sec, device=None, pcm_cached=False):
+    """스트리밍 인식 사용 여부 (길이를 모르면 메모리를 위해 스트리밍)
+
+    PCM이 이미 mmap 캐시에 있으면 메모리 부담이 없으므로 VAD/병렬 인식 경로를 그대로 사용하고,
+    CPU 병렬 인식 대상(ASR_PARALLEL_MIN_SEC 이상)은 PCM을 디스크로 나눠 디코딩해 같은 경로를 사용
+    """
+    if pcm_cached or ASR_STREAMING == "0":
+        return False
+    if ASR_STREAMING == "1":
+        return True
+    if duration_sec is None:
+        return True
+    if device == "cpu" and duration_sec >= ASR_PARALLEL_MIN_SEC:
+        return False
+    return duration_sec >= ASR_STREAMING_MIN_SEC
+
+
+class StreamingTranscriber:
+    """고정 길이 구간 단위 음성 인식 (메모리 사용량은 구간 길이에만 비례)
+
+    - 블록을 모아 window_sec 길이가 되면 인식하고, 끝부분 guard_sec 안에서 끝나지 않은 세그먼트는
+      다음 구간 앞에 남겨 다시 인식 (구간 경계에서 단어가 잘리지 않도록)
+    - 앞 구간의 인식 결과 끝부분을 initial_prompt로 넘겨 디코더 문맥을 이어감
+    - 세그먼트는 확정되는 대로 원본 기준 타임스탬프로 반환
+    """
+
+    def __init__(self, backend, window_sec=ASR_STREAM_WINDOW_SEC, guard_sec=2.0, context_chars=200,
+                 sample_rate=SAMPLE_RATE):
+        self.backend = backend
+        self.window = int(window_sec * sample_rate)
+        self.guard_sec = guard_sec
+        self.context_chars = context_chars
+        self.sample_rate = sample_rate
+        self.windows = 0
+        self.peak_buffer_samples = 0
+
+    def transcribe(self, blocks: Iterable[np.ndarray], language=None, total_sec=None,
+                   on_progress: Optional[Callable[[float, float], None]] = None) -> Iterator[dict]:
+        """PCM 블록 스트림 → {"text", "start", "end"} 세그먼트 (확정되는 대로)"""
+        blocks = iter(blocks)
+        buffer = np.zeros(0, dtype=np.float32)
+        buffer_start = 0.0  # buffer[0]의 원본 기준 시각 (초)
+        prompt = ""
+        final = False
+        while True:
+            pending = [buffer]
+            pending_len = len(buffer)
+            while pending_len < self.window and not final:
+                try:
+                    block = next(blocks)
+                except StopIteration:
+                    final = True
+                    break
+                pending.append(block)
+                pending_len += len(block)
+            buffer = np.concatenate(pending) if len(pending) > 1 else buffer
+            if len(buffer) == 0:
+                break
+            self.peak_buffer_samples = max(self.peak_buffer_samples, len(buffer))
+
+            if language is None:
+                language = self.backend.detect_language(buffer[:30 * self.sample_rate])
+            result = self.backend.transcribe(buffer, language=language, initial_prompt=prompt[-self.context_chars:] or None)
+            self.windows += 1
+            segments = [seg for seg in result["segments"] if seg["text"].strip()]
+
+            # 마지막 구간이 아니면 끝부분에 걸친 세그먼트는 다음 구간에서 다시 인식
+            cut = len(buffer)
+            if not final:
+                buffer_sec = len(buffer) / self.sample_rate
+                settled = [seg for seg in segments if seg["end"] <= buffer_sec - self.guard_sec]
+                settled_cut = int(settled[-1]["end"] * self.sample_rate) if settled else 0
+                # 자를 위치가 너무 앞이면 전부 확정 (버퍼가 구간 길이 이상으로 커지지 않도록)
+                if settled_cut >= self.sample_rate:
+                    segments, cut = settled, settled_cut
+
+            for seg in segments:
+                prompt = (prompt + seg["text"])[-self.context_chars:]
+                yield {"text": seg["text"], "start": seg["start"] + buffer_start, "end": seg["end"] + buffer_start}
+
+            buffer = buffer[cut:]
+            buffer_start += cut / self.sample_rate
+            if on_progress:
+                on_progress(buffer_start, total_sec or buffer_start)
+            if final and len(buffer) == 0:
+                break
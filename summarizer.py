@@ -3,14 +3,37 @@ from transformers import pipeline
 import torch
 import re
 from gpu_utils import GPUDetector
+from chunk_memo import ChunkMemo, content_defined_chunks
+from tree_reduce import TreeReducer, format_level_stats
+from settings import SUMMARY_TARGET_TOKENS
+from text_utils import preprocess_text, postprocess_summary
+from model_store import load_seq2seq
+from batch_scheduler import BatchScheduler
+from calibration import calibrated_summary_config, LOAD_MODES
+
+def _notify(log, message, level="info"):
+    """진행 안내 메시지 (작업 워커/워밍업 스레드에서는 st.* 호출이 화면에 표시되지 않으므로 log로 전달)
+
+    log: 메시지를 받는 함수 (job.log 등, 없으면 Streamlit으로 바로 표시)
+    """
+    if log is not None:
+        log(message)
+    else:
+        getattr(st, level)(message)
 
 class Summarizer:
-    def __init__(self):
+    def __init__(self, log=None):
+        self.longt5_model = None
+        self.load_mode = None
+        self.calibrated = False
         self.models = {}
-        self.load_models()
+        self.model_names = {}
+        self.memo = ChunkMemo()
+        self.scheduler = None
+        self.load_models(log)
     
-    def load_models(self):
-        """LongT5 적응형 모델 로드 (VRAM에 따라 최적화)"""
+    def load_models(self, log=None):
+        """LongT5 적응형 모델 로드 (VRAM에 따라 최적화, log: 로딩 안내를 받는 함수)"""
         try:
             # GPU 정보 확인
             detector = GPUDetector()
@@ -20,81 +43,94 @@ class Summarizer:
             device = device_info["device"]
             gpu_name = device_info["gpu_name"]
             
-            st.info(f"🔍 GPU: {gpu_name} ({vram_gb} GB VRAM)")
+            _notify(log, f"🔍 GPU: {gpu_name} ({vram_gb} GB VRAM)")
             
-            # VRAM별 LongT5 로딩 정책
-            if vram_gb >= 12:
-                load_kwargs = {"device_map": "auto"}  # full precision
-                chunk_size = 8000
-                max_new_tokens = 800
-                st.info("🚀 고성능 GPU 감지 - Full Precision 모드")
-            elif vram_gb >= 8:
-                load_kwargs = {"device_map": "auto", "load_in_8bit": True}
-                chunk_size = 4000
-                max_new_tokens = 600
-                st.info("⚡ 중고성능 GPU 감지 - 8bit 양자화 모드")
-            elif vram_gb >= 4:
-                load_kwargs = {"device_map": "auto", "load_in_8bit": True}
-                chunk_size = 2500
-                max_new_tokens = 400
-                st.info("🔧 보급형 GPU 감지 - 8bit 양자화 모드")
-            elif vram_gb >= 2:
-                load_kwargs = {"device_map": "auto", "load_in_4bit": True}
-                chunk_size = 1800
-                max_new_tokens = 300
-                st.info("💾 저사양 GPU 감지 - 4bit 양자화 모드")
+            # 보정 프로파일이 있으면 이 머신에서 측정한 가장 빠른 설정 사용, 없으면 VRAM별 LongT5 로딩 정책
+            calibrated = calibrated_summary_config()
+            if calibrated:
+                load_mode = calibrated["mode"]
+                chunk_size = calibrated["chunk_size"]
+                max_new_tokens = calibrated["max_new_tokens"]
+                _notify(log, f"📏 보정 프로파일 사용 - {calibrated['mode']} 모드 ({calibrated['chars_per_sec']:.0f}자/초 측정)")
             else:
-                # CPU fallback
-                load_kwargs = {"device_map": "cpu"}
-                chunk_size = 1200
-                max_new_tokens = 200
-                st.info("🖥️ CPU 모드 - 최소 설정")
+                if vram_gb >= 12:
+                    load_mode = "full"  # full precision
+                    chunk_size = 8000
+                    max_new_tokens = 800
+                    _notify(log, "🚀 고성능 GPU 감지 - Full Precision 모드")
+                elif vram_gb >= 8:
+                    load_mode = "8bit"
+                    chunk_size = 4000
+                    max_new_tokens = 600
+                    _notify(log, "⚡ 중고성능 GPU 감지 - 8bit 양자화 모드")
+                elif vram_gb >= 4:
+                    load_mode = "8bit"
+                    chunk_size = 2500
+                    max_new_tokens = 400
+                    _notify(log, "🔧 보급형 GPU 감지 - 8bit 양자화 모드")
+                elif vram_gb >= 2:
+                    load_mode = "4bit"
+                    chunk_size = 1800
+                    max_new_tokens = 300
+                    _notify(log, "💾 저사양 GPU 감지 - 4bit 양자화 모드")
+                else:
+                    # CPU fallback
+                    load_mode = "cpu"
+                    chunk_size = 1200
+                    max_new_tokens = 200
+                    _notify(log, "🖥️ CPU 모드 - 최소 설정")
             
-            st.info(f"🧠 설정: chunk_size={chunk_size}, max_new_tokens={max_new_tokens}")
+            load_kwargs = dict(LOAD_MODES[load_mode])
+            _notify(log, f"🧠 설정: chunk_size={chunk_size}, max_new_tokens={max_new_tokens}")
             
             # LongT5 모델 로드
-            st.info("🔄 LongT5 모델 로딩 중...")
-            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-            
-            model_name = "google/long-t5-tglobal-base"
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModelForSeq2SeqLM.from_pretrained(model_name, **load_kwargs)
+            _notify(log, "🔄 LongT5 모델 로딩 중...")
+            # 리비전이 고정된 로컬 스냅샷에서 safetensors를 메모리 매핑으로 로드 (허브 접근 없음)
+            tokenizer, model, pinned_name = load_seq2seq("google/long-t5-tglobal-base", **load_kwargs)
             model.eval()
             
-            # 설정 저장
+            # 설정 저장 (메모 키에는 커밋까지 포함해 리비전이 바뀌면 새로 요약)
             self.longt5_model = model
             self.longt5_tokenizer = tokenizer
+            self.longt5_model_name = pinned_name
             self.device = device
+            self.load_mode = load_mode
+            self.calibrated = bool(calibrated)
+            self.gpu_name = gpu_name
             self.chunk_size = chunk_size
             self.max_new_tokens = max_new_tokens
+            # 모든 작업의 생성 요청은 스케줄러 스레드가 모아서 배치로 실행 (작업마다 따로 generate하지 않음)
+            self.scheduler = BatchScheduler(self._generate_longt5)
             
-            st.success("✅ LongT5 적응형 모델 로드 완료!")
+            _notify(log, "✅ LongT5 적응형 모델 로드 완료!", "success")
             
         except Exception as e:
-            st.error(f"LongT5 모델 로드 실패: {str(e)}")
-            st.info("🔄 BART 모델로 fallback...")
+            _notify(log, f"LongT5 모델 로드 실패: {str(e)}", "error")
+            _notify(log, "🔄 BART 모델로 fallback...")
             # Fallback to BART models
-            self._load_fallback_models()
+            self._load_fallback_models(log)
     
-    def _load_fallback_models(self):
+    def _load_fallback_models(self, log=None):
         """BART 모델 fallback 로딩"""
         try:
             # 한국어용 모델 (KoBART)
-            st.info("한국어 요약 모델 (KoBART) 로딩 중...")
+            _notify(log, "한국어 요약 모델 (KoBART) 로딩 중...")
+            tokenizer, model, self.model_names['ko'] = load_seq2seq("gogamza/kobart-base-v2")
             self.models['ko'] = pipeline(
                 "summarization",
-                model="gogamza/kobart-base-v2",
-                tokenizer="gogamza/kobart-base-v2",
+                model=model,
+                tokenizer=tokenizer,
                 device=-1,
                 max_length=None
             )
             
             # 영어용 모델 (BART-large-cnn)
-            st.info("영어 요약 모델 (BART-large-cnn) 로딩 중...")
+            _notify(log, "영어 요약 모델 (BART-large-cnn) 로딩 중...")
+            tokenizer, model, self.model_names['en'] = load_seq2seq("facebook/bart-large-cnn")
             self.models['en'] = pipeline(
                 "summarization", 
-                model="facebook/bart-large-cnn",
-                tokenizer="facebook/bart-large-cnn",
+                model=model,
+                tokenizer=tokenizer,
                 device=-1,
                 max_length=None
             )
@@ -104,164 +140,195 @@ class Summarizer:
             self.longt5_tokenizer = None
             
         except Exception as e:
-            st.error(f"Fallback 모델 로드 실패: {str(e)}")
+            _notify(log, f"Fallback 모델 로드 실패: {str(e)}", "error")
+    
+    def describe(self):
+        """실제로 로드된 요약 모델 설명 (보정 프로파일/VRAM 정책 중 실제 사용된 로드 방식 기준)"""
+        if self.longt5_model is None:
+            return "BART (CPU)" if self.models else "요약 모델 없음"
+        labels = {"full": "LongT5 Full Precision", "8bit": "LongT5 8bit", "4bit": "LongT5 4bit", "cpu": "LongT5"}
+        where = "CPU" if self.load_mode == "cpu" or self.device == "cpu" else f"GPU: {self.gpu_name}"
+        calibrated = ", 보정 프로파일" if self.calibrated else ""
+        return f"{labels.get(self.load_mode, 'LongT5')} ({where}{calibrated})"
     
-    def summarize_text(self, text, language='en', max_length=None, min_length=None):
-        """LongT5 적응형 텍스트 요약"""
+    def warm_up(self):
+        """짧은 더미 생성으로 첫 요청의 초기화 비용(CUDA 커널, 캐시 할당 등)을 미리 지불 (메모 사용 안 함)"""
+        sample = "This is a short warm-up text. It is used only to initialize the summarization model."
+        if getattr(self, 'longt5_model', None) is not None:
+            self.scheduler.submit([self._longt5_prompt_prefix('en') + sample], self._longt5_generation_params(8))
+            return "longt5"
+        if self.models:
+            for model in self.models.values():
+                model(sample, do_sample=False, truncation=True, max_new_tokens=8, min_length=1)
+            return "bart"
+        raise RuntimeError("로드된 요약 모델이 없습니다")
+    
+    def summarize_text(self, text, language='en', max_length=None, min_length=None, stats=None, decoding=None,
+                       progress=None, memo_stats=None):
+        """LongT5 적응형 텍스트 요약 (stats 목록이 주어지면 트리 요약 단계별 통계를 추가)
+
+        decoding: 시간 예산 계획의 디코딩 설정 (예: {"num_beams": 2})
+        progress: 작업 객체 (작업 워커 스레드에서 실행될 때 안내 메시지를 작업에 기록)
+        memo_stats: 주어지면 이 호출의 청크 메모 재사용/새로 생성 수를 {"hits", "misses"}로 기록
+            (메모는 모든 작업이 공유하므로 다른 작업의 재사용 수가 섞이지 않도록 호출별로 집계)
+        요약에 실패하면 RuntimeError (실패 메시지가 요약 결과로 저장/재사용되지 않도록)
+        """
         if not text.strip():
             return "요약할 텍스트가 없습니다."
         
+        log = progress.log if progress is not None else None
+        memo_stats = memo_stats if memo_stats is not None else {}
+        memo_stats.update(hits=0, misses=0)
         try:
             # 텍스트 전처리
             text = self.preprocess_text(text)
-            st.info(f"전처리된 텍스트 길이: {len(text)}자")
+            _notify(log, f"전처리된 텍스트 길이: {len(text)}자")
             
             # LongT5 사용 가능한지 확인
             if hasattr(self, 'longt5_model') and self.longt5_model is not None:
-                st.info("🚀 LongT5 적응형 요약 시작...")
-                return self._summarize_with_longt5(text, language)
+                _notify(log, "🚀 LongT5 적응형 요약 시작...")
+                return self._summarize_with_longt5(text, language, stats, decoding, log, memo_stats)
             else:
-                st.info("🔄 BART 모델로 요약...")
-                return self._summarize_with_bart(text, language)
+                _notify(log, "🔄 BART 모델로 요약...")
+                return self._summarize_with_bart(text, language, stats, decoding, log, memo_stats)
                 
         except Exception as e:
-            st.error(f"요약 실패: {str(e)}")
-            return f"요약 실패: {str(e)}"
+            _notify(log, f"요약 실패: {str(e)}", "error")
+            raise RuntimeError(f"요약 실패: {str(e)}") from e
     
-    def _summarize_with_longt5(self, text, language):
-        """LongT5 적응형 요약 - 원본 내용 보존 중심"""
+    def _longt5_generation_params(self, max_new_tokens=None, decoding=None):
+        """LongT5 디코딩 설정 (청크 메모 키에 포함)"""
+        params = {
+            "max_new_tokens": max_new_tokens or self.max_new_tokens,
+            "no_repeat_ngram_size": 3,
+            "num_beams": 4,  # 빔 서치로 더 안정적인 결과
+            "early_stopping": True,
+            "do_sample": False,  # 샘플링 비활성화로 일관성 확보
+        }
+        params.update(decoding or {})
+        return params
+    
+    def _generate_longt5(self, prompt_texts, params):
+        """LongT5로 프롬프트 여러 개를 한 배치로 요약 생성 (스케줄러 스레드에서만 호출)"""
         import torch
         
-        # 텍스트가 짧으면 한 번에 요약 (재귀 방지)
-        if len(text) <= self.chunk_size * 1.5:
-            st.info(f"📝 텍스트 길이가 적당하여 한 번에 요약합니다 ({len(text)}자)")
-            return self._summarize_single_chunk(text, language)
+        # 토크나이징 (배치 내 길이가 다르면 패딩)
+        inputs = self.longt5_tokenizer(
+            prompt_texts, 
+            return_tensors="pt", 
+            padding=True,
+            truncation=True, 
+            max_length=4096
+        ).to(self.device)
         
-        # 프롬프트 설정 - 원본 내용 보존 강조
-        if language == 'ko':
-            prompt_prefix = "다음 텍스트의 핵심 내용을 요약해주세요. 원본의 주요 사실과 정보를 그대로 유지하면서 간결하게 정리해주세요:\n\n"
-        else:
-            prompt_prefix = "Summarize the following text. Preserve the main facts and information from the original while keeping it concise:\n\n"
+        # 요약 생성 (일관성을 위해 deterministic 설정)
+        with torch.no_grad():
+            output = self.longt5_model.generate(**inputs, **params)
         
-        # 텍스트를 청크로 분할 (겹치는 부분 추가로 맥락 보존)
-        overlap = self.chunk_size // 4  # 25% 겹침
-        chunks = []
-        for i in range(0, len(text), self.chunk_size - overlap):
-            chunk = text[i:i+self.chunk_size]
-            if chunk.strip():
-                chunks.append(chunk)
+        # 결과 디코딩
+        summaries = self.longt5_tokenizer.batch_decode(output, skip_special_tokens=True)
         
-        st.info(f"📊 총 {len(chunks)}개 청크로 분할됨 (청크 크기: {self.chunk_size}자, 겹침: {overlap}자)")
+        # VRAM 정리
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
         
-        chunk_summaries = []
-        progress_text = st.empty()
-        
-        # 각 청크 요약
-        for i, chunk in enumerate(chunks):
-            progress_text.info(f"🔄 청크 요약 진행 중: {i+1}/{len(chunks)}")
-            
-            try:
-                # 프롬프트와 청크 결합
-                prompt_text = prompt_prefix + chunk
-                
-                # 토크나이징
-                inputs = self.longt5_tokenizer(
-                    prompt_text, 
-                    return_tensors="pt", 
-                    truncation=True, 
-                    max_length=4096
-                ).to(self.device)
-                
-                # 요약 생성 (일관성을 위해 deterministic 설정)
-                with torch.no_grad():
-                    output = self.longt5_model.generate(
-                        **inputs,
-                        max_new_tokens=self.max_new_tokens,
-                        no_repeat_ngram_size=3,
-                        num_beams=4,  # 빔 서치로 더 안정적인 결과
-                        early_stopping=True,
-                        do_sample=False,  # 샘플링 비활성화로 일관성 확보
-                        temperature=1.0  # do_sample=False일 때는 무시됨
-                    )
-                
-                # 결과 디코딩
-                summary = self.longt5_tokenizer.decode(output[0], skip_special_tokens=True)
-                chunk_summaries.append(summary)
-                
-                # VRAM 정리
-                if self.device == "cuda":
-                    torch.cuda.empty_cache()
-                    
-            except Exception as e:
-                st.warning(f"청크 {i+1} 요약 실패: {str(e)}")
-                # 실패시 원본 청크의 일부를 요약으로 사용
-                fallback_summary = chunk[:200] + "..." if len(chunk) > 200 else chunk
-                chunk_summaries.append(fallback_summary)
-        
-        progress_text.success(f"✅ 청크 요약 완료: {len(chunk_summaries)}개 청크 처리됨")
-        
-        # 청크 요약들을 단순히 연결 (재귀 요약 방지)
-        if len(chunk_summaries) > 1:
-            st.info("✅ 청크 요약들을 결합합니다 (재귀 요약 없이 원본 보존)")
-            # 각 청크 요약에 구분자 추가
-            combined_summaries = "\n\n".join([f"[Part {i+1}]\n{summary}" for i, summary in enumerate(chunk_summaries)])
-            return self._postprocess_summary(combined_summaries, language)
-        else:
-            return self._postprocess_summary(chunk_summaries[0], language)
+        return summaries
     
-    def _summarize_single_chunk(self, text, language):
-        """단일 청크 요약"""
-        import torch
-        
-        # 프롬프트 설정
+    def _summarize_longt5_batch(self, chunks, prompt_prefix, max_new_tokens=None, decoding=None, memo_stats=None):
+        """청크 여러 개 요약 (메모에 없는 청크만 스케줄러에 제출해 다른 작업의 청크와 함께 생성)"""
+        params = self._longt5_generation_params(max_new_tokens, decoding)
+        return self._memoized_batch(
+            chunks, prompt_prefix, self.longt5_model_name, params,
+            lambda texts: self.scheduler.submit([prompt_prefix + text for text in texts], params), memo_stats
+        )
+    
+    def _memoized_batch(self, chunks, prompt_prefix, model_name, params, generate, memo_stats=None):
+        """메모에서 찾은 요약은 재사용하고 나머지만 generate(texts)로 생성 후 바로 기록 (memo_stats에 재사용/생성 수 누적)"""
+        keys = [self.memo.make_key(chunk, prompt_prefix, model_name, params) for chunk in chunks]
+        summaries = [self.memo.get(key) for key in keys]
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        if memo_stats is not None:
+            memo_stats["hits"] += len(chunks) - len(missing)
+            memo_stats["misses"] += len(missing)
+        if missing:
+            for i, summary in zip(missing, generate([chunks[i] for i in missing])):
+                self.memo.put(keys[i], summary)
+                summaries[i] = summary
+        return summaries
+    
+    def _longt5_prompt_prefix(self, language):
+        """프롬프트 설정 - 원본 내용 보존 강조"""
         if language == 'ko':
-            prompt = f"다음 텍스트의 핵심 내용을 요약해주세요. 원본의 주요 사실과 정보를 그대로 유지하면서 간결하게 정리해주세요:\n\n{text}"
+            return "다음 텍스트의 핵심 내용을 요약해주세요. 원본의 주요 사실과 정보를 그대로 유지하면서 간결하게 정리해주세요:\n\n"
+        return "Summarize the following text. Preserve the main facts and information from the original while keeping it concise:\n\n"
+    
+    def _longt5_reduce_prefix(self, language):
+        """하위 요약들을 종합하는 프롬프트"""
+        if language == 'ko':
+            return "다음 부분 요약들을 하나로 종합하여 전체 핵심 내용을 간결하게 정리해주세요:\n\n"
+        return "Combine the following partial summaries into one concise summary of the whole content:\n\n"
+    
+    def _run_tree_reduce(self, chunks, summarize_batch, max_input_chars, count_tokens, stats, log=None, memo_stats=None):
+        """트리 축소 요약 실행 후 단계별 통계 기록 (작업에서는 호출한 쪽이 stats로 단계별 통계를 기록)"""
+        reducer = TreeReducer(summarize_batch, max_input_chars=max_input_chars, count_tokens=count_tokens)
+        summary = reducer.reduce(chunks)
+        
+        reused = memo_stats["hits"] if memo_stats is not None else 0
+        _notify(log, f"✅ 트리 요약 완료: {len(reducer.levels)}단계, {reducer.total_seconds():.1f}초 (메모 재사용 {reused}개)",
+                "success")
+        if log is None:
+            for line in format_level_stats(reducer.levels):
+                st.info(f"📈 {line}")
+        if stats is not None:
+            stats.extend(reducer.levels)
+        return summary
+    
+    def _summarize_with_longt5(self, text, language, stats=None, decoding=None, log=None, memo_stats=None):
+        """LongT5 적응형 요약 - 청크 요약을 묶어 다시 요약하는 트리 축소 (최종 길이는 목표 토큰 수 이내)"""
+        if len(text) <= self.chunk_size * 1.5:
+            _notify(log, f"📝 텍스트 길이가 적당하여 한 번에 요약합니다 ({len(text)}자)")
+            chunks = [text]
         else:
-            prompt = f"Summarize the following text. Preserve the main facts and information from the original while keeping it concise:\n\n{text}"
+            # 내용 기반 경계로 청크 분할 (자막 일부가 바뀌어도 나머지 청크 요약은 메모에서 재사용)
+            chunks = content_defined_chunks(text, self.chunk_size)
+            _notify(log, f"📊 총 {len(chunks)}개 청크로 분할됨 (평균 청크 크기: {self.chunk_size}자)")
         
-        try:
-            inputs = self.longt5_tokenizer(
-                prompt,
-                return_tensors="pt",
-                truncation=True,
-                max_length=4096
-            ).to(self.device)
-            
-            with torch.no_grad():
-                output = self.longt5_model.generate(
-                    **inputs,
-                    max_new_tokens=self.max_new_tokens,
-                    no_repeat_ngram_size=3,
-                    num_beams=4,
-                    early_stopping=True,
-                    do_sample=False,
-                    temperature=1.0
-                )
-            
-            summary = self.longt5_tokenizer.decode(output[0], skip_special_tokens=True)
-            
-            if self.device == "cuda":
-                torch.cuda.empty_cache()
-            
-            return self._postprocess_summary(summary, language)
-            
-        except Exception as e:
-            st.error(f"단일 청크 요약 실패: {str(e)}")
-            return text[:1000] + "..."
+        def summarize_batch(texts, level, final):
+            prefix = self._longt5_prompt_prefix(language) if level == 0 else self._longt5_reduce_prefix(language)
+            max_new_tokens = SUMMARY_TARGET_TOKENS if final else None
+            try:
+                return self._summarize_longt5_batch(texts, prefix, max_new_tokens, decoding, memo_stats)
+            except Exception as e:
+                _notify(log, f"배치 요약 실패, 개별 요약으로 재시도: {str(e)}", "warning")
+            summaries = []
+            for text in texts:
+                try:
+                    summaries.extend(self._summarize_longt5_batch([text], prefix, max_new_tokens, decoding, memo_stats))
+                except Exception as e:
+                    _notify(log, f"청크 요약 실패: {str(e)}", "warning")
+                    # 실패시 원본 청크의 일부를 요약으로 사용 (메모에는 기록하지 않음)
+                    summaries.append(text[:200] + "..." if len(text) > 200 else text)
+            return summaries
+        
+        summary = self._run_tree_reduce(
+            chunks, summarize_batch, self.chunk_size,
+            lambda t: len(self.longt5_tokenizer.encode(t)), stats, log, memo_stats
+        )
+        return self._postprocess_summary(summary, language)
     
-    def _summarize_with_bart(self, text, language):
+    def _summarize_with_bart(self, text, language, stats=None, decoding=None, log=None, memo_stats=None):
         """BART 모델 fallback 요약"""
         # 기존 BART 로직 사용
         if len(text) > 2000:
-            st.info("🔄 긴 텍스트 감지 - 청크 단위로 요약 중...")
-            summary = self._summarize_long_text(text, language)
+            _notify(log, "🔄 긴 텍스트 감지 - 청크 단위로 요약 중...")
+            summary = self._summarize_long_text(text, language, stats, decoding, log, memo_stats)
         else:
-            st.info("🔄 전체 텍스트 요약 중...")
-            summary = self._summarize_short_text(text, language)
+            _notify(log, "🔄 전체 텍스트 요약 중...")
+            summary = self._summarize_short_text(text, language, decoding)
         
         return self._postprocess_summary(summary, language)
     
-    def _summarize_short_text(self, text, language):
+    def _summarize_short_text(self, text, language, decoding=None):
         """짧은 텍스트 요약"""
         # 프롬프트 기반 요약을 위한 텍스트 전처리
         if language == 'ko':
@@ -275,86 +342,61 @@ class Summarizer:
             'max_new_tokens': 500,  # 더 긴 요약을 위해 증가
             'min_length': 100     # 더 긴 최소 길이
         }
+        kwargs.update(decoding or {})
         
         summary = self.models[language](prompt_text, **kwargs)
         return summary[0]['summary_text']
     
-    def _summarize_long_text(self, text, language, recursion_depth=0):
-        """긴 텍스트 청크 단위 요약 (재귀 깊이 제한)"""
-        # 재귀 깊이 제한 (무한 루프 방지)
-        if recursion_depth >= 3:
-            st.warning("⚠️ 재귀 깊이 제한에 도달했습니다. 현재 결과를 반환합니다.")
-            return text[:1000] + "..." if len(text) > 1000 else text
-        
-        # 텍스트를 안전한 크기로 분할 (토큰 길이 고려)
-        chunks = self._split_text_safely(text, max_chars=800)  # 800자로 증가하여 더 많은 컨텍스트 유지
-        
-        st.info(f"총 {len(chunks)}개 청크로 분할됨")
-        
-        # 각 청크를 개별적으로 요약 (한줄 진행률 표시)
-        chunk_summaries = []
-        progress_text = st.empty()  # 한줄로 업데이트되는 진행률 표시
-        
-        for i, chunk in enumerate(chunks):
-            if not chunk.strip():
-                continue
-                
-            # 한줄로 진행률 업데이트
-            progress_text.info(f"🔄 청크 요약 진행 중: {i+1}/{len(chunks)}")
-            
-            try:
-                # 프롬프트 기반 청크 요약
-                if language == 'ko':
-                    prompt_chunk = f"다음 텍스트의 핵심 내용을 상세히 요약해주세요. 구체적인 정보와 세부사항을 포함해주세요:\n\n{chunk}"
-                else:
-                    prompt_chunk = f"Summarize the key points of the following text in detail, including specific information:\n\n{chunk}"
-                
-                # 안전한 길이로 요약 (토큰 길이 고려)
-                summary = self.models[language](
-                    prompt_chunk, 
-                    do_sample=False, 
-                    truncation=True,  # 토큰 길이 초과시 자동 자르기
-                    max_new_tokens=300,  # 더 긴 청크 요약을 위해 증가
-                    min_length=80     # 더 긴 최소 길이로 상세한 요약
-                )
-                chunk_summaries.append(summary[0]['summary_text'])
-            except Exception as e:
-                st.warning(f"청크 {i+1} 요약 실패: {str(e)}")
-                # 실패시 원본 청크의 일부를 요약으로 사용
-                fallback_summary = chunk[:150] + "..." if len(chunk) > 150 else chunk
-                chunk_summaries.append(fallback_summary)
-        
-        # 진행률 표시 완료
-        progress_text.success(f"✅ 청크 요약 완료: {len(chunk_summaries)}개 청크 처리됨")
-        
-        # 청크 요약들을 결합
-        combined_summaries = ' '.join(chunk_summaries)
+    def _summarize_bart_batch(self, language, prompt_prefix, chunks, memo_stats=None, **kwargs):
+        """BART 요약 여러 개 (메모에 없는 청크만 파이프라인 배치로 생성)"""
+        def generate(texts):
+            outputs = self.models[language](
+                [prompt_prefix + text for text in texts], batch_size=len(texts), **kwargs
+            )
+            return [output['summary_text'] for output in outputs]
+        return self._memoized_batch(
+            chunks, prompt_prefix, self.model_names.get(language, language), kwargs, generate, memo_stats
+        )
+    
+    def _summarize_long_text(self, text, language, stats=None, decoding=None, log=None, memo_stats=None):
+        """긴 텍스트 트리 축소 요약 (청크 요약 → 묶음 종합 반복, 최종 요약은 한 번만)"""
+        # 내용 기반 경계로 분할 (토큰 길이 고려, 평균 800자)
+        chunks = content_defined_chunks(text, target_size=800)
+        _notify(log, f"총 {len(chunks)}개 청크로 분할됨")
         
-        # 결합된 텍스트가 여전히 길면 재귀적으로 처리 (더 엄격한 조건)
-        if len(combined_summaries) > 2000:  # 1000에서 2000으로 증가
-            st.info("🔄 결합된 텍스트가 길어 재귀 요약 진행...")
-            return self._summarize_long_text(combined_summaries, language, recursion_depth + 1)
+        if language == 'ko':
+            chunk_prefix = "다음 텍스트의 핵심 내용을 상세히 요약해주세요. 구체적인 정보와 세부사항을 포함해주세요:\n\n"
+            final_prefix = "다음 내용들을 종합하여 체계적이고 상세한 최종 요약을 작성해주세요. 주요 내용을 구체적으로 설명하고, 중요한 세부사항을 모두 포함해주세요:\n\n"
         else:
-            # 최종 요약 생성 (안전한 길이로)
-            st.info("🔄 최종 요약 생성 중...")
+            chunk_prefix = "Summarize the key points of the following text in detail, including specific information:\n\n"
+            final_prefix = "Please create a comprehensive and detailed final summary by synthesizing the following content. Include all key points and specific details:\n\n"
+        
+        def summarize_batch(texts, level, final):
+            prefix = chunk_prefix if level == 0 else final_prefix
+            if final:
+                # 최종 요약은 더 길고 상세하게
+                kwargs = {'max_new_tokens': SUMMARY_TARGET_TOKENS or 800, 'min_length': 300}
+            else:
+                kwargs = {'max_new_tokens': 300, 'min_length': 80}
+            kwargs.update(do_sample=False, truncation=True)  # 토큰 길이 초과시 자동 자르기
+            kwargs.update(decoding or {})
             try:
-                # 최종 요약을 위한 프롬프트
-                if language == 'ko':
-                    final_prompt = f"다음 내용들을 종합하여 체계적이고 상세한 최종 요약을 작성해주세요. 주요 내용을 구체적으로 설명하고, 중요한 세부사항을 모두 포함해주세요:\n\n{combined_summaries}"
-                else:
-                    final_prompt = f"Please create a comprehensive and detailed final summary by synthesizing the following content. Include all key points and specific details:\n\n{combined_summaries}"
-                
-                final_summary = self.models[language](
-                    final_prompt, 
-                    do_sample=False, 
-                    truncation=True,  # 토큰 길이 초과시 자동 자르기
-                    max_new_tokens=800,  # 더 큰 값으로 설정하여 상세한 요약
-                    min_length=300    # 더 큰 최소 길이로 상세한 요약 보장
-                )
-                return final_summary[0]['summary_text']
+                return self._summarize_bart_batch(language, prefix, texts, memo_stats, **kwargs)
             except Exception as e:
-                st.warning(f"최종 요약 실패, 청크 요약 결합: {str(e)}")
-                return combined_summaries
+                _notify(log, f"배치 요약 실패, 개별 요약으로 재시도: {str(e)}", "warning")
+            summaries = []
+            for text in texts:
+                try:
+                    summaries.extend(self._summarize_bart_batch(language, prefix, [text], memo_stats, **kwargs))
+                except Exception as e:
+                    _notify(log, f"청크 요약 실패: {str(e)}", "warning")
+                    # 실패시 원본 청크의 일부를 요약으로 사용
+                    summaries.append(text[:150] + "..." if len(text) > 150 else text)
+            return summaries
+        
+        tokenizer = getattr(self.models[language], 'tokenizer', None)
+        count_tokens = (lambda t: len(tokenizer.encode(t))) if tokenizer is not None else None
+        return self._run_tree_reduce(chunks, summarize_batch, 2000, count_tokens, stats, log, memo_stats)
     
     def _split_text_safely(self, text, max_chars=800):
         """텍스트를 안전한 크기로 분할 (토큰 길이 고려)"""
@@ -385,51 +427,11 @@ class Summarizer:
     
     def _postprocess_summary(self, summary, language):
         """요약 후처리 - 구조화된 형태로 개선"""
-        if not summary or len(summary.strip()) < 50:
-            return summary
-        
-        # 문장 단위로 분할
-        sentences = summary.split('. ')
-        if len(sentences) < 3:
-            return summary
-        
-        # 구조화된 요약 생성
-        if language == 'ko':
-            structured_summary = "## 주요 내용\n\n"
-        else:
-            structured_summary = "## Key Points\n\n"
-        
-        # 핵심 문장들을 선별하여 구조화
-        key_sentences = []
-        for i, sentence in enumerate(sentences):
-            if sentence.strip() and len(sentence.strip()) > 20:
-                # 문장 앞에 번호나 불릿 포인트 추가
-                if language == 'ko':
-                    key_sentences.append(f"• {sentence.strip()}")
-                else:
-                    key_sentences.append(f"• {sentence.strip()}")
-        
-        # 최대 8-10개의 핵심 문장만 선택
-        selected_sentences = key_sentences[:min(10, len(key_sentences))]
-        structured_summary += "\n".join(selected_sentences)
-        
-        # 마지막에 전체 요약 추가
-        if language == 'ko':
-            structured_summary += "\n\n## 전체 요약\n\n" + summary
-        else:
-            structured_summary += "\n\n## Overall Summary\n\n" + summary
-        
-        return structured_summary
+        return postprocess_summary(summary, language)
     
     def preprocess_text(self, text):
         """텍스트 전처리"""
-        # 특수 문자 제거
-        text = re.sub(r'[^\w\s가-힣.,!?]', ' ', text)
-        # 연속된 공백 제거
-        text = re.sub(r'\s+', ' ', text)
-        # 연속된 같은 문자 제거 (예: aaaaa -> a)
-        text = re.sub(r'(.)\1{3,}', r'\1', text)
-        return text.strip()
+        return preprocess_text(text)
     
     def split_text(self, text, max_length):
         """긴 텍스트를 청크로 분할"""
@@ -0,0 +1,45 @@
+from caption_dedup import dedup_segments, is_rolling_captions
+
+
+def _texts(segments):
+    return [seg["text"] for seg in dedup_segments(segments)[0]]
+
+
+def test_rolling_overlap_is_stripped():
+    segments = [
+        {"text": "so today we are going", "start": 0.0},
+        {"text": "today we are going to talk about", "start": 2.0},
+        {"text": "to talk about the market", "start": 4.0},
+    ]
+    assert _texts(segments) == ["so today we are going", "to talk about", "the market"]
+
+
+def test_segment_equal_to_previous_tail_is_dropped():
+    segments = [{"text": "welcome back everyone"}, {"text": "back everyone"}, {"text": "let's start"}]
+    texts, stats = dedup_segments(segments)
+    assert [seg["text"] for seg in texts] == ["welcome back everyone", "let's start"]
+    assert stats["segments_dropped"] == 1
+
+
+def test_phrase_repeated_later_is_kept():
+    # 앞에서 나온 말을 나중에 다시 말한 것은 롤링 반복이 아님
+    segments = [
+        {"text": "okay"},
+        {"text": "thank you"},
+        {"text": "so that is the plan"},
+        {"text": "okay"},
+        {"text": "thank you"},
+    ]
+    assert _texts(segments) == ["okay", "thank you", "so that is the plan", "okay", "thank you"]
+
+
+def test_repeated_words_inside_segment_are_kept():
+    segments = [{"text": "no no"}, {"text": "that's not it"}, {"text": "no no no"}]
+    assert _texts(segments) == ["no no", "that's not it", "no no no"]
+
+
+def test_only_auto_generated_captions_are_deduped():
+    assert is_rolling_captions({"kind": "auto", "language": "en", "generated": True})
+    assert not is_rolling_captions({"kind": "manual", "language": "en", "generated": False})
+    assert not is_rolling_captions({"kind": "whisper", "language": None})
+    assert not is_rolling_captions(None)
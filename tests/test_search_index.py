@@ -0,0 +1,54 @@
+import random
+import time
+
+import pytest
+
+from search_index import SearchIndex, build_match_query, ngram_tokens
+
+# 영상 2,000개 × 자막 세그먼트 200개 (자주 나오는 검색어 "market", "금"이 수만 개 구간에 일치)
+VIDEOS = 2000
+SEGMENTS = 200
+TARGET_MS = 10.0
+
+_EN = "the market price rose while investors watched inflation data and the central bank held rates steady".split()
+_KO = "오늘 금 시장 가격이 크게 올랐습니다 투자자들은 금리와 물가 지표를 지켜보고 있습니다 금값 상승세".split()
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    index = SearchIndex(str(tmp_path_factory.mktemp("search") / "index.sqlite"))
+    rnd = random.Random(0)
+    for v in range(VIDEOS):
+        words = _EN if v % 2 else _KO
+        segments = [{"text": " ".join(rnd.choice(words) for _ in range(8)), "start": i * 3.0} for i in range(SEGMENTS)]
+        summary = " ".join(rnd.choice(words) for _ in range(40))
+        index.add_video(f"vid{v:05d}", summary, segments, title=f"영상 {v}")
+    return index
+
+
+def test_korean_bigrams():
+    assert ngram_tokens("경제가 Market") == ["경제", "제가", "market"]
+    assert build_match_query("금") == '"금"*'
+    assert build_match_query("경제 market") == '"경제" AND "market"'
+
+
+def test_timestamped_hits(tmp_path):
+    index = SearchIndex(str(tmp_path / "index.sqlite"))
+    index.add_video("abc", "금리 인상 요약", [{"text": "중앙은행이 금리를 올렸습니다", "start": 65.0}], title="경제 뉴스")
+    results = index.search("금리")
+    assert [result["video_id"] for result in results] == ["abc"]
+    starts = {hit["start"] for hit in results[0]["hits"]}
+    assert 65.0 in starts
+    transcript_hit = next(hit for hit in results[0]["hits"] if hit["start"] == 65.0)
+    assert transcript_hit["url"].endswith("&t=65s")
+
+
+@pytest.mark.parametrize("query", ["market", "금", "inflation data", "금리"])
+def test_frequent_term_latency(corpus, query):
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        results = corpus.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    assert len(results) == 20
+    assert min(timings) < TARGET_MS, f"{query}: {min(timings):.1f}ms"
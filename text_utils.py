@@ -0,0 +1,53 @@
+import re
+
+# 모델 없이 쓰는 텍스트 전처리/후처리 (torch/transformers를 불러오지 않는 요약 경로에서도 공유)
+
+
+def preprocess_text(text):
+    """텍스트 전처리"""
+    # 특수 문자 제거
+    text = re.sub(r'[^\w\s가-힣.,!?]', ' ', text)
+    # 연속된 공백 제거
+    text = re.sub(r'\s+', ' ', text)
+    # 연속된 같은 문자 제거 (예: aaaaa -> a)
+    text = re.sub(r'(.)\1{3,}', r'\1', text)
+    return text.strip()
+
+
+def postprocess_summary(summary, language):
+    """요약 후처리 - 구조화된 형태로 개선"""
+    if not summary or len(summary.strip()) < 50:
+        return summary
+    
+    # 문장 단위로 분할
+    sentences = summary.split('. ')
+    if len(sentences) < 3:
+        return summary
+    
+    # 구조화된 요약 생성
+    if language == 'ko':
+        structured_summary = "## 주요 내용\n\n"
+    else:
+        structured_summary = "## Key Points\n\n"
+    
+    # 핵심 문장들을 선별하여 구조화
+    key_sentences = []
+    for i, sentence in enumerate(sentences):
+        if sentence.strip() and len(sentence.strip()) > 20:
+            # 문장 앞에 번호나 불릿 포인트 추가
+            if language == 'ko':
+                key_sentences.append(f"• {sentence.strip()}")
+            else:
+                key_sentences.append(f"• {sentence.strip()}")
+    
+    # 최대 8-10개의 핵심 문장만 선택
+    selected_sentences = key_sentences[:min(10, len(key_sentences))]
+    structured_summary += "\n".join(selected_sentences)
+    
+    # 마지막에 전체 요약 추가
+    if language == 'ko':
+        structured_summary += "\n\n## 전체 요약\n\n" + summary
+    else:
+        structured_summary += "\n\n## Overall Summary\n\n" + summary
+    
+    return structured_summary
@@ -0,0 +1,127 @@
+from youtube_transcript_api import YouTubeTranscriptApi, CouldNotRetrieveTranscript
+
+from settings import TRANSCRIPT_LANGUAGES
+
+# 자막 출처 (우선순위 순, Whisper 음성 인식은 모든 자막 트랙이 실패한 경우에만)
+SOURCE_MANUAL = "manual"
+SOURCE_AUTO = "auto"
+SOURCE_TRANSLATED = "translated"
+SOURCE_OTHER = "other"
+SOURCE_WHISPER = "whisper"
+
+SOURCE_LABELS = {
+    SOURCE_MANUAL: "수동 자막",
+    SOURCE_AUTO: "자동 생성 자막",
+    SOURCE_TRANSLATED: "번역 자막",
+    SOURCE_OTHER: "다른 언어 자막",
+    SOURCE_WHISPER: "Whisper 음성 인식",
+}
+
+
+class TranscriptCandidate:
+    """자막 트랙 후보 (translate_to가 있으면 해당 언어로 번역해서 가져옴)"""
+
+    def __init__(self, kind, transcript, translate_to=None):
+        self.kind = kind
+        self.transcript = transcript
+        self.translate_to = translate_to
+
+    @property
+    def language(self):
+        return self.translate_to or self.transcript.language_code
+
+    def fetch(self):
+        transcript = self.transcript.translate(self.translate_to) if self.translate_to else self.transcript
+        return normalize_segments(transcript.fetch())
+
+    def source(self):
+        """결과에 기록할 자막 출처"""
+        source = {"kind": self.kind, "language": self.language, "generated": bool(self.transcript.is_generated)}
+        if self.translate_to:
+            source["from_language"] = self.transcript.language_code
+        return source
+
+
+def _language_codes(transcript):
+    """번역 가능한 언어 코드 (구버전은 dict, 1.x는 객체 목록)"""
+    codes = set()
+    for language in getattr(transcript, "translation_languages", None) or []:
+        code = language["language_code"] if isinstance(language, dict) else getattr(language, "language_code", None)
+        if code:
+            codes.add(code)
+    return codes
+
+
+def normalize_segments(raw):
+    """자막 스니펫(dict 또는 객체)을 {"text", "start", "duration"} 세그먼트 목록으로 변환"""
+    segments = []
+    for item in raw:
+        if isinstance(item, dict):
+            text, start, duration = item.get("text"), item.get("start", 0), item.get("duration", 0)
+        else:
+            text, start, duration = item.text, getattr(item, "start", 0), getattr(item, "duration", 0)
+        if text:
+            segments.append({"text": text, "start": start, "duration": duration})
+    return segments
+
+
+def plan_transcript_sources(transcripts, languages=TRANSCRIPT_LANGUAGES):
+    """사용 가능한 자막 트랙을 우선순위대로 정렬
+
+    대상 언어(languages 순서)마다 1) 수동 자막 → 2) 자동 자막, 그다음 3) 대상 언어로 번역한 자막 → 4) 아무 언어 자막
+    (번역/다른 언어 단계에서는 수동 자막 우선)
+    """
+    transcripts = list(transcripts)
+    manual = [t for t in transcripts if not t.is_generated]
+    generated = [t for t in transcripts if t.is_generated]
+    plan = []
+
+    for language in languages:
+        plan += [TranscriptCandidate(SOURCE_MANUAL, t) for t in manual if t.language_code == language]
+        plan += [TranscriptCandidate(SOURCE_AUTO, t) for t in generated if t.language_code == language]
+
+    # 대상 언어 트랙이 없으면 번역 (번역 원본도 수동 자막 우선)
+    for language in languages:
+        for transcript in manual + generated:
+            if transcript.language_code not in languages and getattr(transcript, "is_translatable", False) \
+                    and language in _language_codes(transcript):
+                plan.append(TranscriptCandidate(SOURCE_TRANSLATED, transcript, translate_to=language))
+
+    plan += [TranscriptCandidate(SOURCE_OTHER, t) for t in manual + generated if t.language_code not in languages]
+    return plan
+
+
+def fetch_best_transcript(video_id, languages=TRANSCRIPT_LANGUAGES, api=None, log=None):
+    """자막 트랙 목록을 한 번 조회해 우선순위대로 가져옴
+
+    반환: (세그먼트 목록, 출처) - 가져올 수 있는 자막이 없으면 (None, None)
+    api는 list(video_id)를 제공하는 객체 (기본: YouTubeTranscriptApi, 테스트에서는 대체 가능)
+    """
+    api = api or YouTubeTranscriptApi()
+    try:
+        transcripts = api.list(video_id)
+    except CouldNotRetrieveTranscript:
+        return None, None
+
+    for candidate in plan_transcript_sources(transcripts, languages):
+        try:
+            segments = candidate.fetch()
+        except CouldNotRetrieveTranscript as e:
+            if log:
+                log(f"{describe_source(candidate.source())} 가져오기 실패: {e}")
+            continue
+        if segments:
+            return segments, candidate.source()
+    return None, None
+
+
+def describe_source(source):
+    """자막 출처 설명 문자열 (예: "번역 자막 (ja → ko)")"""
+    if not source:
+        return "알 수 없음"
+    label = SOURCE_LABELS.get(source["kind"], source["kind"])
+    if source.get("from_language"):
+        return f"{label} ({source['from_language']} → {source['language']})"
+    if source.get("language"):
+        return f"{label} ({source['language']})"
+    return label
@@ -0,0 +1,105 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from settings import SUMMARY_FAN_IN, SUMMARY_BATCH_SIZE, SUMMARY_REDUCE_WORKERS
+
+
+def _count_words(text):
+    return len(text.split())
+
+
+def group_nodes(nodes, fan_in, max_chars, separator="\n\n"):
+    """인접한 노드를 최대 fan_in개, 합친 길이 max_chars 이하로 묶음"""
+    groups = []
+    current = []
+    size = 0
+    for node in nodes:
+        extra = len(node) + (len(separator) if current else 0)
+        if current and (len(current) >= fan_in or size + extra > max_chars):
+            groups.append(current)
+            current = []
+            extra = len(node)
+            size = 0
+        current.append(node)
+        size += extra
+    if current:
+        groups.append(current)
+    # 노드가 길어 하나도 합쳐지지 않으면 길이 제한을 무시하고 fan_in개씩 묶음 (단계마다 노드 수가 반드시 줄어들도록)
+    if len(groups) == len(nodes) and len(nodes) > 1:
+        groups = [nodes[i:i + fan_in] for i in range(0, len(nodes), fan_in)]
+    return groups
+
+
+class TreeReducer:
+    """청크 요약 → 묶음 요약을 반복해 하나의 요약으로 줄이는 트리 축소 요약
+
+    summarize_batch(texts, level, final): 텍스트 목록을 요약한 목록 반환
+      - level 0은 원문 청크, 1 이상은 하위 요약을 묶은 텍스트
+      - final=True이면 최종 요약 (목표 길이로 생성)
+    같은 단계의 노드는 batch_size개씩 묶어 workers개 스레드에서 동시에 요약하며,
+    단계별 노드 수/토큰 수/소요 시간은 levels에 기록됨
+    """
+
+    def __init__(self, summarize_batch: Callable[[List[str], int, bool], List[str]],
+                 fan_in=SUMMARY_FAN_IN, max_input_chars=4000, batch_size=SUMMARY_BATCH_SIZE,
+                 workers=SUMMARY_REDUCE_WORKERS, count_tokens=None, max_levels=8, separator="\n\n"):
+        self.summarize_batch = summarize_batch
+        self.fan_in = max(2, fan_in)
+        self.max_input_chars = max_input_chars
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.count_tokens = count_tokens or _count_words
+        self.max_levels = max(1, max_levels)
+        self.separator = separator
+        self.levels = []
+
+    def _run_level(self, level, inputs, final):
+        start = time.time()
+        batches = [inputs[i:i + self.batch_size] for i in range(0, len(inputs), self.batch_size)]
+        if self.workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+                results = list(pool.map(lambda batch: self.summarize_batch(batch, level, final), batches))
+        else:
+            results = [self.summarize_batch(batch, level, final) for batch in batches]
+        outputs = [summary for batch in results for summary in batch]
+
+        self.levels.append({
+            "level": level,
+            "nodes_in": len(inputs),
+            "nodes_out": len(outputs),
+            "input_tokens": sum(self.count_tokens(text) for text in inputs),
+            "output_tokens": sum(self.count_tokens(text) for text in outputs),
+            "seconds": time.time() - start,
+        })
+        return outputs
+
+    def reduce(self, chunks) -> str:
+        """청크 목록을 하나의 요약으로 축소"""
+        self.levels = []
+        chunks = [chunk for chunk in chunks if chunk.strip()]
+        if not chunks:
+            return ""
+
+        nodes = self._run_level(0, chunks, final=len(chunks) == 1)
+        while len(nodes) > 1:
+            level = len(self.levels)
+            if level >= self.max_levels - 1:
+                groups = [nodes]  # 단계 제한에 도달하면 남은 노드를 한 번에 종합
+            else:
+                groups = group_nodes(nodes, self.fan_in, self.max_input_chars, self.separator)
+            inputs = [self.separator.join(group) for group in groups]
+            nodes = self._run_level(level, inputs, final=len(inputs) == 1)
+        return nodes[0]
+
+    def total_seconds(self):
+        return sum(stats["seconds"] for stats in self.levels)
+
+
+def format_level_stats(levels):
+    """단계별 통계를 한 줄씩 설명하는 문자열 목록"""
+    return [
+        f"단계 {stats['level']}: 노드 {stats['nodes_in']}→{stats['nodes_out']}, "
+        f"토큰 {stats['input_tokens']:,}→{stats['output_tokens']:,}, {stats['seconds']:.1f}초"
+        for stats in levels
+    ]
@@ -0,0 +1,155 @@
+import bisect
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from audio_utils import SAMPLE_RATE
+from settings import VAD_BACKEND
+
+# 음성 구간 (시작 샘플, 끝 샘플)
+Region = Tuple[int, int]
+
+
+def frame_features(audio, sample_rate=SAMPLE_RATE, frame_ms=30, block_frames=20000):
+    """프레임별 에너지(dB)와 zero-crossing rate (NumPy 벡터 연산, 블록 단위로 메모리 제한)"""
+    frame_len = int(sample_rate * frame_ms / 1000)
+    n_frames = len(audio) // frame_len
+    energy_db = np.empty(n_frames)
+    zcr = np.empty(n_frames)
+    for i in range(0, n_frames, block_frames):
+        j = min(i + block_frames, n_frames)
+        frames = np.asarray(audio[i * frame_len:j * frame_len], dtype=np.float32).reshape(j - i, frame_len)
+        energy_db[i:j] = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr[i:j] = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy_db, zcr, frame_len
+
+
+def _mask_to_regions(mask):
+    """True 프레임 연속 구간을 (시작, 끝) 프레임 목록으로 변환"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2], edges[1::2]))
+
+
+class EnergyVAD:
+    """에너지/ZCR 기반 경량 음성 구간 검출 (모델 불필요)"""
+
+    def __init__(self, frame_ms=30, energy_margin_db=10.0, max_zcr=0.35,
+                 min_speech_ms=250, min_silence_ms=600, pad_ms=200):
+        self.frame_ms = frame_ms
+        self.energy_margin_db = energy_margin_db
+        self.max_zcr = max_zcr
+        self.min_speech_ms = min_speech_ms
+        self.min_silence_ms = min_silence_ms
+        self.pad_ms = pad_ms
+
+    def __call__(self, audio, sample_rate=SAMPLE_RATE) -> List[Region]:
+        energy_db, zcr, frame_len = frame_features(audio, sample_rate, self.frame_ms)
+        if len(energy_db) == 0:
+            return [(0, len(audio))] if len(audio) else []
+
+        # 잡음 바닥(하위 10%) 대비 충분히 크고, 치찰음/잡음 수준의 ZCR이 아닌 프레임을 음성으로 판단
+        noise_floor = np.percentile(energy_db, 10)
+        mask = (energy_db > noise_floor + self.energy_margin_db) & (zcr < self.max_zcr)
+
+        # 짧은 무음은 메우고 짧은 음성은 버림
+        min_silence = max(1, self.min_silence_ms // self.frame_ms)
+        min_speech = max(1, self.min_speech_ms // self.frame_ms)
+        for start, end in _mask_to_regions(~mask):
+            if end - start < min_silence and start > 0 and end < len(mask):
+                mask[start:end] = True
+        pad = int(sample_rate * self.pad_ms / 1000)
+        regions = []
+        for start, end in _mask_to_regions(mask):
+            if end - start < min_speech:
+                continue
+            s = max(0, start * frame_len - pad)
+            e = min(len(audio), end * frame_len + pad)
+            if regions and s <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], int(e))
+            else:
+                regions.append((int(s), int(e)))
+        return regions
+
+
+class SileroVAD:
+    """Silero 모델 기반 음성 구간 검출 (torch.hub, 선택 사항)"""
+
+    def __init__(self, pad_ms=200):
+        import torch
+        self.torch = torch
+        self.model, utils = torch.hub.load("snakers4/silero-vad", "silero_vad", trust_repo=True)
+        self.get_speech_timestamps = utils[0]
+        self.pad_ms = pad_ms
+
+    def __call__(self, audio, sample_rate=SAMPLE_RATE) -> List[Region]:
+        timestamps = self.get_speech_timestamps(
+            self.torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32)),
+            self.model,
+            sampling_rate=sample_rate,
+            speech_pad_ms=self.pad_ms,
+        )
+        return [(int(t["start"]), int(t["end"])) for t in timestamps]
+
+
+VAD_BACKENDS = {
+    "energy": EnergyVAD,
+    "silero": SileroVAD,
+}
+
+
+def get_vad(name: str = VAD_BACKEND) -> Callable:
+    """이름으로 VAD 생성 (모델 기반 VAD 로드 실패 시 에너지 기반으로 대체)"""
+    try:
+        return VAD_BACKENDS[name]()
+    except Exception:
+        return EnergyVAD()
+
+
+class SpeechTimeline:
+    """잘라낸 음성 오디오의 시간 ↔ 원본 시간 매핑"""
+
+    def __init__(self, regions: List[Region], sample_rate=SAMPLE_RATE):
+        self.regions = regions
+        self.sample_rate = sample_rate
+        # 잘라낸 오디오에서 각 구간이 시작하는 위치 (샘플)
+        self.offsets = []
+        total = 0
+        for start, end in regions:
+            self.offsets.append(total)
+            total += end - start
+        self.speech_samples = total
+
+    @property
+    def speech_sec(self) -> float:
+        return self.speech_samples / self.sample_rate
+
+    def to_original(self, t: float) -> float:
+        """잘라낸 오디오의 시각(초)을 원본 시각(초)으로 변환"""
+        if not self.regions:
+            return t
+        sample = int(round(t * self.sample_rate))
+        i = max(0, bisect.bisect_right(self.offsets, sample) - 1)
+        start, end = self.regions[i]
+        return min(start + sample - self.offsets[i], end) / self.sample_rate
+
+    def map_segments(self, segments):
+        """Whisper 세그먼트의 start/end를 원본 타임라인으로 변환"""
+        mapped = []
+        for seg in segments:
+            seg = dict(seg)
+            seg["start"] = self.to_original(seg["start"])
+            seg["end"] = self.to_original(seg["end"])
+            mapped.append(seg)
+        return mapped
+
+
+def trim_non_speech(audio, detector=None, sample_rate=SAMPLE_RATE):
+    """음성 구간만 이어붙인 오디오와 타임라인 반환"""
+    detector = detector or get_vad()
+    regions = detector(audio, sample_rate)
+    if not regions:
+        return np.zeros(0, dtype=np.float32), SpeechTimeline([], sample_rate)
+    speech = np.concatenate([np.asarray(audio[s:e], dtype=np.float32) for s, e in regions])
+    return speech, SpeechTimeline(regions, sample_rate)
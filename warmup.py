@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+from settings import READINESS_PATH, CALIBRATE_ON_START
+
+# 준비 상태
+LOADING = "loading"
+READY = "ready"
+DEGRADED = "degraded"  # 요약은 가능하지만 기본 모델이 아님 (BART fallback) 또는 모델 없이 추출 요약만 가능
+
+
+class ModelWarmup:
+    """서버 시작 시 백그라운드 스레드에서 요약 모델 로드 + 더미 생성
+
+    상태는 UI에서 읽고, READINESS_PATH 파일에도 기록해 외부 헬스 체크가 사용할 수 있게 함
+    (`python warmup.py --check`: ready이면 종료 코드 0)
+    """
+
+    def __init__(self, readiness_path=READINESS_PATH):
+        self.readiness_path = readiness_path
+        self.state = LOADING
+        self.detail = "대기 중"
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+
+    def start(self):
+        """워밍업 스레드 시작 (이미 시작했으면 무시)"""
+        if self._thread is None:
+            self.started_at = time.time()
+            self._write()
+            self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        # 작업 큐와 같은 프로세스 전역 모델을 로드 (워밍업 중 들어온 요청은 로드 완료를 기다림)
+        from pipeline import get_models
+        try:
+            if CALIBRATE_ON_START:
+                from calibration import load_profile, run_calibration
+                if load_profile() is None:
+                    # 첫 시작: 모델을 고르기 전에 이 머신의 처리량 측정 (수 분 소요)
+                    self._set(LOADING, "하드웨어 처리량 보정 중...")
+                    run_calibration(log=lambda message: self._set(LOADING, message))
+            self._set(LOADING, "요약 모델 로딩 중...")
+            summarizer, _ = get_models(log=lambda message: self._set(LOADING, message))
+            self._set(LOADING, "첫 추론 워밍업 중...")
+            backend = summarizer.warm_up()
+            if backend == "longt5":
+                self._set(READY, "LongT5 준비 완료")
+            else:
+                self._set(DEGRADED, "LongT5 로드 실패 - BART로 요약합니다")
+        except Exception as e:
+            self.error = str(e)
+            self._set(DEGRADED, "요약 모델을 사용할 수 없습니다 - 빠른 요약(추출)만 가능합니다")
+        finally:
+            self.finished_at = time.time()
+            self._write()
+
+    def _set(self, state, detail):
+        self.state = state
+        self.detail = detail
+        self._write()
+
+    @property
+    def elapsed(self):
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def status(self):
+        return {
+            "state": self.state,
+            "detail": self.detail,
+            "error": self.error,
+            "elapsed_sec": round(self.elapsed, 1),
+            "pid": os.getpid(),
+            "updated_at": time.time(),
+        }
+
+    def _write(self):
+        """준비 상태 파일 갱신 (헬스 체크는 이 파일만 읽음)"""
+        try:
+            os.makedirs(os.path.dirname(self.readiness_path) or ".", exist_ok=True)
+            tmp_path = f"{self.readiness_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.status(), f, ensure_ascii=False)
+            os.replace(tmp_path, self.readiness_path)
+        except OSError:
+            pass
+
+
+def read_readiness(path=READINESS_PATH):
+    """준비 상태 파일 읽기 (없으면 loading)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"state": LOADING, "detail": "준비 상태 파일 없음"}
+
+
+if __name__ == "__main__":
+    # 헬스 체크: python warmup.py --check [--allow-degraded]
+    status = read_readiness()
+    print(json.dumps(status, ensure_ascii=False))
+    if "--check" in sys.argv:
+        healthy = {READY, DEGRADED} if "--allow-degraded" in sys.argv else {READY}
+        sys.exit(0 if status.get("state") in healthy else 1)
@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import socket
+import time
+import uuid
+
+from dist_queue import (get_lease_queue, Heartbeat, LeaseLostError, STAGES, STAGE_TRANSCRIPT, STAGE_SUMMARY)
+from settings import (JOB_BACKEND, DIST_LEASE_SEC, DIST_HEARTBEAT_SEC, WORKER_STAGES, WORKER_ASR_MIN_CPUS)
+
+# 분산 워커: 공유 큐에서 단계별 작업을 임대해 처리 (여러 노드에서 실행)
+# 실행: python worker.py --backend redis --stages transcript,summary
+
+
+def budget_seconds(value):
+    """--budget 인자 검증 (1 ~ MAX_BUDGET_SEC초)"""
+    from deadline_planner import MAX_BUDGET_SEC
+    budget = int(value)
+    if not 0 < budget <= MAX_BUDGET_SEC:
+        raise argparse.ArgumentTypeError(f"시간 예산은 1~{MAX_BUDGET_SEC}초여야 합니다")
+    return budget
+
+
+def default_stages():
+    """이 노드가 처리할 단계 (auto: 코어가 충분한 노드만 자막/음성 인식 단계를 맡음)"""
+    if WORKER_STAGES != "auto":
+        return [stage.strip() for stage in WORKER_STAGES.split(",") if stage.strip()]
+    stages = [STAGE_SUMMARY]
+    if (os.cpu_count() or 1) >= WORKER_ASR_MIN_CPUS:
+        stages.insert(0, STAGE_TRANSCRIPT)
+    return stages
+
+
+def enqueue_summary(queue, url, target_lang, mode, budget_sec=None):
+    """영상 요약 작업을 공유 큐에 등록 (같은 영상/언어/방식/예산이 진행 중이면 그 작업 ID)
+
+    시간 예산은 등록 시점부터 계산하지 않고 요약을 시작한 워커에서 계산함 (큐 대기 시간 제외)
+    """
+    from pipeline import job_key, summary_config
+    from youtube_utils import extract_video_id
+
+    video_id = extract_video_id(url)
+    if not video_id:
+        raise ValueError("유효하지 않은 유튜브 URL입니다.")
+    key = json.dumps(job_key(video_id, target_lang, summary_config(mode, budget_sec)))
+    payload = {"video_id": video_id, "url": url, "language": target_lang, "mode": mode, "budget_sec": budget_sec}
+    return queue.enqueue(STAGE_TRANSCRIPT, payload, key=key)
+
+
+class _LeaseProgress:
+    """파이프라인 진행 상황을 하트비트로 공유 큐에 전달 (Job과 같은 update/log 인터페이스)"""
+
+    # 요약 초안은 공유 큐로 전달하지 않으므로 만들지 않음
+    wants_draft = False
+
+    def __init__(self, heartbeat):
+        self.heartbeat = heartbeat
+
+    def update(self, stage, progress=None):
+        self.heartbeat.message = stage
+        if progress is not None:
+            self.heartbeat.progress = progress
+
+    def log(self, message):
+        self.heartbeat.message = message
+
+
+def store_dist_result(result):
+    """공유 큐 작업 결과(요약 본문 포함)를 이 노드의 결과 저장소에 기록하고 세션용 핸들 반환
+
+    결과 저장소는 노드마다 따로 있으므로 요약한 워커의 저장소를 읽지 않고 큐로 받은 본문을 사용
+    """
+    from pipeline import result_store
+    result = dict(result)
+    key = result.pop("key")
+    result_store.put_result(key, result)
+    return result_store.handle(key)
+
+
+def _run_transcript_stage(job, progress):
+    """자막/음성 추출 후 자막 세그먼트와 출처를 작업 데이터에 담아 요약 단계로 넘김 (노드 간 저장소 공유 불필요)
+
+    시간 예산이 있으면 예산 안에 끝나도록 Whisper 모델을 고르고, 쓴 시간과 계획을 요약 단계로 넘김
+    """
+    from pipeline import load_transcript, transcript_source
+    from deadline_planner import DeadlinePlanner
+    payload = dict(job.payload)
+    planner = DeadlinePlanner(payload["budget_sec"], payload["mode"]) if payload.get("budget_sec") else None
+    progress.update("자막/음성 추출 중...", 30)
+    transcript_data = load_transcript(payload["video_id"], payload["url"], planner.choose_asr_model if planner else None,
+                                      progress)
+    if not transcript_data:
+        raise RuntimeError("자막/음성 추출에 실패했습니다.")
+    payload["transcript"] = transcript_data
+    payload["transcript_source"] = transcript_source(payload["video_id"])
+    if planner:
+        payload["budget_spent_sec"] = planner.elapsed
+        payload["asr_plan"] = planner.asr_plan
+    return STAGE_SUMMARY, payload
+
+
+def _run_summary_stage(job, progress):
+    """자막 단계가 넘긴 자막으로 요약 (자막이 없으면 음성 인식을 다시 하지 않고 실패), 결과 본문을 완료 결과로 반환"""
+    from pipeline import summarize_video, result_store
+    from deadline_planner import DeadlinePlanner
+    payload = job.payload
+    if not payload.get("transcript"):
+        raise RuntimeError("자막 단계 결과가 작업 데이터에 없습니다.")
+    planner = None
+    if payload.get("budget_sec"):
+        # 자막 단계에서 쓴 시간을 빼고 이어서 계획 (큐 대기 시간은 제외)
+        planner = DeadlinePlanner(payload["budget_sec"], payload["mode"], spent_sec=payload.get("budget_spent_sec", 0.0),
+                                  asr_plan=payload.get("asr_plan"))
+    key = summarize_video(progress, payload["video_id"], payload["url"], payload["language"], payload["mode"],
+                          payload.get("budget_sec"), planner=planner,
+                          transcript=(payload["transcript"], payload.get("transcript_source")))
+    return None, dict(result_store.get_result(key), key=key, transcript_text=result_store.get_transcript_text(key))
+
+
+STAGE_HANDLERS = {
+    STAGE_TRANSCRIPT: _run_transcript_stage,
+    STAGE_SUMMARY: _run_summary_stage,
+}
+
+
+class Worker:
+    """임대 → 실행(하트비트로 임대 연장) → 다음 단계로 넘기기/완료/실패(재시도) 반복"""
+
+    def __init__(self, queue, stages, worker_id=None, lease_sec=DIST_LEASE_SEC,
+                 heartbeat_sec=DIST_HEARTBEAT_SEC, poll_sec=1.0):
+        self.queue = queue
+        self.stages = list(stages)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_sec = lease_sec
+        self.heartbeat_sec = heartbeat_sec
+        self.poll_sec = poll_sec
+        self.processed = 0
+
+    def run_once(self):
+        """작업 1건 처리 (없으면 False)"""
+        job = self.queue.lease(self.worker_id, self.stages, self.lease_sec)
+        if job is None:
+            return False
+        print(f"[{self.worker_id}] {job.id} {job.stage} 시작 (시도 {job.attempts}/{job.max_attempts})")
+        try:
+            with Heartbeat(self.queue, job.id, self.worker_id, self.lease_sec, self.heartbeat_sec) as heartbeat:
+                try:
+                    next_stage, output = STAGE_HANDLERS[job.stage](job, _LeaseProgress(heartbeat))
+                except Exception as e:
+                    if not heartbeat.lost:
+                        retry = self.queue.fail(job.id, self.worker_id, str(e))
+                        print(f"[{self.worker_id}] {job.id} 실패{' - 재시도 대기' if retry else ''}: {e}")
+                    return True
+            if heartbeat.lost:
+                print(f"[{self.worker_id}] {job.id} 임대 만료 - 다른 워커가 처리하므로 결과 폐기")
+                return True
+            if next_stage:
+                self.queue.advance(job.id, self.worker_id, next_stage, output)
+            else:
+                self.queue.complete(job.id, self.worker_id, output)
+            print(f"[{self.worker_id}] {job.id} {job.stage} 완료")
+        except LeaseLostError:
+            print(f"[{self.worker_id}] {job.id} 임대 만료 - 결과 폐기")
+        self.processed += 1
+        return True
+
+    def run_forever(self):
+        print(f"[{self.worker_id}] 워커 시작 (단계: {', '.join(self.stages)})")
+        while True:
+            if not self.run_once():
+                time.sleep(self.poll_sec)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분산 요약 워커")
+    parser.add_argument("--backend", default=JOB_BACKEND if JOB_BACKEND != "local" else "sqlite",
+                        choices=["sqlite", "redis"])
+    parser.add_argument("--stages", default=None, help=f"처리할 단계 (쉼표 구분, {', '.join(STAGES)})")
+    parser.add_argument("--once", action="store_true", help="작업 1건만 처리하고 종료")
+    parser.add_argument("--submit", metavar="URL", help="작업 등록만 하고 종료")
+    parser.add_argument("--language", default="ko", choices=["ko", "en"])
+    parser.add_argument("--mode", default="abstractive", choices=["abstractive", "extractive"])
+    parser.add_argument("--budget", type=budget_seconds, default=None, help="시간 예산 (초)")
+    args = parser.parse_args()
+
+    lease_queue = get_lease_queue(args.backend)
+    if args.submit:
+        print(enqueue_summary(lease_queue, args.submit, args.language, args.mode, args.budget))
+    else:
+        stages = args.stages.split(",") if args.stages else default_stages()
+        worker = Worker(lease_queue, stages)
+        if args.once:
+            worker.run_once()
+        else:
+            worker.run_forever()
@@ -1,14 +1,21 @@
 import streamlit as st
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
 import yt_dlp
-import whisper
 import os
 import tempfile
 import re
 import glob
+import numpy as np
 import time
-import threading
+from asr_progress import ASRThroughputHistory, ASRProgressEstimator, history_device
+from audio_utils import find_ffmpeg, decode_audio, audio_duration, stream_pcm, pcm_windows, probe_duration
+from audio_cache import AudioCache
+from vad import trim_non_speech
+from parallel_asr import transcribe_parallel, default_workers
+from asr_backends import load_asr_backend, select_asr_backend, backend_tag
+from settings import VAD_ENABLED, ASR_PARALLEL_MIN_SEC, ASR_STREAMING
+from streaming_asr import StreamingTranscriber, use_streaming_asr
 from gpu_utils import GPUDetector, get_whisper_model_info
+from transcript_sources import fetch_best_transcript, describe_source, SOURCE_WHISPER
 
 def extract_video_id(url):
     """유튜브 URL에서 비디오 ID 추출 (파라미터 제거)"""
@@ -16,20 +23,55 @@ def extract_video_id(url):
     m = re.search(r"(?:v=|youtu\.be/)([A-Za-z0-9_-]{11})", url)
     return m.group(1) if m else None
 
-def fetch_transcript_text(video_id):
-    """YouTube Transcript API로 자막 추출 (단순화된 버전)"""
+def _notify(progress, message, level="info"):
+    """진행 안내 메시지 (작업 워커 스레드에서는 st.* 호출이 화면에 표시되지 않으므로 작업 로그로 전달)
+
+    progress: update(stage, progress)/log(message)를 제공하는 작업 객체 (없으면 Streamlit으로 바로 표시)
+    """
+    if progress is not None:
+        progress.log(message)
+    else:
+        getattr(st, level)(message)
+
+class _ASRProgressView:
+    """음성 인식 진행률 표시 (작업이 있으면 작업 진행률의 start~end 구간을 채우고, 없으면 Streamlit 위젯)"""
+    
+    def __init__(self, progress, start=30, end=50):
+        self.progress = progress
+        self.start = start
+        self.end = end
+        if progress is None:
+            self.progress_bar = st.progress(0)
+            self.status_text = st.empty()
+            self.time_text = st.empty()
+    
+    def show(self, fraction, status, time_text=None):
+        if self.progress is not None:
+            stage = f"{status} · {time_text}" if time_text else status
+            self.progress.update(stage, self.start + int((self.end - self.start) * min(fraction, 1.0)))
+            return
+        self.progress_bar.progress(min(fraction, 1.0))
+        self.status_text.text(status)
+        if time_text:
+            self.time_text.text(time_text)
+
+def fetch_transcript_text(video_id, progress=None):
+    """YouTube Transcript API로 자막 세그먼트 추출 (트랙 목록을 한 번 조회해 수동 → 자동 → 번역 → 다른 언어 순)
+
+    반환: (세그먼트 목록, 자막 출처) - 자막이 없으면 (None, None)
+    """
     try:
-        # 한국어 우선, 영어 백업
-        segs = YouTubeTranscriptApi.get_transcript(video_id, languages=['ko', 'en'])
-        return " ".join(s['text'] for s in segs if s.get('text'))
-    except (NoTranscriptFound, TranscriptsDisabled):
-        return None
+        # 세그먼트 경계를 유지 (요약 전 인접 세그먼트 간 반복 제거에 사용)
+        return fetch_best_transcript(video_id, log=lambda message: _notify(progress, message, "warning"))
     except Exception as e:
-        st.warning(f"자막 API 실패: {str(e)}")
-        return None
+        _notify(progress, f"자막 API 실패: {str(e)}", "warning")
+        return None, None
+
+def download_audio(url, out_dir="tmp", ffmpeg_path=None, transcode_mp3=False, progress=None):
+    """yt-dlp로 오디오 다운로드 (기본: 원본 컨테이너 그대로, Whisper 입력 시 PCM으로 한 번만 디코딩)
 
-def download_audio(url, out_dir="tmp", ffmpeg_path=None):
-    """yt-dlp로 오디오 다운로드 (ffmpeg 지원)"""
+    progress: 작업 객체 (주어지면 안내 메시지를 작업에 기록)
+    """
     try:
         os.makedirs(out_dir, exist_ok=True)
         
@@ -69,28 +111,23 @@ def download_audio(url, out_dir="tmp", ffmpeg_path=None):
         if ffmpeg_path:
             ydl_opts["ffmpeg_location"] = ffmpeg_path
         
-        # ffmpeg가 있는 경우에만 후처리 추가
-        try:
-            import subprocess
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+        # mp3 재인코딩은 명시적으로 요청한 경우에만 (Whisper는 어차피 PCM으로 다시 디코딩하므로 손실 인코딩만 추가됨)
+        if transcode_mp3 and (ffmpeg_path or find_ffmpeg()):
             ydl_opts["postprocessors"] = [{
                 "key": "FFmpegExtractAudio",
                 "preferredcodec": "mp3",
                 "preferredquality": "192",
             }]
-        except:
-            # ffmpeg가 없으면 원본 포맷 그대로 사용
-            pass
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
             
             # 다운로드된 파일 찾기 (더 정확한 방법)
             video_id = info.get('id', 'unknown')
-            st.info(f"다운로드된 비디오 ID: {video_id}")
+            _notify(progress, f"다운로드된 비디오 ID: {video_id}")
             
             # 가능한 파일 확장자들
-            possible_extensions = ['mp3', 'wav', 'm4a', 'webm', 'ogg']
+            possible_extensions = ['webm', 'm4a', 'opus', 'mp4', 'ogg', 'mp3', 'wav']
             downloaded_file = None
             
             for ext in possible_extensions:
@@ -98,14 +135,14 @@ def download_audio(url, out_dir="tmp", ffmpeg_path=None):
                 original_file = os.path.join(out_dir, f"{video_id}.{ext}")
                 if os.path.exists(original_file):
                     downloaded_file = original_file
-                    st.info(f"원본 파일 발견: {original_file}")
+                    _notify(progress, f"원본 파일 발견: {original_file}")
                     break
                 
                 # 후처리된 파일 찾기 (ffmpeg가 있는 경우)
                 processed_file = os.path.join(out_dir, f"{video_id}.mp3")
                 if os.path.exists(processed_file):
                     downloaded_file = processed_file
-                    st.info(f"후처리된 파일 발견: {processed_file}")
+                    _notify(progress, f"후처리된 파일 발견: {processed_file}")
                     break
             
             # glob으로 모든 파일 검색 (백업 방법)
@@ -113,249 +150,338 @@ def download_audio(url, out_dir="tmp", ffmpeg_path=None):
                 all_files = glob.glob(os.path.join(out_dir, f"{video_id}.*"))
                 if all_files:
                     downloaded_file = all_files[0]
-                    st.info(f"Glob으로 파일 발견: {downloaded_file}")
+                    _notify(progress, f"Glob으로 파일 발견: {downloaded_file}")
             
             if downloaded_file and os.path.exists(downloaded_file):
-                st.success(f"오디오 파일 다운로드 완료: {downloaded_file}")
+                _notify(progress, f"오디오 파일 다운로드 완료: {downloaded_file}", "success")
                 return downloaded_file
             else:
-                st.error(f"다운로드된 파일을 찾을 수 없습니다. 디렉토리: {out_dir}")
+                _notify(progress, f"다운로드된 파일을 찾을 수 없습니다. 디렉토리: {out_dir}", "error")
                 # 디렉토리 내용 확인
                 if os.path.exists(out_dir):
                     files = os.listdir(out_dir)
-                    st.error(f"디렉토리 내용: {files}")
+                    _notify(progress, f"디렉토리 내용: {files}", "error")
                 return None
             
     except Exception as e:
-        st.error(f"오디오 다운로드 실패: {str(e)}")
+        _notify(progress, f"오디오 다운로드 실패: {str(e)}", "error")
+        return None
+
+def load_audio_cached(url, video_id, cache=None, decode=True, progress=None):
+    """캐시된 PCM(mmap) 우선, 없으면 다운로드/디코딩 후 캐시에 저장
+
+    decode=False: PCM 캐시가 없으면 디코딩하지 않고 압축 오디오 경로 반환 (스트리밍 인식용)
+    """
+    cache = cache or AudioCache()
+    
+    # 1순위: 디코딩된 PCM (디코딩 비용 없음)
+    audio = cache.get_pcm(video_id)
+    if audio is not None:
+        _notify(progress, f"💾 캐시된 PCM 사용: {audio_duration(audio) / 60:.1f}분 분량")
+        return audio
+    
+    ffmpeg_found = find_ffmpeg()
+    if not ffmpeg_found:
+        _notify(progress, "ffmpeg를 찾을 수 없습니다. 환경변수 PATH를 확인하세요.", "warning")
         return None
+    
+    # 2순위: 캐시된 압축 오디오, 없으면 작업별 격리 디렉토리에 다운로드
+    audio_path = cache.get_audio(video_id)
+    if audio_path:
+        _notify(progress, f"💾 캐시된 오디오 사용: {audio_path}")
+    else:
+        if progress is not None:
+            progress.update("오디오 다운로드 중...")
+        with cache.job_dir() as job_dir:
+            downloaded = download_audio(url, out_dir=job_dir, ffmpeg_path=ffmpeg_found, progress=progress)
+            if not downloaded:
+                return None
+            audio_path = cache.put_audio(video_id, downloaded)
+    
+    if not decode:
+        return audio_path
+    
+    file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+    _notify(progress, f"파일 크기: {file_size_mb:.1f}MB, 16kHz PCM으로 디코딩 중...")
+    
+    # 한 번만 디코딩하여 .npy로 저장 (재시도/모델 변경 시 mmap으로 재사용)
+    # ffmpeg 출력을 블록 단위로 디스크에 바로 써서 긴 오디오도 전체 PCM을 메모리에 올리지 않음
+    return cache.put_pcm_blocks(video_id, stream_pcm(audio_path, ffmpeg_found))
+
+def transcribe_audio_with_whisper(audio_path, audio=None, use_vad=VAD_ENABLED, return_segments=False, model_name=None,
+                                  progress=None):
+    """Whisper로 음성 인식 (실제 디코딩 위치 기반 진행률 및 처리량 기록)
 
-def transcribe_audio_with_whisper(audio_path):
-    """Whisper로 음성 인식"""
+    audio: 이미 디코딩된 16kHz PCM 배열 (주어지면 audio_path 디코딩 생략)
+    use_vad: 비음성 구간을 잘라내고 음성 구간만 인식 (타임스탬프는 원본 기준으로 복원)
+    return_segments: True면 [{"text", "start", "duration"}] 세그먼트 목록 반환
+    model_name: 사용할 Whisper 모델 (기본: 디바이스/보정 프로파일 기준 최적 모델)
+    progress: 작업 객체 (주어지면 진행률/예상 남은 시간/안내를 작업에 기록)
+    """
     try:
-        # 절대 경로로 변환
-        abs_audio_path = os.path.abspath(audio_path)
-        
-        # 파일 존재 확인
-        if not os.path.exists(abs_audio_path):
-            st.error(f"오디오 파일이 존재하지 않습니다: {abs_audio_path}")
-            return None
-        
-        st.info(f"Whisper로 음성 인식 시작: {abs_audio_path}")
-        
-        # 파일 크기 및 예상 시간 계산
-        file_size = os.path.getsize(abs_audio_path)
-        file_size_mb = file_size / (1024 * 1024)
-        st.info(f"파일 크기: {file_size_mb:.1f}MB ({file_size:,} bytes)")
-        
-        # 예상 처리 시간 계산 (경험적 공식)
-        estimated_minutes = max(1, int(file_size_mb * 0.8))  # 1MB당 약 0.8분
-        st.info(f"⏱️ 예상 처리 시간: {estimated_minutes}분 (CPU 사용)")
-        
-        # 진행률 표시를 위한 컨테이너
-        progress_container = st.container()
-        with progress_container:
-            st.info("🔄 Whisper 모델 로딩 중...")
-        
-        # ffmpeg 경로 찾기
-        ffmpeg_paths = [
-            "C:\\ffmpeg\\bin\\ffmpeg.exe",
-            "C:\\ffmpegWbin\\ffmpeg.exe", 
-            "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe",
-            "ffmpeg"
-        ]
+        if audio is None:
+            # 절대 경로로 변환
+            abs_audio_path = os.path.abspath(audio_path)
+            
+            # 파일 존재 확인
+            if not os.path.exists(abs_audio_path):
+                _notify(progress, f"오디오 파일이 존재하지 않습니다: {abs_audio_path}", "error")
+                return None
+            
+            ffmpeg_found = find_ffmpeg()
+            if not ffmpeg_found:
+                _notify(progress, "ffmpeg를 찾을 수 없습니다. 환경변수 PATH를 확인하세요.", "warning")
+                return None
+            
+            # 다운로드된 컨테이너를 16kHz mono PCM으로 한 번만 디코딩 (Whisper에 배열로 직접 전달)
+            _notify(progress, f"Whisper로 음성 인식 시작: {abs_audio_path}")
+            audio = decode_audio(abs_audio_path, ffmpeg_found)
         
-        ffmpeg_found = None
-        for path in ffmpeg_paths:
-            try:
-                import subprocess
-                if path == "ffmpeg":
-                    subprocess.run([path, "-version"], capture_output=True, check=True, timeout=5)
-                else:
-                    subprocess.run([path, "-version"], capture_output=True, check=True, timeout=5)
-                ffmpeg_found = path
-                st.info(f"ffmpeg 발견: {path}")
-                break
-            except:
-                continue
+        duration_sec = audio_duration(audio)
         
-        if not ffmpeg_found:
-            st.warning("ffmpeg를 찾을 수 없습니다. 환경변수 PATH를 확인하세요.")
+        # 음성 구간만 남기기 (인트로/음악/긴 무음 제거)
+        timeline = None
+        skipped_sec = 0.0
+        if use_vad:
+            speech, speech_timeline = trim_non_speech(audio)
+            if speech_timeline.regions and duration_sec - speech_timeline.speech_sec >= 1.0:
+                timeline = speech_timeline
+                skipped_sec = duration_sec - timeline.speech_sec
+                audio = speech
+                _notify(
+                    progress,
+                    f"✂️ 비음성 구간 {skipped_sec:.0f}초 제외 "
+                    f"({skipped_sec / duration_sec * 100:.0f}%, 음성 {timeline.speech_sec / 60:.1f}분만 인식)"
+                )
+        asr_sec = audio_duration(audio)
         
         # GPU 감지 및 최적 모델 선택
         detector = GPUDetector()
         device_info = detector.get_device_info()
         
-        optimal_model = device_info["optimal_model"]
+        optimal_model = model_name or device_info["optimal_model"]
         device = device_info["device"]
         gpu_name = device_info["gpu_name"]
         vram_gb = device_info["vram_gb"]
         
-        # 처리 시간 추정
-        if device == "cuda":
-            estimated_minutes = max(1, int(file_size_mb * 0.3))  # GPU는 더 빠름
-            st.info(f"⏱️ 예상 처리 시간: {estimated_minutes}분 (GPU: {gpu_name})")
-        else:
-            estimated_minutes = max(1, int(file_size_mb * 0.8))  # CPU는 더 느림
-            st.info(f"⏱️ 예상 처리 시간: {estimated_minutes}분 (CPU 사용)")
+        # 노드 하드웨어에 맞는 음성 인식 엔진 (CPU: CTranslate2 int8, GPU: openai-whisper)
+        backend_name = select_asr_backend(device)
         
-        # Whisper 모델 로드 (최적 모델 사용)
-        with progress_container:
-            st.info(f"🤖 Whisper 모델 로딩 중... ({optimal_model}, {device})")
-        
-        try:
-            model = whisper.load_model(optimal_model, device=device)
-            st.success(f"✅ {optimal_model} 모델 로드 완료 ({device})")
-        except Exception as e:
-            st.warning(f"⚠️ {optimal_model} 모델 로드 실패: {str(e)}")
-            st.info("🔄 base 모델로 fallback...")
-            model = whisper.load_model("base", device="cpu")
-            device = "cpu"
+        # 긴 오디오를 CPU에서 인식할 때는 무음 경계로 나눠 여러 프로세스에서 동시에 인식
+        parallel_workers = default_workers() if device == "cpu" and asr_sec >= ASR_PARALLEL_MIN_SEC else 1
+        model = None
+        history_tag = backend_tag(backend_name, "cpu")
+        if parallel_workers > 1:
+            _notify(progress, f"🧩 CPU 병렬 인식: 워커 {parallel_workers}개 ({optimal_model}, {backend_name})")
+        else:
+            # 음성 인식 엔진 로드 (최적 모델 사용)
+            if progress is not None:
+                progress.update(f"Whisper 모델 로딩 중... ({optimal_model}, {device}, {backend_name})")
+            else:
+                st.info(f"🤖 Whisper 모델 로딩 중... ({optimal_model}, {device}, {backend_name})")
+            
+            try:
+                model = load_asr_backend(optimal_model, device=device, name=backend_name)
+                _notify(progress, f"✅ {optimal_model} 모델 로드 완료 ({device}, {model.name})", "success")
+            except Exception as e:
+                _notify(progress, f"⚠️ {optimal_model} 모델 로드 실패: {str(e)} - base 모델로 fallback", "warning")
+                optimal_model = "base"
+                device = "cpu"
+                model = load_asr_backend("base", device="cpu")
+            history_tag = model.tag
         
-        # 음성 인식 (ffmpeg 경로 지정)
-        if ffmpeg_found and ffmpeg_found != "ffmpeg":
-            # ffmpeg 경로를 환경변수로 설정
-            old_path = os.environ.get("PATH", "")
-            os.environ["PATH"] = os.path.dirname(ffmpeg_found) + os.pathsep + old_path
-            st.info(f"ffmpeg 경로 설정: {os.path.dirname(ffmpeg_found)}")
+        # 이력 기반 예상 처리 시간 (모델/디바이스/엔진별 실측 배율, 병렬 워커 수별로 따로 기록)
+        history_key = history_device(device, history_tag, parallel_workers)
+        history = ASRThroughputHistory()
+        prior_rtf = history.estimate_rtf(optimal_model, history_key)
+        estimator = ASRProgressEstimator(asr_sec, prior_rtf)
+        device_label = f"GPU: {gpu_name}" if device == "cuda" else "CPU 사용"
+        _notify(
+            progress,
+            f"⏱️ 인식할 오디오 길이 {asr_sec / 60:.1f}분, "
+            f"예상 처리 시간: {estimator.eta_seconds() / 60:.1f}분 ({device_label}, 배율 {prior_rtf:.2f}x)"
+        )
         
         # 음성 인식 시작
-        with progress_container:
+        if progress is None:
             st.info("🎤 음성 인식 진행 중... (시간이 오래 걸릴 수 있습니다)")
-            
-            # 진행률 표시
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            time_estimate = st.empty()
-            
-            # Whisper 진행률을 실시간으로 표시하는 함수
-            def update_progress_with_whisper():
-                import time
-                start_time = time.time()
-                total_estimated_time = estimated_minutes * 60  # 초 단위로 변환
-                
-                while True:
-                    elapsed_time = time.time() - start_time
-                    progress_ratio = min(elapsed_time / total_estimated_time, 0.95)  # 95%까지만 표시
-                    
-                    # 진행률 업데이트
-                    progress_bar.progress(progress_ratio)
-                    status_text.text(f"음성 인식 진행 중... {int(progress_ratio * 100)}%")
-                    
-                    # 남은 시간 계산
-                    if progress_ratio < 0.95:
-                        remaining_time = (total_estimated_time - elapsed_time) / 60  # 분 단위
-                        time_estimate.text(f"⏱️ 예상 남은 시간: {remaining_time:.1f}분")
-                    else:
-                        time_estimate.text("⏱️ 거의 완료됨...")
-                    
-                    time.sleep(1)  # 1초마다 업데이트
-            
-            # 백그라운드에서 진행률 업데이트
-            progress_thread = threading.Thread(target=update_progress_with_whisper)
-            progress_thread.daemon = True
-            progress_thread.start()
+        view = _ASRProgressView(progress)
+        
+        def on_progress(decoded_sec, total_sec):
+            """디코딩된 세그먼트 위치로 진행률 갱신"""
+            estimator.update(decoded_sec)
+            live_rtf = estimator.live_rtf
+            rtf_text = f", 실시간 배율 {live_rtf:.2f}x" if live_rtf else ""
+            view.show(
+                estimator.progress,
+                f"음성 인식 진행 중... {int(estimator.progress * 100)}% "
+                f"({decoded_sec / 60:.1f}/{total_sec / 60:.1f}분{rtf_text})",
+                f"⏱️ 예상 남은 시간: {estimator.eta_seconds() / 60:.1f}분"
+            )
         
-        # Whisper 옵션 설정 (진행률 표시 포함)
         try:
-            # Whisper 실행 중 진행률 업데이트를 위한 스레드 종료
-            if 'progress_thread' in locals():
-                progress_thread.join(timeout=0.1)
-            
-            # Whisper 실행 (진행률 표시)
-            with progress_container:
-                progress_bar.progress(0.95)
-                status_text.text("🎤 Whisper 음성 인식 최종 처리 중...")
-                time_estimate.text("⏱️ 거의 완료됨...")
-            
-            # 언어 자동 감지 (영어 우선)
-            result = model.transcribe(abs_audio_path, language=None, verbose=True)
-            
+            if parallel_workers > 1:
+                # VAD로 잘라내지 않은 캐시 PCM이면 워커가 파일에서 자기 구간만 직접 읽음
+                pcm_path = str(audio.filename) if timeline is None and isinstance(audio, np.memmap) else None
+                result = transcribe_parallel(
+                    audio, optimal_model, workers=parallel_workers, pcm_path=pcm_path, backend=backend_name,
+                    on_progress=on_progress
+                )
+                _notify(progress, f"🧩 {result['num_segments']}개 세그먼트를 워커 {result['workers']}개로 인식했습니다")
+            else:
+                # 언어 자동 감지 (진행률은 콜백으로 표시)
+                # 캐시된 mmap 배열을 그대로 전달 (필요한 구간만 페이지 캐시에서 읽힘)
+                result = model.transcribe(audio, language=None, on_progress=on_progress)
         except Exception as e:
-            st.error(f"Whisper 실행 중 오류: {str(e)}")
+            _notify(progress, f"Whisper 실행 중 오류: {str(e)}", "error")
             return None
         
-        # 텍스트 추출
+        # 처리량 기록 (ETA 보정 및 용량 산정용)
+        wall_sec = estimator.elapsed
+        rtf = history.record(optimal_model, history_key, asr_sec, wall_sec, skipped_sec=skipped_sec)
+        
+        # 텍스트 및 세그먼트 추출 (VAD 사용 시 원본 타임라인으로 복원)
         text = result["text"]
+        segments = result.get("segments", [])
+        if timeline is not None:
+            segments = timeline.map_segments(segments)
         
         # 완료 시 진행률 100%로 설정
-        with progress_container:
-            progress_bar.progress(1.0)
-            status_text.text("음성 인식 완료!")
+        view.show(1.0, "음성 인식 완료!", f"⏱️ 처리 시간: {wall_sec / 60:.1f}분 (실시간 배율 {rtf:.2f}x)")
         
         # 성공 메시지
-        st.success(f"✅ 음성 인식 완료! (사용된 모델: {optimal_model})")
+        _notify(progress, f"✅ 음성 인식 완료! (사용된 모델: {optimal_model}, 실시간 배율: {rtf:.2f}x)", "success")
         
         # 메모리 정리
-        del model
+        del model, audio
         if device == "cuda":
             import torch
             torch.cuda.empty_cache()
         
-        # 임시 파일 정리
-        try:
-            os.remove(abs_audio_path)
-            if os.path.dirname(abs_audio_path) != os.getcwd():
-                os.rmdir(os.path.dirname(abs_audio_path))
-        except:
-            pass
-        
+        if return_segments:
+            return [
+                {"text": seg["text"].strip(), "start": seg["start"], "duration": seg["end"] - seg["start"]}
+                for seg in segments if seg["text"].strip()
+            ]
         return text
         
     except Exception as e:
-        st.error(f"음성 인식 실패: {str(e)}")
-        st.exception(e)  # 상세한 오류 정보 표시
+        _notify(progress, f"음성 인식 실패: {str(e)}", "error")
+        if progress is None:
+            st.exception(e)  # 상세한 오류 정보 표시
+        return None
+
+def transcribe_audio_streaming(source, duration_sec=None, model_name=None, progress=None):
+    """고정 길이 구간 단위 스트리밍 음성 인식 (최대 메모리 사용량이 오디오 길이와 무관)
+
+    source: 압축 오디오 경로 (ffmpeg 파이프로 구간씩 디코딩) 또는 PCM 배열(mmap)
+    progress: 작업 객체 (주어지면 진행률/안내를 작업에 기록)
+    반환: [{"text", "start", "duration"}] 세그먼트 목록 (VAD/병렬 인식은 사용하지 않음)
+    """
+    try:
+        device_info = GPUDetector().get_device_info()
+        optimal_model = model_name or device_info["optimal_model"]
+        device = device_info["device"]
+        
+        _notify(progress, f"🌊 스트리밍 음성 인식 ({optimal_model}, {device})")
+        backend = load_asr_backend(optimal_model, device=device)
+        
+        if isinstance(source, str):
+            blocks = stream_pcm(source, find_ffmpeg() or "ffmpeg")
+        else:
+            blocks = pcm_windows(source)
+        
+        history_key = history_device(device, backend.tag, streaming=True)
+        history = ASRThroughputHistory()
+        total_sec = duration_sec or 0.0
+        estimator = ASRProgressEstimator(total_sec, history.estimate_rtf(optimal_model, history_key))
+        view = _ASRProgressView(progress)
+        
+        def on_progress(decoded_sec, total):
+            estimator.update(decoded_sec)
+            eta = f"⏱️ 예상 남은 시간: {estimator.eta_seconds() / 60:.1f}분" if total_sec else None
+            view.show(estimator.progress, f"음성 인식 진행 중... {decoded_sec / 60:.1f}분 확정", eta)
+        
+        transcriber = StreamingTranscriber(backend)
+        segments = []
+        for seg in transcriber.transcribe(blocks, total_sec=duration_sec, on_progress=on_progress):
+            segments.append({"text": seg["text"].strip(), "start": seg["start"], "duration": seg["end"] - seg["start"]})
+        
+        # 처리량 기록 (길이를 모르면 마지막 세그먼트 끝으로 추정)
+        audio_sec = duration_sec or (segments[-1]["start"] + segments[-1]["duration"] if segments else 0.0)
+        rtf = history.record(optimal_model, history_key, audio_sec, estimator.elapsed)
+        view.show(1.0, f"음성 인식 완료! (구간 {transcriber.windows}개, "
+                       f"최대 버퍼 {transcriber.peak_buffer_samples / 16000:.0f}초, 실시간 배율 {rtf:.2f}x)")
+        return [seg for seg in segments if seg["text"]]
+    
+    except Exception as e:
+        _notify(progress, f"스트리밍 음성 인식 실패: {str(e)}", "error")
         return None
 
-def get_transcript(url, use_whisper=True):
-    """자막 추출 (API 우선, 실패시 음성 인식)"""
+def get_transcript(url, use_whisper=True, choose_asr_model=None, progress=None):
+    """자막 추출 (모든 자막 트랙 우선, 실패시 음성 인식)
+
+    choose_asr_model: 오디오 길이(초)를 받아 Whisper 모델을 고르는 함수 (시간 예산 계획)
+    progress: 작업 객체 (작업 워커 스레드에서 실행될 때 진행률/안내를 작업에 기록)
+    반환: (세그먼트 목록, 자막 출처) - 실패하면 (None, None)
+    """
     video_id = extract_video_id(url)
     if not video_id:
-        st.error("유효하지 않은 유튜브 URL입니다.")
-        return None
+        _notify(progress, "유효하지 않은 유튜브 URL입니다.", "error")
+        return None, None
     
     # 1단계: YouTube Transcript API 시도
-    st.info("자막 API로 시도 중...")
-    text = fetch_transcript_text(video_id)
+    if progress is None:
+        st.info("자막 API로 시도 중...")
+    segments, source = fetch_transcript_text(video_id, progress)
     
-    if text:
-        st.success("자막 API로 성공!")
-        return [{"text": text, "start": 0, "duration": 0}]
+    if segments:
+        _notify(progress, f"자막 API로 성공! ({describe_source(source)})", "success")
+        return segments, source
     
     # 2단계: yt-dlp + Whisper로 음성 인식 (use_whisper가 True인 경우만)
     if not use_whisper:
-        st.error("자막을 찾을 수 없습니다. 음성 인식 옵션이 비활성화되어 있습니다.")
-        return None
-    
-    st.info("자막이 없어서 음성 인식으로 시도 중...")
+        _notify(progress, "자막을 찾을 수 없습니다. 음성 인식 옵션이 비활성화되어 있습니다.", "error")
+        return None, None
     
-    # 오디오 다운로드
-    audio_path = download_audio(url, out_dir="tmp")
-    if not audio_path:
-        st.error("오디오 다운로드에 실패했습니다. ffmpeg가 설치되어 있는지 확인하세요.")
-        return None
+    _notify(progress, "자막이 없어서 음성 인식으로 시도 중... (긴 영상은 수 분 이상 걸릴 수 있습니다)")
     
-    # 음성 인식
-    text = transcribe_audio_with_whisper(audio_path)
-    if not text:
-        st.error("음성 인식에 실패했습니다.")
-        return None
+    # 오디오 준비 (캐시 우선, 파일은 캐시가 용량 제한 내에서 보관)
+    # 캐시된 PCM(mmap)이 없을 때만 길이를 확인해 스트리밍 인식 여부를 정하고, 아니면 PCM으로 디코딩
+    audio = load_audio_cached(url, video_id, decode=ASR_STREAMING == "0", progress=progress)
+    if audio is None:
+        _notify(progress, "오디오 다운로드에 실패했습니다. ffmpeg가 설치되어 있는지 확인하세요.", "error")
+        return None, None
+    if isinstance(audio, str):
+        duration_sec = probe_duration(audio, find_ffmpeg() or "ffmpeg")
+        device = GPUDetector().get_device_info()["device"]
+        if not use_streaming_asr(duration_sec, device):
+            audio = load_audio_cached(url, video_id, progress=progress)
+    else:
+        duration_sec = audio_duration(audio)
     
-    st.success("음성 인식으로 성공!")
+    # 음성 인식 (세그먼트 단위, API 자막과 같은 형식)
+    # PCM이 mmap으로 준비되면 VAD/병렬 인식 경로, 압축 오디오 그대로면 스트리밍 인식
+    model_name = choose_asr_model(duration_sec or 0.0) if choose_asr_model else None
+    if isinstance(audio, str):
+        segments = transcribe_audio_streaming(audio, duration_sec, model_name=model_name, progress=progress)
+    else:
+        segments = transcribe_audio_with_whisper(None, audio=audio, return_segments=True, model_name=model_name,
+                                                 progress=progress)
+    if not segments:
+        _notify(progress, "음성 인식에 실패했습니다.", "error")
+        return None, None
     
-    # Whisper 결과를 API 형식으로 변환
-    return [{"text": text, "start": 0, "duration": 0}]
+    _notify(progress, "음성 인식으로 성공!", "success")
+    return segments, {"kind": SOURCE_WHISPER, "language": None}
 
 def format_transcript(transcript_data):
     """자막 데이터를 텍스트로 변환"""
     if not transcript_data:
         return ""
     
-    text = ""
-    for item in transcript_data:
-        text += item['text'] + " "
-    
-    return text.strip()
+    # 긴 자막에서 문자열 복사가 반복되지 않도록 한 번에 결합
+    return " ".join(item['text'] for item in transcript_data).strip()
 
 def detect_language(text):
     """텍스트 언어 감지 (간단한 휴리스틱)"""